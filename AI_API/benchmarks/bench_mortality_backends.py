@@ -0,0 +1,79 @@
+"""
+Benchmark des modèles (backends) de MortalityPredictor
+
+Compare, sur la série synthétique de ``bench_mortality_strategies``, la forêt
+aléatoire et le gradient boosting par histogrammes, pour chaque stratégie :
+- temps d'entraînement
+- latence de la prévision (hors mémo) à ``--horizon`` jours
+- taille du modèle sérialisé (joblib, comme dans le registre)
+- MAE à ``--horizon`` jours en validation glissante
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_mortality_backends --days 900 --origins 5
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_mortality_strategies import (  # noqa: E402
+    FEATURE_COLUMNS, best_of, build_features, synthetic_mortality
+)
+from models.mortality_model import MortalityPredictor  # noqa: E402
+
+
+def serialized_size(predictor: MortalityPredictor) -> int:
+    buffer = io.BytesIO()
+    joblib.dump(predictor, buffer)
+    return buffer.tell()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=900)
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--origins", type=int, default=5, help="origines de prévision pour la MAE")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = build_features(synthetic_mortality(args.days))
+    X = df[FEATURE_COLUMNS].values
+    y = df['mortality_rate'].values
+    origins = np.linspace(int(0.75 * len(X)), len(X) - args.horizon, args.origins).astype(int)
+
+    print(f"{len(X)} jours de features, horizon {args.horizon}, {len(origins)} origines")
+    print(f"{'modèle':<24}{'stratégie':<12}{'fit (s)':>10}{'préd. (ms)':>12}{'taille (Ko)':>13}"
+          f"{f'MAE h≤{args.horizon}':>12}")
+    for backend in MortalityPredictor.BACKENDS:
+        for strategy in MortalityPredictor.STRATEGIES:
+            def build():
+                return MortalityPredictor(strategy=strategy, max_horizon=args.horizon, backend=backend)
+
+            started = time.perf_counter()
+            predictor = build().fit(X, y, FEATURE_COLUMNS)
+            fit_seconds = time.perf_counter() - started
+
+            def uncached_forecast():
+                predictor._forecast = None
+                predictor.predict_future(X, args.horizon)
+            latency = best_of(uncached_forecast, args.repeat)
+
+            errors = []
+            for origin in origins:
+                forecast = build().fit(X[:origin], y[:origin]).predict_future(X[:origin], args.horizon)
+                errors.append(np.abs(forecast - y[origin:origin + args.horizon]).mean())
+
+            print(f"{backend:<24}{strategy:<12}{fit_seconds:>10.2f}{1000 * latency:>12.2f}"
+                  f"{serialized_size(predictor) / 1024:>13.0f}{np.mean(errors):>12.5f}")
+
+
+if __name__ == "__main__":
+    main()
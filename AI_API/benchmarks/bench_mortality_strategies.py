@@ -0,0 +1,117 @@
+"""
+Benchmark des stratégies de prévision de MortalityPredictor
+
+Compare, sur une série synthétique de taux de mortalité (mêmes features que
+``/api/mortality/predict``), les modes ``recursive`` et ``direct`` :
+- temps d'entraînement
+- latence de la prévision (hors mémo) par horizon
+- MAE par horizon en validation glissante (plusieurs origines de prévision,
+  modèle réentraîné sur le passé de chaque origine)
+- couverture empirique de l'intervalle de prédiction (``ML_INTERVAL_METHOD``,
+  ``ML_INTERVAL_LEVEL``) sur ces mêmes origines
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_mortality_strategies --days 900 --origins 5
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.mortality_model import MortalityPredictor  # noqa: E402
+
+FEATURE_COLUMNS = [
+    'day_of_week', 'month', 'day_of_year',
+    'mortality_rate_lag1', 'mortality_rate_lag7',
+    'mortality_rate_ma7', 'mortality_rate_ma14',
+    'mortality_rate_std7'
+]
+
+
+def synthetic_mortality(days: int, seed: int = 0) -> pd.DataFrame:
+    """Taux de mortalité synthétique : tendance lente, vagues, effet jour de semaine et bruit"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(days)
+    rate = (0.02 + 0.006 * np.sin(t / 45) + 0.002 * np.sin(2 * np.pi * t / 7)
+            - 0.000005 * t + rng.normal(0, 0.0008, days))
+    return pd.DataFrame({"date": pd.date_range("2020-03-01", periods=days, freq="D"),
+                         "mortality_rate": np.clip(rate, 0, None)})
+
+
+def build_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Features de la route /api/mortality/predict"""
+    df = df.copy()
+    df['day_of_week'] = df['date'].dt.dayofweek
+    df['month'] = df['date'].dt.month
+    df['day_of_year'] = df['date'].dt.dayofyear
+    df['mortality_rate_lag1'] = df['mortality_rate'].shift(1)
+    df['mortality_rate_lag7'] = df['mortality_rate'].shift(7)
+    df['mortality_rate_ma7'] = df['mortality_rate'].rolling(window=7).mean()
+    df['mortality_rate_ma14'] = df['mortality_rate'].rolling(window=14).mean()
+    df['mortality_rate_std7'] = df['mortality_rate'].rolling(window=7).std()
+    return df.dropna().reset_index(drop=True)
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=900)
+    parser.add_argument("--horizon", type=int, default=30)
+    parser.add_argument("--origins", type=int, default=5, help="origines de prévision pour la MAE")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = build_features(synthetic_mortality(args.days))
+    X = df[FEATURE_COLUMNS].values
+    y = df['mortality_rate'].values
+    horizons = [h for h in (1, 7, 14, 30) if h <= args.horizon]
+    # Origines réparties sur le dernier quart de la série, avec horizon complet observé
+    origins = np.linspace(int(0.75 * len(X)), len(X) - args.horizon, args.origins).astype(int)
+
+    print(f"{len(X)} jours de features, horizon {args.horizon}, {len(origins)} origines")
+    print(f"{'stratégie':<12}{'fit (s)':>10}" + "".join(f"{f'préd. h={h} (ms)':>18}" for h in horizons)
+          + "".join(f"{f'MAE h≤{h}':>12}" for h in horizons) + f"{'couverture':>12}")
+    for strategy in MortalityPredictor.STRATEGIES:
+        started = time.perf_counter()
+        predictor = MortalityPredictor(strategy=strategy, max_horizon=args.horizon).fit(X, y, FEATURE_COLUMNS)
+        fit_seconds = time.perf_counter() - started
+
+        # Latence hors mémo : le mémo de predict_future est vidé à chaque appel
+        latencies = []
+        for h in horizons:
+            def uncached_forecast():
+                predictor._forecast = None
+                predictor.predict_future(X, h)
+            latencies.append(best_of(uncached_forecast, args.repeat))
+
+        errors = np.zeros((len(origins), args.horizon))
+        covered = np.zeros((len(origins), args.horizon), dtype=bool)
+        for i, origin in enumerate(origins):
+            model = MortalityPredictor(strategy=strategy, max_horizon=args.horizon).fit(X[:origin], y[:origin])
+            forecast = model.forecast(X[:origin], args.horizon)
+            actual = y[origin:origin + args.horizon]
+            errors[i] = np.abs(forecast.mean - actual)
+            covered[i] = (forecast.lower <= actual) & (actual <= forecast.upper)
+        mae = [errors[:, :h].mean() for h in horizons]
+
+        print(f"{strategy:<12}{fit_seconds:>10.2f}" + "".join(f"{1000 * t:>18.2f}" for t in latencies)
+              + "".join(f"{m:>12.5f}" for m in mae) + f"{covered.mean():>12.0%}")
+
+
+if __name__ == "__main__":
+    main()
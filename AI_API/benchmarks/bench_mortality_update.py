@@ -0,0 +1,64 @@
+"""
+Benchmark de la mise à jour incrémentale de MortalityPredictor
+
+Simule un rafraîchissement quotidien : à partir d'un modèle entraîné sur le
+début de la série, chaque jour ajoute une observation et le modèle est soit
+réentraîné entièrement (``fit``), soit mis à jour (``refresh`` : arbres
+ajoutés sur la fenêtre récente, plus anciens retirés). Compare :
+- le temps de rafraîchissement (médiane par jour)
+- la MAE de la prévision à ``--horizon`` jours faite après chaque rafraîchissement
+- le nombre de réentraînements complets imposés par la politique de ``refresh``
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_mortality_update --days 900 --updates 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_mortality_strategies import FEATURE_COLUMNS, build_features, synthetic_mortality  # noqa: E402
+from models.mortality_model import MortalityPredictor  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=900)
+    parser.add_argument("--updates", type=int, default=30, help="jours rafraîchis un par un")
+    parser.add_argument("--horizon", type=int, default=14)
+    args = parser.parse_args()
+
+    df = build_features(synthetic_mortality(args.days))
+    X = df[FEATURE_COLUMNS].values
+    y = df['mortality_rate'].values
+    start = len(X) - args.updates - args.horizon
+
+    print(f"{len(X)} jours de features, {args.updates} rafraîchissements quotidiens, horizon {args.horizon}")
+    print(f"{'stratégie':<12}{'mode':<14}{'rafraîch. (ms)':>16}{'MAE':>12}{'complets':>10}")
+    for strategy in MortalityPredictor.STRATEGIES:
+        base = MortalityPredictor(strategy=strategy, max_horizon=args.horizon).fit(X[:start], y[:start])
+        for mode in ("full", "incremental"):
+            predictor = base
+            timings, errors, full_refits = [], [], 0
+            for day in range(start + 1, start + args.updates + 1):
+                started = time.perf_counter()
+                if mode == "full":
+                    predictor = MortalityPredictor(strategy=strategy, max_horizon=args.horizon).fit(X[:day], y[:day])
+                else:
+                    predictor = predictor.refresh(X[:day], y[:day])
+                    full_refits += predictor.training["mode"] == "full"
+                timings.append(time.perf_counter() - started)
+                forecast = predictor.forecast(X[:day], args.horizon)
+                errors.append(np.abs(forecast.mean - y[day:day + args.horizon]).mean())
+            refits = args.updates if mode == "full" else full_refits
+            print(f"{strategy:<12}{mode:<14}{1000 * np.median(timings):>16.1f}{np.mean(errors):>12.5f}{refits:>10}")
+
+
+if __name__ == "__main__":
+    main()
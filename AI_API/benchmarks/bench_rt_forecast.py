@@ -0,0 +1,70 @@
+"""
+Benchmark de la prévision glissante du LSTM Rt (TensorFlow requis)
+
+Compare, sur un modèle de la taille de la route (fenêtre 14, 8 features,
+64 unités, poids initiaux : l'entraînement n'influe pas sur la latence) :
+- l'ancienne boucle : un ``model.predict`` et un ``np.vstack`` par jour
+- le graphe compilé ``RtLSTMPredictor._rolling_forecast`` : un seul appel
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_rt_forecast --horizons 7 14 30
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.rt_model import RtLSTMPredictor  # noqa: E402
+
+
+def predict_loop(model, window, horizon):
+    """Ancienne prévision glissante"""
+    last_seq = window.copy()
+    predictions = []
+    for _ in range(horizon):
+        prediction = model.predict(last_seq[None], verbose=0)[0, 0]
+        predictions.append(prediction)
+        new_row = last_seq[-1].copy()
+        new_row[0] = prediction
+        last_seq = np.vstack([last_seq[1:], new_row])
+    return np.array(predictions)
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--horizons", type=int, nargs="+", default=[7, 14, 30])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    predictor = RtLSTMPredictor()
+    predictor._get_model(input_shape=(predictor.window_size, 8))
+    window = np.random.default_rng(0).random((predictor.window_size, 8)).astype(np.float32)
+    # Premier appel : compilation du graphe (une fois par modèle)
+    started = time.perf_counter()
+    predictor._rolling_forecast(window, np.int32(1))
+    print(f"compilation du graphe : {1000 * (time.perf_counter() - started):.0f} ms")
+
+    print(f"{'horizon':>8}{'predict (ms)':>14}{'graphe (ms)':>13}{'gain':>8}")
+    for horizon in args.horizons:
+        loop = best_of(lambda: predict_loop(predictor.model, window, horizon), args.repeat)
+        compiled = best_of(lambda: predictor._rolling_forecast(window, np.int32(horizon)).numpy(), args.repeat)
+        print(f"{horizon:>8}{1000 * loop:>14.1f}{1000 * compiled:>13.1f}{loop / compiled:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
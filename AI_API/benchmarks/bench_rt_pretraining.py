@@ -0,0 +1,73 @@
+"""
+Benchmark du pré-entraînement global du LSTM Rt (TensorFlow requis)
+
+Sur des séries Rt synthétiques (vagues de période, phase et amplitude
+propres à chaque pays), entraîne un modèle global sur les pays
+d'apprentissage puis compare, sur des pays jamais vus :
+- ``full`` : entraînement complet depuis une initialisation aléatoire
+- ``fine_tune`` : ajustement fin du modèle global (``RT_FINE_TUNE_EPOCHS``)
+- ``fast`` : modèle global seul (scalers du pays, aucun entraînement)
+en temps d'entraînement par pays et en MAE sur les ``horizon`` jours suivants.
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_rt_pretraining --countries 20 --targets 5 --days 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.rt_model import (LSTM_MODES, RT_FEATURE_COLUMNS, RtLSTMPredictor, add_rt_features,  # noqa: E402
+                             fine_tune_epochs)
+
+
+def synthetic_rt(days: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Rt synthétique : vagues amorties autour de 1 et bruit"""
+    t = np.arange(days)
+    period, phase, amplitude = rng.uniform(60, 140), rng.uniform(0, 2 * np.pi), rng.uniform(0.2, 0.6)
+    rt = 1 + amplitude * np.sin(2 * np.pi * t / period + phase) * np.exp(-t / (4 * days)) + rng.normal(0, 0.03, days)
+    return pd.DataFrame({"date": pd.date_range("2020-03-01", periods=days, freq="D"), "Rt": np.clip(rt, 0.1, None)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--countries", type=int, default=20, help="pays d'apprentissage du modèle global")
+    parser.add_argument("--targets", type=int, default=5, help="pays évalués (absents du pré-entraînement)")
+    parser.add_argument("--days", type=int, default=500)
+    parser.add_argument("--horizon", type=int, default=14)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [add_rt_features(synthetic_rt(args.days, rng)) for _ in range(args.countries + args.targets)]
+    series = [(df[RT_FEATURE_COLUMNS].values, df['Rt'].values) for df in frames]
+
+    started = time.perf_counter()
+    pretrained = RtLSTMPredictor().train_global(series[:args.countries], feature_names=RT_FEATURE_COLUMNS)
+    print(f"pré-entraînement : {args.countries} pays, {time.perf_counter() - started:.1f} s, "
+          f"{pretrained.accuracy_metrics['epochs']} époques")
+
+    epochs = {"full": None, "fine_tune": fine_tune_epochs(), "fast": 0}
+    print(f"{'mode':<12}{'entraînement (s)':>18}{'époques':>10}{f'MAE h≤{args.horizon}':>12}")
+    for mode in LSTM_MODES:
+        seconds, epochs_run, errors = [], [], []
+        for X, y in series[args.countries:]:
+            X_train, y_train = X[:-args.horizon], y[:-args.horizon]
+            predictor = RtLSTMPredictor()
+            started = time.perf_counter()
+            predictor.train(X_train, y_train, feature_names=RT_FEATURE_COLUMNS, epochs=epochs[mode],
+                            initial_weights=None if mode == "full" else pretrained.weights)
+            seconds.append(time.perf_counter() - started)
+            epochs_run.append(predictor.training["epochs"])
+            errors.append(np.abs(predictor.forecast(X_train, args.horizon) - y[-args.horizon:]).mean())
+        print(f"{mode:<12}{np.mean(seconds):>18.2f}{np.mean(epochs_run):>10.1f}{np.mean(errors):>12.4f}")
+
+
+if __name__ == "__main__":
+    main()
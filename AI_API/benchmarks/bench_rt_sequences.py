@@ -0,0 +1,68 @@
+"""
+Benchmark de la préparation des séquences du LSTM Rt
+
+Compare l'ancienne construction des fenêtres (boucle Python + ``np.array``,
+chaque ligne copiée ``window_size`` fois) à la vue à pas de
+``RtLSTMPredictor._prepare_sequences`` : temps de préparation et mémoire
+allouée (pic ``tracemalloc``), pour plusieurs longueurs d'historique et
+tailles de fenêtre.
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_rt_sequences --days 1000 5000 20000 --windows 14 28 56
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.rt_model import RtLSTMPredictor  # noqa: E402
+
+
+def loop_sequences(X, y, window_size):
+    X_seq, y_seq = [], []
+    for i in range(len(X) - window_size):
+        X_seq.append(X[i:i + window_size])
+        y_seq.append(y[i + window_size])
+    return np.array(X_seq), np.array(y_seq)
+
+
+def measure(func):
+    """(durée en secondes, pic de mémoire allouée en octets) d'un appel"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--windows", type=int, nargs="+", default=[14, 28, 56])
+    parser.add_argument("--features", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'jours':>8}{'fenêtre':>9}{'boucle (ms)':>13}{'boucle (Mo)':>13}{'vue (ms)':>10}{'vue (Ko)':>10}")
+    for days in args.days:
+        X = np.random.default_rng(0).random((days, args.features))
+        y = X[:, 0].copy()
+        for window_size in args.windows:
+            predictor = RtLSTMPredictor(window_size=window_size)
+            loop_time, loop_peak = measure(lambda: loop_sequences(X, y, window_size))
+            view_time, view_peak = measure(lambda: predictor._prepare_sequences(X, y))
+            print(f"{days:>8}{window_size:>9}{1000 * loop_time:>13.1f}{loop_peak / 2**20:>13.1f}"
+                  f"{1000 * view_time:>10.3f}{view_peak / 2**10:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
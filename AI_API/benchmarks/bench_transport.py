@@ -0,0 +1,99 @@
+"""
+Benchmark des formats de transport Express.js -> API IA
+
+Compare, sur une série synthétique de taille paramétrable, la taille sur le
+fil et le temps de décodage jusqu'au DataFrame colonnaire :
+- JSON en lignes + ``json.loads`` + ``pd.DataFrame`` (ancien chemin)
+- JSON en lignes décodé en streaming (``FrameResponseDecoder``)
+- MessagePack en colonnes (format servi par l'API Express.js)
+
+Usage :
+    cd AI_API
+    python -m benchmarks.bench_transport --rows 100000
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+
+import httpx
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import columnar  # noqa: E402
+from services.json_stream import FrameResponseDecoder  # noqa: E402
+
+COLUMNS = {"date": object, "mortality_rate": np.float64}
+
+
+def build_series(rows: int):
+    dates = pd.date_range("2020-01-01", periods=rows, freq="D").strftime("%Y-%m-%dT00:00:00.000Z").tolist()
+    values = np.random.default_rng(0).random(rows).round(6).tolist()
+    meta = {"pays": "France", "window": 7, "count": rows}
+    return dates, values, meta
+
+
+def encode_payloads(dates, values, meta):
+    payloads = {
+        "json_rows": json.dumps({"data": [{"date": d, "mortality_rate": v} for d, v in zip(dates, values)],
+                                 "meta": meta}).encode("utf-8")
+    }
+    if columnar.msgpack is not None:
+        payloads["msgpack_columns"] = columnar.msgpack.packb(
+            {"columns": {"date": dates, "mortality_rate": values}, "meta": meta}
+        )
+    return payloads
+
+
+def decode_json_rows(body: bytes) -> pd.DataFrame:
+    return pd.DataFrame(json.loads(body)["data"])
+
+
+def decode_json_stream(body: bytes) -> pd.DataFrame:
+    decoder = FrameResponseDecoder(COLUMNS, capacity=1024)
+    stream = httpx.ByteStream(body)
+    response = httpx.Response(200, stream=stream, headers={"content-type": columnar.JSON_TYPE})
+    return asyncio.run(decoder(response))[0]
+
+
+def best_of(func, body: bytes, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = encode_payloads(*build_series(args.rows))
+    cases = [
+        ("json_rows", "json_rows", decode_json_rows),
+        ("json_stream", "json_rows", decode_json_stream),
+        ("msgpack_columns", "msgpack_columns", lambda b: columnar.decode_msgpack_frame(b, COLUMNS)),
+    ]
+
+    print(f"{args.rows} lignes, meilleur temps sur {args.repeat} essais")
+    print(f"{'format':<18}{'octets':>12}{'gzip':>12}{'décodage (ms)':>16}")
+    for label, payload_name, decode in cases:
+        body = payloads.get(payload_name)
+        if body is None:
+            print(f"{label:<18}{'(dépendance absente)':>40}")
+            continue
+        elapsed = best_of(decode, body, args.repeat)
+        print(f"{label:<18}{len(body):>12}{len(gzip.compress(body)):>12}{elapsed * 1000:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Consomme l'API Express.js et applique les modèles ML
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 from datetime import datetime
@@ -13,7 +14,9 @@ from dotenv import load_dotenv
 
 # Import des routes
 from routes import mortality_routes, rt_routes, spread_routes
-from services.express_client import ExpressAPIClient
+from services.data_source import get_data_source
+from services.ml_executor import get_ml_executor
+from services.job_manager import get_job_manager
 from utils.logger import setup_logger
 
 # Chargement des variables d'environnement
@@ -22,13 +25,44 @@ load_dotenv()
 # Configuration du logger
 logger = setup_logger()
 
+# Source de données partagée (pool de connexions unique pour tout le processus)
+# API Express.js par défaut, PostgreSQL direct avec AI_DATA_BACKEND=postgres
+data_source = get_data_source()
+
+# Exécuteur des calculs ML (entraînement / inférence hors de la boucle d'événements)
+ml_executor = get_ml_executor()
+
+# Jobs de prédiction en arrière-plan (POST /api/{mortality,rt}/jobs)
+job_manager = get_job_manager()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Cycle de vie de l'API : ouverture et fermeture des ressources partagées"""
+    logger.info("🚀 Démarrage de l'API IA...")
+    # Test de connexion avec la source de données
+    try:
+        await data_source.start()
+        await data_source.test_connection()
+        logger.info(f"✅ Connexion à la source de données établie ({data_source.name})")
+    except Exception as e:
+        logger.error(f"❌ Erreur de connexion à la source de données ({data_source.name}): {e}")
+        logger.warning("⚠️ L'API IA peut ne pas fonctionner correctement")
+    
+    yield
+    
+    logger.info("🛑 Arrêt de l'API IA...")
+    await job_manager.aclose()
+    await data_source.aclose()
+    ml_executor.shutdown(wait=False)
+
 # Création de l'application FastAPI
 app = FastAPI(
     title="API IA - Prédictions Pandémiques",
     description="API spécialisée dans les prédictions ML pour COVID et MPOX",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configuration CORS
@@ -40,27 +74,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialisation du client Express API
-express_client = ExpressAPIClient()
-
-@app.on_event("startup")
-async def startup_event():
-    """Événement de démarrage de l'API"""
-    logger.info("🚀 Démarrage de l'API IA...")
-    
-    # Test de connexion avec l'API Express.js
-    try:
-        await express_client.test_connection()
-        logger.info("✅ Connexion à l'API Express.js établie")
-    except Exception as e:
-        logger.error(f"❌ Erreur de connexion à l'API Express.js: {e}")
-        logger.warning("⚠️ L'API IA peut ne pas fonctionner correctement")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Événement d'arrêt de l'API"""
-    logger.info("🛑 Arrêt de l'API IA...")
-
 # Routes de base
 @app.get("/")
 async def root():
@@ -76,11 +89,12 @@ async def root():
 async def health_check():
     """Vérification de l'état de santé de l'API"""
     try:
-        # Test de connexion avec l'API Express.js
-        await express_client.test_connection()
+        # Test de connexion avec la source de données
+        await data_source.test_connection()
         return {
             "status": "healthy",
-            "api_express": "connected",
+            "data_backend": data_source.name,
+            "api_express": "connected" if data_source.name == "express" else "not_used",
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -93,7 +107,7 @@ async def health_check():
 async def test_express_connection():
     """Test spécifique de la connexion avec l'API Express.js"""
     try:
-        await express_client.test_connection()
+        await data_source.test_connection()
         return {
             "status": "success",
             "message": "Connexion à l'API Express.js réussie",
@@ -105,6 +119,20 @@ async def test_express_connection():
             detail=f"Échec de connexion à l'API Express.js: {str(e)}"
         )
 
+@app.get("/metrics")
+async def get_metrics():
+    """Métriques internes de l'API IA (source de données, exécuteur ML, jobs, registre de modèles)"""
+    return {
+        "data_source": data_source.get_client_stats(),
+        "ml_executor": ml_executor.get_stats(),
+        "jobs": job_manager.get_stats(),
+        "model_registry": {
+            "mortality": mortality_routes.mortality_registry.get_stats(),
+            "rt_lstm": rt_routes.rt_model_registry.get_stats()
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
 # Inclusion des routes spécialisées
 app.include_router(mortality_routes.router, prefix="/api/mortality", tags=["Mortality Predictions"])
 app.include_router(rt_routes.router, prefix="/api/rt", tags=["Rt Predictions"])
@@ -0,0 +1,331 @@
+"""
+Registre persistant des modèles entraînés
+
+Un modèle entraîné (estimateur + scaler + métriques) est identifié par une
+clé dérivée de son contexte : pays, source, jeu de features, paramètres et
+empreinte des données d'entraînement. Mêmes données => même clé => le modèle
+est rechargé au lieu d'être réentraîné.
+
+- Niveau 1 : LRU en mémoire (``ML_MODEL_CACHE_SIZE`` modèles), borné aussi en
+  octets (``ML_MODEL_CACHE_MAX_BYTES``) pour les artefacts exposant ``nbytes``.
+- Niveau 2 : fichiers joblib sous ``ML_MODEL_REGISTRY_DIR``, bornés en octets
+  (``ML_MODEL_REGISTRY_MAX_BYTES``), évincés du moins récemment utilisé avec
+  les pointeurs de lignée qui les désignent.
+
+Des demandes concurrentes pour un même modèle absent ne déclenchent qu'un
+seul entraînement, exécuté par l'exécuteur ML (``services.ml_executor``).
+
+Une *lignée* regroupe les modèles successifs d'un même contexte (clé sans
+l'empreinte des données) : ``get_latest`` retourne le dernier modèle
+enregistré pour elle, base d'une mise à jour incrémentale quand les données
+s'enrichissent de quelques jours.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from dotenv import load_dotenv
+
+from services.ml_executor import MLExecutor, get_ml_executor
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache", "models")
+
+_MISSING = object()
+
+
+def artifact_nbytes(artifact: Any) -> int:
+    """Taille mémoire déclarée par l'artefact (attribut ``nbytes``), 0 sinon"""
+    return int(getattr(artifact, "nbytes", 0) or 0)
+
+
+def fingerprint_arrays(*arrays: np.ndarray) -> str:
+    """Empreinte (SHA-256) du contenu, de la forme et du type de tableaux NumPy"""
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Registre de modèles à deux niveaux (mémoire + disque)
+
+    ``dump`` / ``load`` sérialisent un artefact vers / depuis un fichier
+    (joblib par défaut) ; l'artefact est en pratique le prédicteur entraîné.
+    """
+
+    def __init__(self, name: str, registry_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                 memory_items: Optional[int] = None, memory_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = artifact_nbytes,
+                 dump: Callable[[Any, str], Any] = joblib.dump,
+                 load: Callable[[str], Any] = joblib.load,
+                 extension: str = ".joblib", executor: Optional[MLExecutor] = None):
+        self.name = name
+        base_dir = os.getenv("ML_MODEL_REGISTRY_DIR", DEFAULT_REGISTRY_DIR) if registry_dir is None else registry_dir
+        self.registry_dir = os.path.join(base_dir, name) if base_dir else None
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(os.getenv("ML_MODEL_REGISTRY_MAX_BYTES", 1024 * 1024 * 1024))
+        self.memory_items = memory_items if memory_items is not None else int(os.getenv("ML_MODEL_CACHE_SIZE", 100))
+        self.memory_bytes = memory_bytes if memory_bytes is not None else \
+            int(os.getenv("ML_MODEL_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+        self._sizeof = sizeof
+        self._dump = dump
+        self._load = load
+        self.extension = extension
+        self.executor = executor or get_ml_executor()
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._memory_sizes: Dict[str, int] = {}
+        self._memory_total = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._latest: Dict[str, str] = {}
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "trainings": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "disk_evictions": 0,
+            "training_seconds": 0.0
+        }
+
+        if self.registry_dir:
+            try:
+                os.makedirs(self.registry_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"⚠️ Registre de modèles {name} sans disque ({self.registry_dir}): {e}")
+                self.registry_dir = None
+        # Octets sur disque, tenus à jour à chaque sauvegarde (pas de parcours du répertoire sur /metrics)
+        self._disk_total = self.disk_usage()
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        """Clé stable à partir des éléments du contexte (pays, source, features, empreinte...)"""
+        canonical = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Niveau mémoire
+    # ------------------------------------------------------------------
+
+    def _memory_set(self, key: str, artifact: Any) -> None:
+        size = self._sizeof(artifact)
+        self._memory_total += size - self._memory_sizes.get(key, 0)
+        self._memory_sizes[key] = size
+        self._memory[key] = artifact
+        self._memory.move_to_end(key)
+        # Budget en octets : le modèle le plus récent est gardé, même s'il le dépasse seul
+        while len(self._memory) > self.memory_items or (len(self._memory) > 1
+                                                        and self._memory_total > self.memory_bytes):
+            evicted, _ = self._memory.popitem(last=False)
+            self._memory_total -= self._memory_sizes.pop(evicted)
+            self.stats["evictions"] += 1
+
+    # ------------------------------------------------------------------
+    # Niveau disque (exécuté hors de la boucle d'événements)
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.registry_dir, key + self.extension)
+
+    def _disk_get(self, key: str) -> Any:
+        path = self._path(key)
+        if not os.path.exists(path):
+            return _MISSING
+        try:
+            artifact = self._load(path)
+        except Exception as e:
+            logger.warning(f"⚠️ Modèle {key[:12]} illisible, réentraînement: {e}")
+            return _MISSING
+        # La date de modification sert d'horodatage LRU
+        os.utime(path)
+        return artifact
+
+    def _disk_set(self, key: str, artifact: Any) -> List[Tuple[str, str]]:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._dump(artifact, tmp_path)
+        os.replace(tmp_path, path)
+        return self._disk_evict()
+
+    def _disk_evict(self) -> List[Tuple[str, str]]:
+        """
+        Évince les modèles les plus anciens au-delà de ``max_bytes``, puis les
+        pointeurs de lignée vers un modèle absent ; retourne leurs ``(lignée, clé)``
+        """
+        entries = []
+        pointers = []
+        for filename in os.listdir(self.registry_dir):
+            path = os.path.join(self.registry_dir, filename)
+            if filename.endswith(".latest"):
+                pointers.append(path)
+                continue
+            if not filename.endswith(self.extension):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.stats["disk_evictions"] += 1
+            except FileNotFoundError:
+                pass
+        self._disk_total = total
+
+        dropped = []
+        for path in pointers:
+            lineage = os.path.basename(path)[:-len(".latest")]
+            key = self._disk_get_latest(lineage)
+            # Vérifié fichier par fichier : un autre worker a pu écrire le modèle depuis le parcours
+            if key is None or os.path.exists(self._path(key)):
+                continue
+            try:
+                os.remove(path)
+                dropped.append((lineage, key))
+            except FileNotFoundError:
+                pass
+        return dropped
+
+    def _lineage_path(self, lineage: str) -> str:
+        return os.path.join(self.registry_dir, lineage + ".latest")
+
+    def _disk_set_latest(self, lineage: str, key: str) -> None:
+        path = self._lineage_path(lineage)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(key)
+        os.replace(tmp_path, path)
+
+    def _disk_get_latest(self, lineage: str) -> Optional[str]:
+        try:
+            with open(self._lineage_path(lineage), encoding="utf-8") as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def disk_usage(self) -> int:
+        if not self.registry_dir:
+            return 0
+        return sum(
+            os.path.getsize(os.path.join(self.registry_dir, f))
+            for f in os.listdir(self.registry_dir) if f.endswith(self.extension)
+        )
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+
+    async def get_or_train(self, key: str, train: Callable[[], Any],
+                           lineage: Optional[str] = None) -> Tuple[Any, bool]:
+        """
+        Retourne ``(artefact, trouvé)`` : l'artefact en cache pour ``key``, ou
+        celui produit par ``train()`` (exécuté par l'exécuteur ML, une seule
+        fois même si plusieurs requêtes l'attendent). Avec ``lineage``, ``key``
+        devient le dernier modèle de la lignée.
+        """
+        artifact = self._memory.get(key, _MISSING)
+        if artifact is not _MISSING:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            await self._set_latest(lineage, key)
+            return artifact, True
+
+        future = self._pending.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+        else:
+            future = asyncio.ensure_future(self._load_or_train(key, train))
+            self._pending[key] = future
+            future.add_done_callback(lambda f: self._pending.pop(key, None))
+        result = await asyncio.shield(future)
+        await self._set_latest(lineage, key)
+        return result
+
+    async def _set_latest(self, lineage: Optional[str], key: str) -> None:
+        if lineage is None or self._latest.get(lineage) == key:
+            return
+        self._latest[lineage] = key
+        if self.registry_dir:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self._disk_set_latest, lineage, key)
+            except OSError as e:
+                logger.warning(f"⚠️ Lignée {lineage[:12]} non enregistrée: {e}")
+
+    async def get_latest(self, lineage: str) -> Optional[Any]:
+        """Dernier modèle enregistré pour ``lineage`` (mémoire puis disque), ou None"""
+        key = self._latest.get(lineage)
+        loop = asyncio.get_running_loop()
+        if key is None and self.registry_dir:
+            key = await loop.run_in_executor(None, self._disk_get_latest, lineage)
+        if key is None:
+            return None
+        self._latest[lineage] = key
+        artifact = self._memory.get(key, _MISSING)
+        if artifact is _MISSING and self.registry_dir:
+            artifact = await loop.run_in_executor(None, self._disk_get, key)
+            if artifact is not _MISSING:
+                self._memory_set(key, artifact)
+        return None if artifact is _MISSING else artifact
+
+    async def _load_or_train(self, key: str, train: Callable[[], Any]) -> Tuple[Any, bool]:
+        loop = asyncio.get_running_loop()
+        if self.registry_dir:
+            artifact = await loop.run_in_executor(None, self._disk_get, key)
+            if artifact is not _MISSING:
+                self.stats["disk_hits"] += 1
+                self._memory_set(key, artifact)
+                return artifact, True
+
+        started = time.monotonic()
+        artifact = await self.executor.run(train)
+        self.stats["trainings"] += 1
+        self.stats["training_seconds"] += time.monotonic() - started
+        self._memory_set(key, artifact)
+
+        if self.registry_dir:
+            try:
+                dropped = await loop.run_in_executor(None, self._disk_set, key, artifact)
+            except Exception as e:
+                logger.warning(f"⚠️ Sauvegarde du modèle {key[:12]} impossible: {e}")
+            else:
+                for lineage, evicted in dropped:
+                    # Un modèle encore en mémoire reste la base de sa lignée dans ce worker
+                    if self._latest.get(lineage) == evicted and evicted not in self._memory:
+                        del self._latest[lineage]
+        return artifact, False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "training_seconds": round(self.stats["training_seconds"], 3),
+            "memory_items": len(self._memory),
+            "lineages": len(self._latest),
+            "max_memory_items": self.memory_items,
+            "memory_bytes": self._memory_total,
+            "max_memory_bytes": self.memory_bytes,
+            "pending": len(self._pending),
+            "disk_enabled": self.registry_dir is not None,
+            "disk_bytes": self._disk_total,
+            "max_bytes": self.max_bytes
+        }
@@ -1,33 +1,141 @@
 """
-Modèle de prédiction de mortalité avec Random Forest
+Modèle de prédiction de mortalité (Random Forest ou gradient boosting par histogrammes)
 """
 
+import copy
+import os
+
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.multioutput import MultiOutputRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import logging
-from typing import List, Tuple, Optional
+from typing import Any, Callable, List, NamedTuple, Tuple, Optional
+
+from models.model_registry import fingerprint_arrays
 
 logger = logging.getLogger(__name__)
 
+class Forecast(NamedTuple):
+    """Prévision jour par jour avec son intervalle de prédiction"""
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    method: str
+    level: float
+    
+    def head(self, horizon: int) -> "Forecast":
+        return Forecast(self.mean[:horizon].copy(), self.lower[:horizon].copy(), self.upper[:horizon].copy(),
+                        self.method, self.level)
+
+
 class MortalityPredictor:
-    """Modèle de prédiction de mortalité"""
-    
-    def __init__(self):
-        self.model = RandomForestRegressor(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42,
-            n_jobs=-1
-        )
+    """
+    Modèle de prédiction de mortalité
+    
+    Deux stratégies de prévision :
+    - ``recursive`` : le modèle prédit un jour, la prédiction est réinjectée
+      dans les features pour le jour suivant (``horizon`` appels successifs)
+    - ``direct`` : un modèle multi-sorties prédit les ``max_horizon`` jours
+      suivants d'un coup à partir de la dernière ligne de features (un seul
+      appel à ``predict``, pas d'erreur réinjectée)
+    
+    Deux modèles (``backend``, défaut ``ML_MORTALITY_BACKEND``) :
+    - ``random_forest`` : 100 arbres de profondeur 10
+    - ``hist_gradient_boosting`` : gradient boosting sur features discrétisées
+      en histogrammes, plus rapide à entraîner et plus léger à stocker (un
+      modèle par jour d'horizon en mode ``direct``)
+    
+    Les intervalles de prédiction sont obtenus sans réentraînement ni bootstrap :
+    - ``trees`` : quantiles des prédictions des arbres de la forêt
+    - ``qrf`` : forêt de régression quantile (Meinshausen) ; quantiles pondérés
+      des cibles d'entraînement partageant les feuilles de la ligne prédite
+    - ``residuals`` : quantiles des résidus de validation (par jour d'horizon
+      en mode ``direct``, élargis en racine de l'horizon en ``recursive``) ;
+      seule méthode du gradient boosting, qui n'a pas de forêt à interroger
+    
+    Mise à jour incrémentale (``refresh``) : quand quelques jours s'ajoutent à
+    l'historique déjà appris, ``ML_INCREMENTAL_TREES`` arbres sont entraînés
+    (warm start) sur les ``ML_INCREMENTAL_WINDOW`` derniers jours et autant
+    d'arbres parmi les plus anciens sont retirés. Un réentraînement complet
+    reste fait si l'historique a été révisé, si trop de jours se sont ajoutés
+    (``ML_INCREMENTAL_MAX_NEW_DAYS``), après ``ML_INCREMENTAL_MAX_UPDATES``
+    mises à jour, ou si l'erreur sur les nouveaux jours dépasse
+    ``ML_INCREMENTAL_MAX_ERROR_RATIO`` fois la MAE de validation. Le gradient
+    boosting, rapide à entraîner, est toujours réentraîné entièrement.
+    """
+    
+    # Hyperparamètres : font partie de la clé du registre de modèles
+    MODEL_PARAMS = {"n_estimators": 100, "max_depth": 10, "random_state": 42}
+    BACKEND_PARAMS = {
+        "random_forest": MODEL_PARAMS,
+        "hist_gradient_boosting": {"max_iter": 100, "learning_rate": 0.1, "max_leaf_nodes": 15,
+                                   "early_stopping": False, "random_state": 42}
+    }
+    MODEL_TYPES = {"random_forest": "Random Forest", "hist_gradient_boosting": "Histogram Gradient Boosting"}
+    # Version du format sérialisé (clé du registre) : à incrémenter si les attributs changent
+    FORMAT_VERSION = 4
+    STRATEGIES = ("recursive", "direct")
+    BACKENDS = tuple(BACKEND_PARAMS)
+    INTERVAL_METHODS = ("trees", "qrf", "residuals")
+    
+    def __init__(self, strategy: Optional[str] = None, max_horizon: Optional[int] = None,
+                 interval_method: Optional[str] = None, interval_level: Optional[float] = None,
+                 backend: Optional[str] = None):
+        self.strategy = strategy or os.getenv("ML_MORTALITY_STRATEGY", "recursive")
+        if self.strategy not in self.STRATEGIES:
+            raise ValueError(f"Stratégie inconnue: {self.strategy} (attendu: {', '.join(self.STRATEGIES)})")
+        self.backend = backend or os.getenv("ML_MORTALITY_BACKEND", "random_forest")
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Modèle inconnu: {self.backend} (attendu: {', '.join(self.BACKENDS)})")
+        self.model_params = self.BACKEND_PARAMS[self.backend]
+        # Horizon maximal appris par le mode direct
+        self.max_horizon = max_horizon or int(os.getenv("ML_PREDICTION_HORIZON", 30))
+        # Intervalle de prédiction (méthode et niveau de couverture)
+        self.interval_method = interval_method or os.getenv("ML_INTERVAL_METHOD", "trees")
+        if self.interval_method not in self.INTERVAL_METHODS:
+            raise ValueError(f"Méthode d'intervalle inconnue: {self.interval_method} "
+                             f"(attendu: {', '.join(self.INTERVAL_METHODS)})")
+        if self.backend != "random_forest":
+            # Pas de forêt : ni dispersion des arbres ni feuilles partagées
+            self.interval_method = "residuals"
+        self.interval_level = interval_level or float(os.getenv("ML_INTERVAL_LEVEL", 0.9))
+        # Politique de mise à jour incrémentale
+        self.incremental_trees = int(os.getenv("ML_INCREMENTAL_TREES", 10))
+        self.incremental_window = int(os.getenv("ML_INCREMENTAL_WINDOW", 180))
+        self.max_updates = int(os.getenv("ML_INCREMENTAL_MAX_UPDATES", 20))
+        self.max_new_days = int(os.getenv("ML_INCREMENTAL_MAX_NEW_DAYS", 14))
+        self.max_error_ratio = float(os.getenv("ML_INCREMENTAL_MAX_ERROR_RATIO", 2.0))
+        self.model = self._build_model()
         self.scaler = StandardScaler()
         self.is_trained = False
         self.feature_names = []
         self.accuracy_metrics = {}
+        # Feuilles atteintes par les lignes d'entraînement et leurs cibles (mode qrf)
+        self._train_leaves: Optional[np.ndarray] = None
+        self._train_targets: Optional[np.ndarray] = None
+        # Résidus de validation (échantillons, sorties) (mode residuals)
+        self._residuals: Optional[np.ndarray] = None
+        # Historique appris (nombre de lignes, empreinte) et mises à jour depuis le dernier entraînement complet
+        self.n_samples = 0
+        self.data_fingerprint: Optional[str] = None
+        self.updates_since_refit = 0
+        self.training = {"mode": None}
+        # Dernière prévision calculée : (empreinte des dernières lignes de X, Forecast)
+        self._forecast: Optional[Tuple[bytes, "Forecast"]] = None
         
+    def _build_model(self):
+        """Estimateur non entraîné du backend choisi"""
+        if self.backend == "random_forest":
+            return RandomForestRegressor(**self.MODEL_PARAMS, n_jobs=-1)
+        model = HistGradientBoostingRegressor(**self.model_params)
+        # Une seule sortie par modèle : un modèle par jour d'horizon en mode direct
+        return MultiOutputRegressor(model) if self.strategy == "direct" else model
+    
     def train_and_predict(self, X: np.ndarray, y: np.ndarray, 
                          horizon: int = 7, feature_names: Optional[List[str]] = None) -> np.ndarray:
         """
@@ -42,6 +150,21 @@ class MortalityPredictor:
         Returns:
             Prédictions pour les prochains jours
         """
+        if horizon <= 0:
+            raise ValueError("L'horizon de prédiction doit être positif")
+        
+        self.fit(X, y, feature_names)
+        return self.predict_future(X, horizon)
+    
+    def fit(self, X: np.ndarray, y: np.ndarray, feature_names: Optional[List[str]] = None) -> "MortalityPredictor":
+        """
+        Entraîne le modèle (scaler + estimateur du backend) et calcule ses métriques
+        sur les 20 % les plus récents des données
+        
+        En mode ``direct``, la cible de la ligne ``t`` est le vecteur
+        ``y[t+1 : t+1+max_horizon]`` (les dernières lignes, sans futur complet,
+        ne servent pas à l'entraînement).
+        """
         
         # Validation des données d'entrée
         if len(X) != len(y):
@@ -50,16 +173,19 @@ class MortalityPredictor:
         if len(X) < 20:
             raise ValueError("Au moins 20 échantillons requis pour l'entraînement")
         
-        if horizon <= 0:
-            raise ValueError("L'horizon de prédiction doit être positif")
-        
-        if horizon > 30:
-            logger.warning(f"Horizon de prédiction élevé ({horizon} jours) - précision peut diminuer")
-        
         if feature_names:
             self.feature_names = feature_names
+        
+        self.n_samples = len(X)
+        self.data_fingerprint = fingerprint_arrays(X, y)
+        self.updates_since_refit = 0
+        self.training = {"mode": "full", "samples": len(X)}
+        
+        if self.strategy == "direct":
+            X, y = self._direct_targets(X, y)
             
-        logger.info(f"🤖 Entraînement du modèle Random Forest avec {len(X)} échantillons")
+        logger.info(f"🤖 Entraînement du modèle {self.MODEL_TYPES[self.backend]} ({self.strategy}) "
+                    f"avec {len(X)} échantillons")
         
         # Division train/test
         X_train, X_test, y_train, y_test = train_test_split(
@@ -72,9 +198,13 @@ class MortalityPredictor:
         
         # Entraînement du modèle
         self.model.fit(X_train_scaled, y_train)
+        if self.backend == "random_forest":
+            self._train_leaves = self.model.apply(X_train_scaled).astype(np.int32)
+            self._train_targets = np.ascontiguousarray(y_train, dtype=np.float64).reshape(len(y_train), -1)
         
         # Évaluation sur le test set
         y_pred_test = self.model.predict(X_test_scaled)
+        self._residuals = np.asarray(y_test - y_pred_test, dtype=np.float64).reshape(len(y_test), -1)
         
         # Calcul des métriques
         self.accuracy_metrics = {
@@ -88,34 +218,241 @@ class MortalityPredictor:
         logger.info(f"📊 Métriques du modèle: MAE={self.accuracy_metrics['mae']:.6f}, "
                    f"RMSE={self.accuracy_metrics['rmse']:.6f}, R²={self.accuracy_metrics['r2']:.3f}")
         
-        # Prédictions futures
-        predictions = self._predict_future(X, horizon)
-        
+        self._forecast = None
         self.is_trained = True
-        return predictions
+        return self
+    
+    # ------------------------------------------------------------------
+    # Mise à jour incrémentale
+    # ------------------------------------------------------------------
+    
+    def refit_reason(self, X: np.ndarray, y: np.ndarray) -> Optional[str]:
+        """Raison d'un réentraînement complet sur ``(X, y)``, ou None si une mise à jour incrémentale suffit"""
+        if not self.is_trained:
+            return "modèle non entraîné"
+        if self.backend != "random_forest":
+            return "modèle sans mise à jour incrémentale"
+        new_days = len(X) - self.n_samples
+        if new_days <= 0:
+            return "historique plus court que celui appris"
+        if new_days > self.max_new_days:
+            return f"{new_days} nouveaux jours (> {self.max_new_days})"
+        if self.updates_since_refit >= self.max_updates:
+            return f"{self.updates_since_refit} mises à jour depuis le dernier entraînement complet"
+        if fingerprint_arrays(X[:self.n_samples], y[:self.n_samples]) != self.data_fingerprint:
+            return "historique révisé"
+        error = self._new_days_error(X, y)
+        reference = self.accuracy_metrics.get("mae") or 0.0
+        if reference > 0 and error > self.max_error_ratio * reference:
+            return f"dérive : MAE {error:.6f} sur les nouveaux jours (validation {reference:.6f})"
+        return None
+    
+    def _new_days_error(self, X: np.ndarray, y: np.ndarray) -> float:
+        """MAE du modèle actuel sur les jours ajoutés depuis son entraînement (prévision à un jour)"""
+        if self.strategy == "direct":
+            # Sortie « lendemain » depuis la veille de chaque nouveau jour
+            features, actual = X[self.n_samples - 1:-1], y[self.n_samples:]
+            predicted = self.model.predict(self.scaler.transform(features))[:, 0]
+        else:
+            features, actual = X[self.n_samples:], y[self.n_samples:]
+            predicted = self.model.predict(self.scaler.transform(features))
+        return float(mean_absolute_error(actual, predicted))
     
-    def _predict_future(self, X: np.ndarray, horizon: int) -> np.ndarray:
+    def refresh(self, X: np.ndarray, y: np.ndarray,
+                feature_names: Optional[List[str]] = None) -> "MortalityPredictor":
+        """
+        Nouveau prédicteur pour l'historique étendu ``(X, y)`` : mise à jour
+        incrémentale de celui-ci si la politique le permet, réentraînement
+        complet sinon. L'instance courante (partagée via le registre) n'est
+        pas modifiée.
+        """
+        reason = self.refit_reason(X, y)
+        if reason is not None:
+            logger.info(f"🔁 Réentraînement complet du modèle de mortalité : {reason}")
+            refit = copy.copy(self)
+            refit.model = self._build_model()
+            refit.scaler = StandardScaler()
+            refit.is_trained = False
+            refit.fit(X, y, feature_names)
+            refit.training["reason"] = reason
+            return refit
+        updated = copy.deepcopy(self)
+        updated._update(X, y)
+        return updated
+    
+    def _update(self, X: np.ndarray, y: np.ndarray) -> None:
+        """Ajoute des arbres entraînés sur la fenêtre récente et retire autant des plus anciens"""
+        new_days = len(X) - self.n_samples
+        error = self._new_days_error(X, y)
+        X_recent, y_recent = X[-self.incremental_window:], y[-self.incremental_window:]
+        if self.strategy == "direct":
+            X_recent, y_recent = self._direct_targets(X_recent, y_recent)
+        X_recent_scaled = self.scaler.transform(X_recent)
+        
+        n_trees = len(self.model.estimators_)
+        self.model.set_params(warm_start=True, n_estimators=n_trees + self.incremental_trees)
+        self.model.fit(X_recent_scaled, y_recent)
+        self.model.estimators_ = self.model.estimators_[self.incremental_trees:]
+        self.model.set_params(warm_start=False, n_estimators=n_trees)
+        
+        # Forêt de régression quantile : feuilles de la fenêtre récente
+        self._train_leaves = self.model.apply(X_recent_scaled).astype(np.int32)
+        self._train_targets = np.ascontiguousarray(y_recent, dtype=np.float64).reshape(len(y_recent), -1)
+        
+        self.n_samples = len(X)
+        self.data_fingerprint = fingerprint_arrays(X, y)
+        self.updates_since_refit += 1
+        self.training = {
+            "mode": "incremental",
+            "new_days": new_days,
+            "new_days_mae": error,
+            "trees_replaced": self.incremental_trees,
+            "window": len(X_recent),
+            "updates_since_refit": self.updates_since_refit
+        }
+        self._forecast = None
+        logger.info(f"➕ Modèle de mortalité mis à jour : {new_days} jour(s), "
+                    f"{self.incremental_trees} arbres remplacés ({self.updates_since_refit} mise(s) à jour)")
+    
+    def _direct_targets(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Lignes de ``X`` ayant ``max_horizon`` jours de futur connu, et ce futur en cible (vue sans copie)"""
+        n_rows = len(X) - self.max_horizon
+        if n_rows < 20:
+            raise ValueError(f"Au moins {20 + self.max_horizon} échantillons requis pour le mode direct "
+                             f"(horizon {self.max_horizon})")
+        return X[:n_rows], sliding_window_view(y[1:], self.max_horizon)[:n_rows]
+    
+    def predict_future(self, X: np.ndarray, horizon: int) -> np.ndarray:
+        """Prédit les ``horizon`` prochains jours à partir des dernières lignes de ``X``"""
+        return self.forecast(X, horizon).mean
+    
+    def forecast(self, X: np.ndarray, horizon: int) -> "Forecast":
+        """
+        Prévision et intervalle de prédiction des ``horizon`` prochains jours
+        
+        La prévision ne dépend que des 14 dernières lignes de ``X`` : elle est
+        mémorisée et un horizon plus court en réutilise le début.
+        """
+        if not self.is_trained:
+            raise ValueError("Le modèle doit être entraîné avant de faire des prédictions")
+        if horizon <= 0:
+            raise ValueError("L'horizon de prédiction doit être positif")
+        if self.strategy == "direct" and horizon > self.max_horizon:
+            raise ValueError(f"Horizon {horizon} supérieur à l'horizon appris par le mode direct ({self.max_horizon})")
+        if horizon > 30:
+            logger.warning(f"Horizon de prédiction élevé ({horizon} jours) - précision peut diminuer")
+        
+        tail = np.ascontiguousarray(X[-14:]).tobytes()
+        if self._forecast is not None and self._forecast[0] == tail and len(self._forecast[1].mean) >= horizon:
+            return self._forecast[1].head(horizon)
+        if self.strategy == "direct":
+            outputs = np.arange(self.max_horizon)
+        else:
+            outputs = np.zeros(horizon, dtype=np.intp)
+        
+        if self.backend != "random_forest":
+            if self.strategy == "direct":
+                mean = np.ravel(self.model.predict(self.scaler.transform(X[-1:])))
+            else:
+                mean = self._predict_future(X, horizon, self._boosting_step)
+            lower, upper = self._residual_interval(mean, outputs)
+        else:
+            if self.strategy == "direct":
+                # Toute la trajectoire (max_horizon jours) en un seul passage sur les arbres
+                leaves = self.model.apply(self.scaler.transform(X[-1:]))
+                rows = np.zeros(self.max_horizon, dtype=np.intp)
+            else:
+                leaves = self._predict_future(X, horizon, self._forest_step)
+                rows = np.arange(horizon)
+            
+            # Prédictions de chaque arbre pour chaque jour : (jours, arbres)
+            step_trees = self._tree_values(leaves)[rows, :, outputs]
+            mean = step_trees.mean(axis=1)
+            if self.interval_method == "residuals":
+                lower, upper = self._residual_interval(mean, outputs)
+            else:
+                lower, upper = self._interval(leaves, rows, outputs, step_trees)
+        result = Forecast(mean, lower, upper, self.interval_method, self.interval_level)
+        self._forecast = (tail, result)
+        return result.head(horizon)
+    
+    def _tree_values(self, leaves: np.ndarray) -> np.ndarray:
+        """Valeurs des feuilles ``leaves`` (lignes, arbres) pour chaque arbre : (lignes, arbres, sorties)"""
+        return np.stack(
+            [estimator.tree_.value[leaves[:, t], :, 0] for t, estimator in enumerate(self.model.estimators_)],
+            axis=1
+        )
+    
+    def _interval(self, leaves: np.ndarray, rows: np.ndarray, outputs: np.ndarray,
+                  step_trees: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bornes basse et haute de chaque jour, pour ``interval_level``"""
+        alpha = (1.0 - self.interval_level) / 2
+        if self.interval_method == "trees" or self._train_leaves is None:
+            lower, upper = np.quantile(step_trees, [alpha, 1.0 - alpha], axis=1)
+            return lower, upper
+        
+        # Poids de chaque échantillon d'entraînement : part des feuilles partagées
+        # avec la ligne prédite, chaque feuille pesant 1 / effectif (lignes, échantillons)
+        same_leaf = self._train_leaves[None, :, :] == leaves[:, None, :]
+        weights = (same_leaf / np.maximum(same_leaf.sum(axis=1, keepdims=True), 1)).mean(axis=2)
+        
+        # Quantiles pondérés, tous les jours d'un coup : (jours, échantillons)
+        targets = self._train_targets[:, outputs].T
+        order = np.argsort(targets, axis=1)
+        sorted_targets = np.take_along_axis(targets, order, axis=1)
+        cumulative = np.cumsum(np.take_along_axis(weights[rows], order, axis=1), axis=1)
+        cumulative /= cumulative[:, -1:]
+        bounds = []
+        for q in (alpha, 1.0 - alpha):
+            index = np.minimum((cumulative < q).sum(axis=1), targets.shape[1] - 1)
+            bounds.append(sorted_targets[np.arange(len(targets)), index])
+        return bounds[0], bounds[1]
+    
+    def _residual_interval(self, mean: np.ndarray, outputs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bornes à partir des quantiles des résidus de validation de chaque sortie"""
+        alpha = (1.0 - self.interval_level) / 2
+        low, high = np.quantile(self._residuals[:, outputs], [alpha, 1.0 - alpha], axis=0)
+        if self.strategy == "recursive":
+            # Résidus à un jour : l'erreur réinjectée s'accumule au fil de l'horizon
+            widening = np.sqrt(np.arange(1, len(mean) + 1))
+            low, high = low * widening, high * widening
+        return mean + low, mean + high
+    
+    def _forest_step(self, features_scaled: np.ndarray) -> Tuple[float, np.ndarray]:
+        """Un jour de prévision récursive : un passage sur les arbres, dont les feuilles servent aussi à l'intervalle"""
+        day_leaves = self.model.apply(features_scaled)
+        return self._tree_values(day_leaves)[0, :, 0].mean(), day_leaves[0]
+    
+    def _boosting_step(self, features_scaled: np.ndarray) -> Tuple[float, float]:
+        """Un jour de prévision récursive du gradient boosting"""
+        pred = float(self.model.predict(features_scaled)[0])
+        return pred, pred
+    
+    def _predict_future(self, X: np.ndarray, horizon: int,
+                        step: Callable[[np.ndarray], Tuple[float, Any]]) -> np.ndarray:
         """
         Prédit les valeurs futures en utilisant les dernières données
         
         Args:
             X: Dernières features disponibles
             horizon: Nombre de jours à prédire
+            step: Prédiction d'un jour à partir de ses features standardisées,
+                retourne ``(prédiction, valeur conservée pour ce jour)``
             
         Returns:
-            Prédictions pour les prochains jours
+            Valeurs conservées pour chaque jour : feuilles atteintes dans chaque
+            arbre (jours, arbres) pour la forêt, prédictions (jours,) sinon
         """
         
-        predictions = []
+        records = []
         last_features = X[-1:].copy()  # Dernière ligne de features
         
         for day in range(horizon):
             # Standardisation
             last_features_scaled = self.scaler.transform(last_features)
             
-            # Prédiction
-            pred = self.model.predict(last_features_scaled)[0]
-            predictions.append(pred)
+            pred, record = step(last_features_scaled)
+            records.append(record)
             
             # Mise à jour des features pour la prochaine prédiction
             # (simulation simple - en réalité il faudrait de vraies données futures)
@@ -134,7 +471,7 @@ class MortalityPredictor:
                 if len(X) >= 7:
                     last_features[0, 7] = np.std(X[-7:, 3])  # mortality_rate_std7
         
-        return np.array(predictions)
+        return np.array(records)
     
     def get_accuracy(self) -> dict:
         """Retourne les métriques de précision du modèle"""
@@ -145,7 +482,10 @@ class MortalityPredictor:
         if not self.is_trained:
             return {}
         
-        importance = self.model.feature_importances_
+        # Le gradient boosting par histogrammes n'expose pas d'importance des features
+        importance = getattr(self.model, "feature_importances_", None)
+        if importance is None:
+            return {}
         feature_importance = {}
         
         for i, feature in enumerate(self.feature_names):
@@ -155,7 +495,7 @@ class MortalityPredictor:
     
     def predict_single(self, features: np.ndarray) -> float:
         """
-        Prédit une seule valeur
+        Prédit une seule valeur (le premier jour en mode ``direct``)
         
         Args:
             features: Features pour la prédiction
@@ -167,19 +507,20 @@ class MortalityPredictor:
             raise ValueError("Le modèle doit être entraîné avant de faire des prédictions")
         
         features_scaled = self.scaler.transform(features.reshape(1, -1))
-        return float(self.model.predict(features_scaled)[0])
+        return float(np.ravel(self.model.predict(features_scaled))[0])
     
     def get_model_info(self) -> dict:
         """Retourne les informations du modèle"""
         return {
-            "model_type": "Random Forest",
+            "model_type": self.MODEL_TYPES[self.backend],
+            "backend": self.backend,
+            "strategy": self.strategy,
+            "max_horizon": self.max_horizon if self.strategy == "direct" else None,
+            "interval": {"method": self.interval_method, "level": self.interval_level},
+            "training": self.training,
             "is_trained": self.is_trained,
             "feature_names": self.feature_names,
             "n_features": len(self.feature_names) if self.feature_names else 0,
-            "parameters": {
-                "n_estimators": self.model.n_estimators,
-                "max_depth": self.model.max_depth,
-                "random_state": self.model.random_state
-            },
+            "parameters": dict(self.model_params),
             "accuracy": self.accuracy_metrics if self.is_trained else None
         } 
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Pool de prédicteurs réutilisables
+
+Chaque entraînement emprunte une instance dont il a l'usage exclusif (scaler,
+modèle et métriques ne sont jamais partagés entre deux requêtes en cours).
+À la restitution, l'instance est réinitialisée puis gardée pour un prochain
+entraînement : les objets coûteux qu'elle porte (graphe Keras compilé...)
+sont recyclés au lieu d'être reconstruits.
+
+Une instance écartée (pool plein, échec) est libérée par sa méthode
+``release()`` ; ``on_empty`` est appelé quand plus aucune instance n'existe
+(ni prêtée ni au repos), par exemple pour vider l'état global d'une
+bibliothèque.
+
+Le pool est local au processus : avec ``ML_EXECUTOR=process``, chaque worker
+possède le sien.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PredictorPool:
+    """
+    Instances créées par ``factory`` et prêtées une à une
+
+    Une instance restituée est réinitialisée par sa méthode ``reset()`` (si
+    elle existe) ; au plus ``max_idle`` instances sont gardées au repos.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any], max_idle: Optional[int] = None,
+                 on_empty: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.factory = factory
+        self.on_empty = on_empty
+        self.max_idle = max_idle if max_idle is not None else int(os.getenv("ML_PREDICTOR_POOL_SIZE", 4))
+        self._idle: List[Any] = []
+        self._lock = threading.Lock()
+        self._in_use = 0
+        self.stats = {"created": 0, "reused": 0, "discarded": 0, "emptied": 0}
+
+    def acquire(self) -> Any:
+        with self._lock:
+            self._in_use += 1
+            if self._idle:
+                self.stats["reused"] += 1
+                return self._idle.pop()
+        try:
+            predictor = self.factory()
+        except BaseException:
+            # Aucune instance prêtée : le compteur est rendu (et on_empty appelé si le pool est vide)
+            with self._lock:
+                self._in_use -= 1
+                self._discard([])
+            raise
+        with self._lock:
+            self.stats["created"] += 1
+        return predictor
+
+    def release(self, predictor: Any, reusable: bool = True) -> None:
+        """Restitue ``predictor`` ; ``reusable=False`` l'écarte (ex. échec en cours d'entraînement)"""
+        if reusable and hasattr(predictor, "reset"):
+            try:
+                predictor.reset()
+            except Exception as e:
+                logger.warning(f"⚠️ Réinitialisation d'un prédicteur {self.name} impossible: {e}")
+                reusable = False
+        with self._lock:
+            self._in_use -= 1
+            if reusable and len(self._idle) < self.max_idle:
+                self._idle.append(predictor)
+                return
+            self.stats["discarded"] += 1
+            self._discard([predictor])
+
+    def _discard(self, predictors: List[Any]) -> None:
+        """Libère des instances écartées (verrou tenu : aucun prêt ne démarre pendant ``on_empty``)"""
+        for predictor in predictors:
+            if hasattr(predictor, "release"):
+                try:
+                    predictor.release()
+                except Exception as e:
+                    logger.warning(f"⚠️ Libération d'un prédicteur {self.name} impossible: {e}")
+        if self.on_empty is not None and self._in_use == 0 and not self._idle:
+            try:
+                self.on_empty()
+                self.stats["emptied"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Nettoyage du pool {self.name} impossible: {e}")
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """``with pool.lease() as predictor:`` — usage exclusif le temps du bloc"""
+        predictor = self.acquire()
+        reusable = True
+        try:
+            yield predictor
+        except BaseException:
+            reusable = False
+            raise
+        finally:
+            self.release(predictor, reusable=reusable)
+
+    def idle(self) -> List[Any]:
+        """Instances au repos (copie de la liste, pour inspection)"""
+        with self._lock:
+            return list(self._idle)
+
+    def clear(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._discard(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "idle": len(self._idle), "in_use": self._in_use, "max_idle": self.max_idle}
@@ -0,0 +1,179 @@
+"""
+Estimation de Rt par l'équation de renouvellement (Cori et al., 2013 ; EpiEstim)
+
+L'incidence du jour t est supposée suivre une loi de Poisson de moyenne
+``Rt * Λt``, où ``Λt = Σs ws * I(t-s)`` est l'infectiosité totale (incidence
+passée pondérée par la distribution discrétisée de l'intervalle sériel ``w``).
+Avec un a priori Gamma sur Rt, supposé constant sur une fenêtre de ``τ`` jours
+se terminant en t, la loi a posteriori est une Gamma de forme
+``a + Σ I`` et d'échelle ``1 / (1/b + Σ Λ)`` (sommes sur la fenêtre).
+
+Tout est vectorisé : l'infectiosité est une convolution calculée en un
+produit matriciel sur des fenêtres glissantes sans copie, les sommes par
+fenêtre viennent de sommes cumulées, et une matrice ``(pays, jours)`` est
+traitée en un seul passage. Aucun entraînement : une estimation prend
+quelques millisecondes et n'exige que ``τ + 1`` jours d'incidence.
+
+Configuration :
+- ``RT_SERIAL_INTERVAL_MEAN`` / ``RT_SERIAL_INTERVAL_SD`` : intervalle sériel (jours)
+- ``RT_CORI_WINDOW`` : fenêtre de lissage τ (jours)
+- ``RT_CREDIBLE_LEVEL`` : niveau de l'intervalle de crédibilité
+"""
+
+import os
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.special import gammainc, gammaincinv
+
+
+class RtEstimate(NamedTuple):
+    """Rt a posteriori par jour (NaN sans infectiosité sur la fenêtre) et intervalle de crédibilité"""
+    mean: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    level: float
+
+
+class RtProjection(NamedTuple):
+    """Projection sur l'horizon : Rt maintenu à sa dernière estimation, incidence par renouvellement"""
+    rt_mean: np.ndarray
+    rt_lower: np.ndarray
+    rt_upper: np.ndarray
+    incidence_mean: np.ndarray
+    incidence_lower: np.ndarray
+    incidence_upper: np.ndarray
+
+
+def discretized_serial_interval(mean: float, sd: float, coverage: float = 0.999) -> np.ndarray:
+    """
+    Poids ``w[s-1]`` de l'intervalle sériel aux délais ``s = 1..S`` : loi Gamma
+    de moyenne ``mean`` et d'écart-type ``sd`` intégrée sur ``[s - 0.5, s + 0.5]``
+    (la masse sous 0.5 jour est reportée sur s = 1), tronquée à ``coverage``
+    """
+    if mean <= 0 or sd <= 0:
+        raise ValueError("L'intervalle sériel doit avoir une moyenne et un écart-type positifs")
+    shape = (mean / sd) ** 2
+    scale = sd ** 2 / mean
+    max_delay = max(1, int(np.ceil(gammaincinv(shape, coverage) * scale)))
+    cdf = gammainc(shape, (np.arange(1, max_delay + 1) + 0.5) / scale)
+    weights = np.diff(cdf, prepend=0.0)
+    return weights / weights.sum()
+
+
+def clean_incidence(values: np.ndarray) -> np.ndarray:
+    """Incidence journalière exploitable : valeurs manquantes et corrections négatives ramenées à 0"""
+    values = np.asarray(values, dtype=np.float64)
+    return np.where(np.isfinite(values) & (values > 0), values, 0.0)
+
+
+class CoriRtEstimator:
+    """
+    Estimateur de Rt de Cori et al. sur une ou plusieurs séries d'incidence
+
+    ``estimate`` et ``project`` acceptent une série ``(jours,)`` ou une matrice
+    ``(séries, jours)`` dont les lignes sont alignées sur les mêmes dates.
+    L'a priori par défaut est celui d'EpiEstim (moyenne 5, écart-type 5).
+    """
+
+    def __init__(self, si_mean: Optional[float] = None, si_sd: Optional[float] = None,
+                 window: Optional[int] = None, level: Optional[float] = None,
+                 prior_mean: float = 5.0, prior_sd: float = 5.0):
+        self.si_mean = si_mean or float(os.getenv("RT_SERIAL_INTERVAL_MEAN", 4.7))
+        self.si_sd = si_sd or float(os.getenv("RT_SERIAL_INTERVAL_SD", 2.9))
+        self.window = window or int(os.getenv("RT_CORI_WINDOW", 7))
+        self.level = level or float(os.getenv("RT_CREDIBLE_LEVEL", 0.95))
+        if self.window < 1:
+            raise ValueError("La fenêtre d'estimation doit être d'au moins 1 jour")
+        self.prior_shape = (prior_mean / prior_sd) ** 2
+        self.prior_scale = prior_sd ** 2 / prior_mean
+        self.serial_interval = discretized_serial_interval(self.si_mean, self.si_sd)
+
+    @property
+    def min_days(self) -> int:
+        """Jours d'incidence nécessaires à une première estimation"""
+        return self.window + 1
+
+    def infectiousness(self, incidence: np.ndarray) -> np.ndarray:
+        """``Λt = Σs ws * I(t-s)`` pour chaque jour (même forme que ``incidence``)"""
+        incidence = np.asarray(incidence, dtype=np.float64)
+        delays = len(self.serial_interval)
+        padded = np.pad(incidence, [(0, 0)] * (incidence.ndim - 1) + [(delays, 0)])
+        # Fenêtre t : I(t-S) .. I(t-1), le poids w1 allant au jour le plus récent
+        windows = sliding_window_view(padded, delays, axis=-1)[..., :incidence.shape[-1], :]
+        return windows @ self.serial_interval[::-1]
+
+    def _window_sums(self, values: np.ndarray) -> np.ndarray:
+        """Sommes sur les ``window`` jours se terminant en t (NaN avant la première fenêtre complète)"""
+        cumulative = np.cumsum(values, axis=-1)
+        sums = np.full(values.shape, np.nan)
+        sums[..., self.window - 1] = cumulative[..., self.window - 1]
+        sums[..., self.window:] = cumulative[..., self.window:] - cumulative[..., :-self.window]
+        return sums
+
+    def posterior(self, incidence: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Forme et échelle de la loi Gamma a posteriori de Rt pour chaque jour"""
+        incidence = clean_incidence(incidence)
+        if incidence.shape[-1] < self.min_days:
+            raise ValueError(f"Au moins {self.min_days} jours d'incidence requis (fenêtre de {self.window} jours)")
+        total_infectiousness = self._window_sums(self.infectiousness(incidence))
+        shape = self.prior_shape + self._window_sums(incidence)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = 1.0 / (1.0 / self.prior_scale + total_infectiousness)
+        # Le premier jour n'a pas d'infectiosité : les fenêtres commencent au jour 1
+        scale[..., :self.window] = np.nan
+        scale = np.where(total_infectiousness > 0, scale, np.nan)
+        return shape, scale
+
+    def estimate(self, incidence: np.ndarray) -> RtEstimate:
+        """Rt a posteriori (moyenne et intervalle de crédibilité à ``level``) pour chaque jour"""
+        shape, scale = self.posterior(incidence)
+        alpha = (1.0 - self.level) / 2
+        return RtEstimate(
+            mean=shape * scale,
+            lower=gammaincinv(shape, alpha) * scale,
+            upper=gammaincinv(shape, 1.0 - alpha) * scale,
+            level=self.level
+        )
+
+    def project(self, incidence: np.ndarray, horizon: int, estimate: Optional[RtEstimate] = None) -> RtProjection:
+        """
+        Projection à ``horizon`` jours : Rt maintenu à sa dernière estimation
+        (hypothèse d'EpiEstim), incidence prolongée par l'équation de
+        renouvellement avec la moyenne et les bornes de Rt
+        """
+        if horizon <= 0:
+            raise ValueError("L'horizon de prédiction doit être positif")
+        incidence = clean_incidence(incidence)
+        estimate = estimate or self.estimate(incidence)
+        last = [np.repeat(values[..., -1:], horizon, axis=-1) for values in estimate[:3]]
+
+        projections = []
+        delays = self.serial_interval[::-1]
+        history = incidence[..., -len(delays):]
+        if history.shape[-1] < len(delays):
+            history = np.pad(history, [(0, 0)] * (history.ndim - 1) + [(len(delays) - history.shape[-1], 0)])
+        for rt in last:
+            extended = np.concatenate([history, np.zeros(rt.shape)], axis=-1)
+            for day in range(horizon):
+                window = extended[..., day:day + len(delays)]
+                extended[..., len(delays) + day] = rt[..., day] * (window @ delays)
+            projections.append(extended[..., len(delays):])
+        return RtProjection(*last, *projections)
+
+    def forecast(self, incidence: np.ndarray, horizon: int) -> Tuple[RtEstimate, RtProjection]:
+        """Estimation jour par jour puis projection (tâche de l'exécuteur ML pour un lot de pays)"""
+        estimate = self.estimate(incidence)
+        return estimate, self.project(incidence, horizon, estimate)
+
+    def get_model_info(self) -> dict:
+        """Retourne les informations du modèle"""
+        return {
+            "model_type": "Cori (équation de renouvellement)",
+            "serial_interval": {"mean": self.si_mean, "sd": self.si_sd, "max_delay": len(self.serial_interval)},
+            "window": self.window,
+            "credible_level": self.level,
+            "prior": {"shape": self.prior_shape, "scale": self.prior_scale},
+            "min_days": self.min_days
+        }
@@ -1,124 +1,645 @@
+"""
+Modèle LSTM de prédiction du taux de transmission (Rt)
+
+TensorFlow (plusieurs secondes et centaines de Mo à l'import) n'est chargé
+qu'au premier entraînement, jamais à l'import de ce module : démarrer un
+worker, lancer les tests ou servir les routes mortalité n'en paie pas le
+coût. Avec ``RT_LSTM_ENABLED=false``, le worker ne l'importe jamais et les
+prédictions Rt LSTM sont refusées.
+
+Cycle de vie des modèles : un entraînement produit un ``TrainedRtModel``
+(poids NumPy, scalers, métriques), indépendant de Keras, que le registre des
+routes garde en mémoire (budget en octets) et sur disque. Une prévision
+recharge ces poids dans un modèle compilé emprunté au pool. Un modèle qui
+quitte le pool libère son graphe ; quand plus aucun modèle n'existe dans le
+processus, la session Keras est vidée (``ML_PREDICTOR_POOL_SIZE=0`` : graphe
+libéré après chaque requête).
+
+Pré-entraînement : ``train_global`` apprend un modèle unique sur les séries
+de plusieurs pays (``scripts.pretrain_rt_lstm``, hors ligne). Par pays, ses
+poids servent de point de départ : ajustement fin de quelques époques
+(``fine_tune``) ou aucun entraînement (``fast``) au lieu de 100 époques
+depuis une initialisation aléatoire (``full``).
+"""
+
+import copy
+import gc
+import os
+import sys
+import threading
+import time
 import numpy as np
 import pandas as pd
-from typing import List, Optional
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Dropout
-from tensorflow.keras.callbacks import EarlyStopping
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import logging
 
+import joblib
+
+from models.model_registry import fingerprint_arrays
+from models.predictor_pool import PredictorPool
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_PRETRAINED_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                       "cache", "pretrained", "rt_lstm_global.joblib")
+
+# Entraînement par pays : complet (initialisation aléatoire), ajustement fin du
+# modèle global pré-entraîné, ou modèle global sans entraînement (rapide)
+LSTM_MODES = ("full", "fine_tune", "fast")
+
+# Features des prédictions Rt (routes et pré-entraînement global)
+RT_FEATURE_COLUMNS = [
+    'day_of_week', 'month', 'day_of_year',
+    'rt_lag1', 'rt_lag7', 'rt_ma7', 'rt_ma14', 'rt_std7'
+]
+
+
+class LSTMDisabledError(RuntimeError):
+    """Le backend LSTM est désactivé sur ce worker (``RT_LSTM_ENABLED=false``) ou TensorFlow n'est pas installé"""
+
+
+def lstm_enabled() -> bool:
+    """Backend LSTM activé (``RT_LSTM_ENABLED``, vrai par défaut)"""
+    return os.getenv("RT_LSTM_ENABLED", "true").lower() == "true"
+
+
+_tensorflow = None
+_tensorflow_lock = threading.Lock()
+_progress_callback_class = None
+
+
+def load_tensorflow():
+    """Module ``tensorflow``, importé au premier appel"""
+    global _tensorflow
+    if not lstm_enabled():
+        raise LSTMDisabledError("Prédiction Rt LSTM désactivée sur ce worker (RT_LSTM_ENABLED=false)")
+    if _tensorflow is None:
+        with _tensorflow_lock:
+            if _tensorflow is None:
+                started = time.perf_counter()
+                try:
+                    import tensorflow
+                except ImportError as e:
+                    raise LSTMDisabledError(
+                        f"TensorFlow non installé ({e}) : moteur Rt LSTM indisponible, utiliser engine=cori"
+                    ) from e
+                _tensorflow = tensorflow
+                logger.info(f"📦 TensorFlow chargé en {time.perf_counter() - started:.1f} s")
+    return _tensorflow
+
+
+def load_keras():
+    """Module ``tensorflow.keras``, importé au premier appel"""
+    return load_tensorflow().keras
+
+
+def _job_progress_callback(progress):
+    """Callback Keras publiant la progression d'un job (classe créée une fois TensorFlow chargé)"""
+    global _progress_callback_class
+    if _progress_callback_class is None:
+        class _JobProgressCallback(load_keras().callbacks.Callback):
+            """Publie époque et pertes dans la progression d'un job et arrête l'entraînement s'il est annulé"""
+
+            def __init__(self, progress):
+                super().__init__()
+                self.progress = progress
+
+            def on_train_batch_end(self, batch, logs=None):
+                self.progress.check_cancelled()
+
+            def on_epoch_end(self, epoch, logs=None):
+                logs = logs or {}
+                self.progress.update(
+                    stage="training",
+                    epoch=epoch + 1,
+                    epochs=self.params.get("epochs"),
+                    loss=float(logs["loss"]) if "loss" in logs else None,
+                    val_loss=float(logs["val_loss"]) if "val_loss" in logs else None
+                )
+                self.progress.check_cancelled()
+
+        _progress_callback_class = _JobProgressCallback
+    return _progress_callback_class(progress)
+
+
+def clean_rt_frame(rt_frame: pd.DataFrame) -> pd.DataFrame:
+    """Colonnes ``date`` (sans fuseau) et ``Rt``, triées par date, sans Rt manquant"""
+    df = pd.DataFrame({
+        'date': pd.to_datetime(rt_frame['date']).dt.tz_localize(None),
+        'Rt': rt_frame['Rt']
+    })
+    df = df.sort_values('date').reset_index(drop=True)
+    return df.dropna(subset=['Rt'])
+
+
+def add_rt_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Ajoute ``RT_FEATURE_COLUMNS`` (calendrier, lags, moyennes mobiles) et retire les lignes incomplètes"""
+    df = df.copy()
+    df['day_of_week'] = df['date'].dt.dayofweek
+    df['month'] = df['date'].dt.month
+    df['day_of_year'] = df['date'].dt.dayofyear
+    # Lags et moyennes mobiles
+    df['rt_lag1'] = df['Rt'].shift(1)
+    df['rt_lag7'] = df['Rt'].shift(7)
+    df['rt_ma7'] = df['Rt'].rolling(window=7).mean()
+    df['rt_ma14'] = df['Rt'].rolling(window=14).mean()
+    df['rt_std7'] = df['Rt'].rolling(window=7).std()
+    return df.dropna()
+
+
+def clear_keras_session() -> None:
+    """Vide l'état global Keras (graphes, compteurs de noms) si TensorFlow a été chargé"""
+    if _tensorflow is None:
+        return
+    _tensorflow.keras.backend.clear_session()
+    gc.collect()
+    logger.info("🧹 Session Keras vidée")
+
+
+class TrainedRtModel(NamedTuple):
+    """
+    LSTM Rt entraîné, sous forme de poids : sérialisable (joblib, exécuteur
+    ``process``) et rechargeable sans réentraînement par ``RtLSTMPredictor.restore``
+    """
+    window_size: int
+    input_shape: Tuple[int, int]
+    weights: List[np.ndarray]
+    scaler_X: StandardScaler
+    scaler_y: StandardScaler
+    feature_names: List[str]
+    accuracy_metrics: Dict[str, Any]
+    training: Dict[str, Any]
+    # Historique appris : base des mises à jour incrémentales
+    n_samples: int
+    data_fingerprint: str
+    updates_since_refit: int
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire occupée par les poids et les paramètres des scalers"""
+        scalers = sum(getattr(scaler, attribute).nbytes for scaler in (self.scaler_X, self.scaler_y)
+                      for attribute in ("mean_", "var_", "scale_"))
+        return sum(weight.nbytes for weight in self.weights) + scalers
+
+
+class PretrainedRtModel(NamedTuple):
+    """
+    LSTM global entraîné hors ligne sur plusieurs pays (``scripts.pretrain_rt_lstm``)
+
+    Ses poids servent de point de départ par pays : chaque pays garde ses
+    propres scalers, le modèle global ayant appris sur des séries standardisées.
+    """
+    window_size: int
+    n_units: int
+    input_shape: Tuple[int, int]
+    weights: List[np.ndarray]
+    feature_names: List[str]
+    series: List[str]
+    accuracy_metrics: Dict[str, Any]
+    version: str
+    created_at: str
+
+    def matches(self, predictor: "RtLSTMPredictor", feature_names: List[str]) -> bool:
+        """Architecture et features identiques à celles de ``predictor`` : poids réutilisables"""
+        return (self.window_size == predictor.window_size and self.n_units == predictor.n_units
+                and list(self.feature_names) == list(feature_names))
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "created_at": self.created_at,
+            "series": len(self.series),
+            "window_size": self.window_size,
+            "n_units": self.n_units,
+            "accuracy": self.accuracy_metrics
+        }
+
+
 class RtLSTMPredictor:
     """
     Modèle LSTM pour la prédiction du taux de transmission (Rt)
+
+    Mise à jour incrémentale (``refresh_model``) : quand quelques jours
+    s'ajoutent à l'historique appris, le modèle reçoit ``RT_INCREMENTAL_EPOCHS``
+    époques sur les fenêtres des ``RT_INCREMENTAL_WINDOW`` derniers jours,
+    scalers inchangés (0 : aucun pas de gradient, la prévision part
+    simplement de la fenêtre la plus récente). Réentraînement complet si
+    l'historique est révisé, si trop de jours s'ajoutent
+    (``RT_INCREMENTAL_MAX_NEW_DAYS``), après ``RT_INCREMENTAL_MAX_UPDATES``
+    mises à jour, ou si l'erreur à un jour sur les nouveaux jours dépasse
+    ``RT_INCREMENTAL_MAX_ERROR_RATIO`` fois la MAE de validation.
     """
-    def __init__(self, window_size: int = 14, n_units: int = 64, dropout: float = 0.2, patience: int = 10):
+    # Format des modèles entraînés (TrainedRtModel) : entre dans les clés du registre
+    FORMAT_VERSION = 3
+
+    def __init__(self, window_size: int = 14, n_units: int = 64, dropout: float = 0.2, patience: int = 10,
+                 epochs: int = 100):
         self.window_size = window_size
         self.n_units = n_units
         self.dropout = dropout
         self.patience = patience
+        self.epochs = epochs
+        self.incremental_epochs = int(os.getenv("RT_INCREMENTAL_EPOCHS", 3))
+        self.incremental_window = int(os.getenv("RT_INCREMENTAL_WINDOW", 60))
+        self.max_updates = int(os.getenv("RT_INCREMENTAL_MAX_UPDATES", 30))
+        self.max_new_days = int(os.getenv("RT_INCREMENTAL_MAX_NEW_DAYS", 14))
+        self.max_error_ratio = float(os.getenv("RT_INCREMENTAL_MAX_ERROR_RATIO", 2.0))
         self.scaler_X = StandardScaler()
         self.scaler_y = StandardScaler()
         self.model = None
         self.is_trained = False
         self.feature_names = []
         self.accuracy_metrics = {}
+        self.training = {}
+        self.n_samples = 0
+        self.data_fingerprint: Optional[str] = None
+        self.updates_since_refit = 0
+        # Poids initiaux du modèle compilé, restaurés quand le modèle est réutilisé
+        self._initial_weights = None
+        self._model_shape = None
+        # Prévision glissante compilée pour ce modèle (recyclée avec lui)
+        self._rolling_forecast = None
+
+    def reset(self):
+        """
+        Oublie l'entraînement (scalers, métriques) en gardant le modèle compilé,
+        réinitialisé au prochain entraînement de même forme d'entrée
+        """
+        self.scaler_X = StandardScaler()
+        self.scaler_y = StandardScaler()
+        self.is_trained = False
+        self.feature_names = []
+        self.accuracy_metrics = {}
+        self.training = {}
+        self.n_samples = 0
+        self.data_fingerprint: Optional[str] = None
+        self.updates_since_refit = 0
+
+    def release(self):
+        """Libère le modèle compilé et son graphe de prévision (instance écartée du pool)"""
+        self.reset()
+        self.model = None
+        self._initial_weights = None
+        self._model_shape = None
+        self._rolling_forecast = None
+
+    def weights_nbytes(self) -> int:
+        """Mémoire des poids du modèle compilé (courants et initiaux), 0 sans modèle"""
+        if self._initial_weights is None:
+            return 0
+        return 2 * sum(weight.nbytes for weight in self._initial_weights)
+
+    def _get_model(self, input_shape):
+        """Modèle compilé pour ``input_shape`` : réutilisé (poids et optimiseur remis à zéro) ou créé"""
+        if self.model is not None and self._model_shape == input_shape:
+            self.model.set_weights(self._initial_weights)
+            optimizer_variables = self.model.optimizer.variables
+            if callable(optimizer_variables):
+                optimizer_variables = optimizer_variables()
+            for variable in optimizer_variables:
+                # Moments et compteur d'itérations remis à zéro, taux d'apprentissage conservé
+                if "learning_rate" not in variable.name:
+                    variable.assign(np.zeros_like(np.asarray(variable)))
+            return self.model
+        self.model = self._create_model(input_shape)
+        self._initial_weights = self.model.get_weights()
+        self._model_shape = input_shape
+        self._rolling_forecast = self._build_rolling_forecast(input_shape)
+        return self.model
+
+    def _build_rolling_forecast(self, input_shape):
+        """
+        Prévision glissante compilée en un seul graphe (``tf.function``)
+
+        Les ``horizon`` appels du modèle et le décalage de la fenêtre
+        s'exécutent dans une boucle du graphe, sans repasser par Python ni par
+        ``predict`` (coût fixe élevé à chaque appel). La fenêtre garde une forme
+        fixe et la signature est figée : changer d'horizon ne recompile pas.
+        Le graphe lit les variables du modèle : il reste valable après
+        réentraînement ou réinitialisation des poids.
+        """
+        tf = load_tensorflow()
+        model = self.model
+
+        @tf.function(input_signature=[tf.TensorSpec(input_shape, tf.float32), tf.TensorSpec((), tf.int32)])
+        def rolling_forecast(window, horizon):
+            predictions = tf.TensorArray(tf.float32, size=horizon)
+            for step in tf.range(horizon):
+                prediction = model(window[tf.newaxis], training=False)[0, 0]
+                predictions = predictions.write(step, prediction)
+                # Rolling window : la prédiction remplace la première feature de la dernière ligne, on décale
+                new_row = tf.concat([prediction[tf.newaxis], window[-1, 1:]], axis=0)
+                window = tf.concat([window[1:], new_row[tf.newaxis]], axis=0)
+            return predictions.stack()
+
+        return rolling_forecast
 
     def _create_model(self, input_shape):
-        model = Sequential()
-        model.add(LSTM(self.n_units, input_shape=input_shape, return_sequences=False))
-        model.add(Dropout(self.dropout))
-        model.add(Dense(1))
+        keras = load_keras()
+        model = keras.models.Sequential()
+        model.add(keras.layers.LSTM(self.n_units, input_shape=input_shape, return_sequences=False))
+        model.add(keras.layers.Dropout(self.dropout))
+        model.add(keras.layers.Dense(1))
         model.compile(optimizer='adam', loss='mse')
         return model
 
     def _prepare_sequences(self, X, y):
-        X_seq, y_seq = [], []
-        for i in range(len(X) - self.window_size):
-            X_seq.append(X[i:i+self.window_size])
-            y_seq.append(y[i+self.window_size])
-        return np.array(X_seq), np.array(y_seq)
+        """
+        Fenêtres ``X[i:i+window_size]`` et cibles ``y[i+window_size]``, sans copie
+
+        Les fenêtres sont une vue à pas (strides) sur ``X`` : (séquences,
+        window_size, features) sans dupliquer chaque ligne ``window_size`` fois.
+        Vues en lecture seule, partageant la mémoire de ``X`` et ``y``.
+        """
+        windows = sliding_window_view(X, self.window_size, axis=0)[:-1]
+        return windows.transpose(0, 2, 1), y[self.window_size:]
 
-    def train_and_predict(self, X: np.ndarray, y: np.ndarray, horizon: int = 7, feature_names: Optional[List[str]] = None):
+    def _window_datasets(self, X_scaled, y_scaled, train_starts: np.ndarray, test_starts: np.ndarray,
+                         batch_size: int):
         """
-        Entraîne le modèle LSTM et prédit Rt pour l'horizon demandé.
+        Pipelines ``tf.data`` (entraînement, validation) des fenêtres ``X[i:i+window_size]``
+        (cible ``y[i+window_size]``) commençant aux indices ``train_starts`` / ``test_starts``
+
+        La série n'est convertie qu'une fois en tenseur ; chaque lot rassemble
+        ses fenêtres par indices (``tf.gather``) et le lot suivant est préparé
+        pendant le calcul du précédent (``prefetch``). La mémoire ne dépend
+        ni de la longueur de l'historique multipliée par la fenêtre, ni du
+        nombre d'époques. Les séquences d'entraînement sont mélangées à chaque
+        époque, comme le fait ``fit`` sur des tableaux NumPy. Des séries
+        concaténées (plusieurs pays) n'ont qu'à exclure les fenêtres à cheval.
+        """
+        tf = load_tensorflow()
+        series = tf.constant(X_scaled, dtype=tf.float32)
+        targets = tf.constant(y_scaled, dtype=tf.float32)
+        offsets = tf.range(self.window_size, dtype=tf.int64)
+
+        def gather(starts):
+            return tf.gather(series, starts[:, None] + offsets), tf.gather(targets, starts + self.window_size)
+
+        def pipeline(starts, shuffle):
+            dataset = tf.data.Dataset.from_tensor_slices(np.asarray(starts, dtype=np.int64))
+            if shuffle:
+                dataset = dataset.shuffle(len(starts), reshuffle_each_iteration=True)
+            return dataset.batch(batch_size).map(gather, num_parallel_calls=tf.data.AUTOTUNE) \
+                .prefetch(tf.data.AUTOTUNE)
+
+        return pipeline(train_starts, True), pipeline(test_starts, False)
+
+    def _fit(self, train_data, test_data, epochs: int, progress=None):
+        """``model.fit`` avec early stopping sur la validation (et progression d'un job)"""
+        early_stop = load_keras().callbacks.EarlyStopping(monitor='val_loss', patience=self.patience,
+                                                          restore_best_weights=True)
+        callbacks = [early_stop]
+        if progress is not None:
+            callbacks.append(_job_progress_callback(progress))
+        return self.model.fit(
+            train_data,
+            validation_data=test_data,
+            epochs=epochs,
+            callbacks=callbacks,
+            verbose=0
+        )
+
+    def train(self, X: np.ndarray, y: np.ndarray, feature_names: Optional[List[str]] = None, progress=None,
+              initial_weights: Optional[List[np.ndarray]] = None, epochs: Optional[int] = None):
+        """
+        Entraîne le modèle LSTM (early stopping sur les 20 % les plus récents).
         Args:
             X: Features d'entraînement (2D)
             y: Target (Rt)
-            horizon: Nombre de jours à prédire
             feature_names: Noms des features
+            progress: Progression d'un job (``services.job_manager.JobProgress``), optionnelle
+            initial_weights: Poids de départ (modèle pré-entraîné), sinon initialisation aléatoire
+            epochs: Époques maximales (défaut : ``self.epochs``) ; 0 = aucun entraînement,
+                seulement l'évaluation des poids de départ
         Returns:
-            Prédictions pour les prochains jours (array)
+            self
         """
         if len(X) != len(y):
             raise ValueError("X et y doivent avoir la même longueur")
         if len(X) < self.window_size + 20:
             raise ValueError(f"Au moins {self.window_size + 20} échantillons requis pour l'entraînement")
-        if horizon <= 0:
-            raise ValueError("L'horizon de prédiction doit être positif")
         if feature_names:
             self.feature_names = feature_names
+        epochs = self.epochs if epochs is None else epochs
+        if epochs == 0 and initial_weights is None:
+            raise ValueError("Sans entraînement, des poids de départ sont requis")
 
         # Scaling
         X_scaled = self.scaler_X.fit_transform(X)
         y_scaled = self.scaler_y.fit_transform(y.reshape(-1, 1)).flatten()
 
-        # Séquences pour LSTM
+        # Séquences pour LSTM (vues sans copie) et split train/test (80/20, chronologique)
         X_seq, y_seq = self._prepare_sequences(X_scaled, y_scaled)
-        X_seq = X_seq.astype(np.float32)
-        y_seq = y_seq.astype(np.float32)
-
-        # Split train/test (80/20, pas shuffle)
         split_idx = int(0.8 * len(X_seq))
-        X_train, X_test = X_seq[:split_idx], X_seq[split_idx:]
-        y_train, y_test = y_seq[:split_idx], y_seq[split_idx:]
-
-        # Création du modèle
-        self.model = self._create_model(input_shape=(self.window_size, X.shape[1]))
-
-        # Early stopping
-        early_stop = EarlyStopping(monitor='val_loss', patience=self.patience, restore_best_weights=True)
-
-        # Entraînement
-        history = self.model.fit(
-            X_train, y_train,
-            validation_data=(X_test, y_test),
-            epochs=100,
-            batch_size=16,
-            callbacks=[early_stop],
-            verbose=0
-        )
+        y_test = y_seq[split_idx:]
+        starts = np.arange(len(X_seq))
+        train_data, test_data = self._window_datasets(X_scaled, y_scaled, starts[:split_idx], starts[split_idx:],
+                                                      batch_size=16)
+
+        # Modèle compilé (recyclé si l'instance vient du pool), éventuellement pré-entraîné
+        self.model = self._get_model(input_shape=(self.window_size, X.shape[1]))
+        if initial_weights is not None:
+            self.model.set_weights(initial_weights)
+
+        # Entraînement (ou ajustement fin des poids de départ)
+        epochs_run = len(self._fit(train_data, test_data, epochs, progress).epoch) if epochs > 0 else 0
 
         # Évaluation
-        y_pred_test = self.model.predict(X_test)
+        y_pred_test = self.model.predict(test_data, verbose=0)
         y_pred_test_inv = self.scaler_y.inverse_transform(y_pred_test.reshape(-1, 1)).flatten()
         y_test_inv = self.scaler_y.inverse_transform(y_test.reshape(-1, 1)).flatten()
         self.accuracy_metrics = {
             'mae': float(mean_absolute_error(y_test_inv, y_pred_test_inv)),
             'rmse': float(np.sqrt(mean_squared_error(y_test_inv, y_pred_test_inv))),
             'r2': float(r2_score(y_test_inv, y_pred_test_inv)),
-            'training_samples': int(len(X_train)),
-            'test_samples': int(len(X_test))
+            'training_samples': int(split_idx),
+            'test_samples': int(len(y_test))
         }
+        self.training = {"epochs": epochs_run, "pretrained": initial_weights is not None}
+        self.n_samples = len(X)
+        self.data_fingerprint = fingerprint_arrays(X, y)
+        self.updates_since_refit = 0
+
+        logger.info(f"📊 LSTM Rt - MAE={self.accuracy_metrics['mae']:.4f}, RMSE={self.accuracy_metrics['rmse']:.4f}, R²={self.accuracy_metrics['r2']:.3f} ({epochs_run} époques)")
+
+        self.is_trained = True
+        return self
+
+    def train_global(self, series: List[Tuple[np.ndarray, np.ndarray]], feature_names: Optional[List[str]] = None,
+                     labels: Optional[List[str]] = None, progress=None) -> "PretrainedRtModel":
+        """
+        Entraîne un modèle global sur les séries ``(X, y)`` de plusieurs pays
+
+        Chaque série est standardisée séparément (comme le fera l'ajustement
+        fin sur un pays) puis concaténée ; aucune fenêtre n'est à cheval sur
+        deux pays, et la validation regroupe les 20 % les plus récents de
+        chaque série. Les séries trop courtes sont ignorées.
+        """
+        labels = labels or [str(i) for i in range(len(series))]
+        X_parts, y_parts, train_starts, test_starts, used = [], [], [], [], []
+        offset = 0
+        for label, (X, y) in zip(labels, series):
+            if len(X) < self.window_size + 20:
+                logger.warning(f"⚠️ Série {label} ignorée : {len(X)} échantillons")
+                continue
+            X_parts.append(StandardScaler().fit_transform(X))
+            y_parts.append(StandardScaler().fit_transform(y.reshape(-1, 1)).flatten())
+            n_sequences = len(X) - self.window_size
+            split_idx = int(0.8 * n_sequences)
+            train_starts.append(offset + np.arange(split_idx))
+            test_starts.append(offset + np.arange(split_idx, n_sequences))
+            offset += len(X)
+            used.append(label)
+        if not X_parts:
+            raise ValueError(f"Aucune série d'au moins {self.window_size + 20} échantillons")
+        if feature_names:
+            self.feature_names = feature_names
+
+        X_all = np.concatenate(X_parts)
+        train_starts, test_starts = np.concatenate(train_starts), np.concatenate(test_starts)
+        train_data, test_data = self._window_datasets(X_all, np.concatenate(y_parts), train_starts, test_starts,
+                                                      batch_size=64)
+        self.model = self._get_model(input_shape=(self.window_size, X_all.shape[1]))
+        history = self._fit(train_data, test_data, self.epochs, progress)
+
+        self.accuracy_metrics = {
+            'val_loss': float(min(history.history['val_loss'])),
+            'epochs': len(history.epoch),
+            'training_samples': int(len(train_starts)),
+            'test_samples': int(len(test_starts))
+        }
+        logger.info(f"🌍 LSTM Rt global - {len(used)} séries, perte de validation (standardisée) "
+                    f"{self.accuracy_metrics['val_loss']:.4f}")
+        weights = self.model.get_weights()
+        return PretrainedRtModel(
+            window_size=self.window_size,
+            n_units=self.n_units,
+            input_shape=(self.window_size, X_all.shape[1]),
+            weights=weights,
+            feature_names=list(self.feature_names),
+            series=used,
+            accuracy_metrics=dict(self.accuracy_metrics),
+            version=fingerprint_arrays(*weights)[:16],
+            created_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        )
+
+    def refit_reason(self, X: np.ndarray, y: np.ndarray) -> Optional[str]:
+        """Raison d'un réentraînement complet sur ``(X, y)``, ou None si une mise à jour incrémentale suffit"""
+        if not self.is_trained:
+            return "modèle non entraîné"
+        new_days = len(X) - self.n_samples
+        if new_days <= 0:
+            return "historique plus court que celui appris"
+        if new_days > self.max_new_days:
+            return f"{new_days} nouveaux jours (> {self.max_new_days})"
+        if self.updates_since_refit >= self.max_updates:
+            return f"{self.updates_since_refit} mises à jour depuis le dernier entraînement complet"
+        if fingerprint_arrays(X[:self.n_samples], y[:self.n_samples]) != self.data_fingerprint:
+            return "historique révisé"
+        error = self._new_days_error(X, y)
+        reference = self.accuracy_metrics.get("mae") or 0.0
+        if reference > 0 and error > self.max_error_ratio * reference:
+            return f"dérive : MAE {error:.4f} sur les nouveaux jours (validation {reference:.4f})"
+        return None
+
+    def _new_days_error(self, X: np.ndarray, y: np.ndarray) -> float:
+        """MAE à un jour du modèle actuel sur les jours ajoutés depuis son entraînement"""
+        # Une fenêtre se terminant la veille de chaque nouveau jour
+        X_scaled = self.scaler_X.transform(X[self.n_samples - self.window_size:])
+        windows, _ = self._prepare_sequences(X_scaled, X_scaled[:, 0])
+        predicted = self.model.predict(np.ascontiguousarray(windows, dtype=np.float32), verbose=0)
+        predicted = self.scaler_y.inverse_transform(predicted.reshape(-1, 1)).flatten()
+        return float(mean_absolute_error(y[self.n_samples:], predicted))
+
+    def update(self, X: np.ndarray, y: np.ndarray, progress=None):
+        """
+        Mise à jour incrémentale sur l'historique étendu ``(X, y)`` : quelques
+        époques sur les fenêtres récentes, sans validation ni nouveaux scalers
+        """
+        new_days = len(X) - self.n_samples
+        error = self._new_days_error(X, y)
+        steps = 0
+        if self.incremental_epochs > 0:
+            recent = min(len(X), self.incremental_window + self.window_size)
+            X_scaled = self.scaler_X.transform(X[-recent:])
+            y_scaled = self.scaler_y.transform(y[-recent:].reshape(-1, 1)).flatten()
+            starts = np.arange(recent - self.window_size)
+            train_data, _ = self._window_datasets(X_scaled, y_scaled, starts, starts[:0], batch_size=16)
+            callbacks = [_job_progress_callback(progress)] if progress is not None else []
+            self.model.fit(train_data, epochs=self.incremental_epochs, callbacks=callbacks, verbose=0)
+            steps = self.incremental_epochs * -(-len(starts) // 16)
+
+        self.n_samples = len(X)
+        self.data_fingerprint = fingerprint_arrays(X, y)
+        self.updates_since_refit += 1
+        self.training = {
+            "mode": "incremental",
+            "base_mode": self.training.get("base_mode", self.training.get("mode")),
+            "new_days": int(new_days),
+            "new_days_mae": error,
+            "epochs": self.incremental_epochs,
+            "gradient_steps": int(steps),
+            "updates_since_refit": self.updates_since_refit
+        }
+        logger.info(f"🔄 LSTM Rt mis à jour : {new_days} nouveaux jours (MAE {error:.4f}), {steps} pas de gradient")
+        return self
+
+    def forecast(self, X: np.ndarray, horizon: int) -> np.ndarray:
+        """Prédit Rt sur ``horizon`` jours à partir des ``window_size`` dernières lignes de ``X``"""
+        if not self.is_trained:
+            raise ValueError("Le modèle doit être entraîné ou restauré avant la prédiction")
+        if horizon <= 0:
+            raise ValueError("L'horizon de prédiction doit être positif")
+        # Prédiction future (rolling forecast) : un seul appel au graphe compilé
+        last_seq = np.ascontiguousarray(self.scaler_X.transform(X[-self.window_size:]), dtype=np.float32)
+        preds_scaled = self._rolling_forecast(last_seq, np.int32(horizon)).numpy()
+        return self.scaler_y.inverse_transform(preds_scaled.reshape(-1, 1)).flatten()
 
-        logger.info(f"📊 LSTM Rt - MAE={self.accuracy_metrics['mae']:.4f}, RMSE={self.accuracy_metrics['rmse']:.4f}, R²={self.accuracy_metrics['r2']:.3f}")
-
-        # Prédiction future (rolling forecast)
-        last_seq = X_scaled[-self.window_size:].copy()
-        preds_scaled = []
-        for _ in range(horizon):
-            input_seq = last_seq.reshape(1, self.window_size, X.shape[1])
-            pred_scaled = self.model.predict(input_seq)[0, 0]
-            preds_scaled.append(pred_scaled)
-            # Rolling window : on ajoute la prédiction, on décale
-            new_row = last_seq[-1].copy()
-            new_row[0] = pred_scaled  # On peut raffiner selon la feature cible
-            last_seq = np.vstack([last_seq[1:], new_row])
-        preds = self.scaler_y.inverse_transform(np.array(preds_scaled).reshape(-1, 1)).flatten()
+    def train_and_predict(self, X: np.ndarray, y: np.ndarray, horizon: int = 7, feature_names: Optional[List[str]] = None,
+                          progress=None):
+        """Entraîne le modèle LSTM et prédit Rt pour l'horizon demandé (voir ``train`` et ``forecast``)"""
+        if horizon <= 0:
+            raise ValueError("L'horizon de prédiction doit être positif")
+        return self.train(X, y, feature_names=feature_names, progress=progress).forecast(X, horizon)
+
+    def export(self) -> TrainedRtModel:
+        """Instantané du modèle entraîné (``get_weights`` copie les poids), indépendant de cette instance"""
+        if not self.is_trained:
+            raise ValueError("Le modèle doit être entraîné avant l'export")
+        return TrainedRtModel(
+            window_size=self.window_size,
+            input_shape=tuple(self._model_shape),
+            weights=self.model.get_weights(),
+            scaler_X=self.scaler_X,
+            scaler_y=self.scaler_y,
+            feature_names=list(self.feature_names),
+            accuracy_metrics=dict(self.accuracy_metrics),
+            training=dict(self.training),
+            n_samples=self.n_samples,
+            data_fingerprint=self.data_fingerprint,
+            updates_since_refit=self.updates_since_refit
+        )
+
+    def restore(self, trained: TrainedRtModel):
+        """Charge les poids et scalers de ``trained`` dans le modèle compilé (recyclé ou créé)"""
+        if trained.window_size != self.window_size:
+            raise ValueError(f"Fenêtre incompatible ({trained.window_size} au lieu de {self.window_size})")
+        self._get_model(input_shape=tuple(trained.input_shape)).set_weights(trained.weights)
+        # Copies : un réentraînement de cette instance ne modifie pas l'instantané
+        self.scaler_X = copy.deepcopy(trained.scaler_X)
+        self.scaler_y = copy.deepcopy(trained.scaler_y)
+        self.feature_names = list(trained.feature_names)
+        self.accuracy_metrics = dict(trained.accuracy_metrics)
+        self.training = dict(trained.training)
+        self.n_samples = trained.n_samples
+        self.data_fingerprint = trained.data_fingerprint
+        self.updates_since_refit = trained.updates_since_refit
         self.is_trained = True
-        return preds
+        return self
 
     def get_accuracy(self):
         """Retourne les métriques de précision du modèle"""
@@ -128,11 +649,142 @@ class RtLSTMPredictor:
         """Retourne les informations du modèle"""
         return {
             "model_type": "LSTM",
+            "enabled": lstm_enabled(),
             "window_size": self.window_size,
             "n_units": self.n_units,
             "dropout": self.dropout,
             "patience": self.patience,
+            "epochs": self.epochs,
             "is_trained": self.is_trained,
             "feature_names": self.feature_names,
             "accuracy": self.accuracy_metrics if self.is_trained else None
-        } 
\ No newline at end of file
+        }
+
+
+# Instances (et graphes compilés) recyclées entre entraînements, locales au processus.
+# Une instance écartée libère son modèle ; le dernier modèle disparu vide la session Keras.
+rt_predictor_pool = PredictorPool("rt_lstm", RtLSTMPredictor, on_empty=clear_keras_session)
+
+
+_pretrained: Optional[Tuple[str, float, PretrainedRtModel]] = None
+_pretrained_lock = threading.Lock()
+
+
+def pretrained_model_path() -> str:
+    return os.getenv("RT_PRETRAINED_MODEL", DEFAULT_PRETRAINED_PATH)
+
+
+def fine_tune_epochs() -> int:
+    """Époques maximales de l'ajustement fin d'un modèle pré-entraîné (``RT_FINE_TUNE_EPOCHS``)"""
+    return int(os.getenv("RT_FINE_TUNE_EPOCHS", 10))
+
+
+def load_pretrained() -> Optional[PretrainedRtModel]:
+    """
+    Modèle global de ``RT_PRETRAINED_MODEL`` (None s'il n'existe pas ou est
+    illisible), gardé en mémoire et relu quand le fichier change
+    """
+    global _pretrained
+    path = pretrained_model_path()
+    try:
+        modified = os.stat(path).st_mtime
+    except OSError:
+        return None
+    with _pretrained_lock:
+        if _pretrained is None or _pretrained[:2] != (path, modified):
+            try:
+                _pretrained = (path, modified, joblib.load(path))
+            except Exception as e:
+                logger.warning(f"⚠️ Modèle Rt pré-entraîné illisible ({path}): {e}")
+                return None
+            logger.info(f"🌍 Modèle Rt pré-entraîné {_pretrained[2].version} chargé")
+        return _pretrained[2]
+
+
+def save_pretrained(pretrained: PretrainedRtModel, path: Optional[str] = None) -> str:
+    """Écrit le modèle global (écriture atomique : les workers ne lisent jamais un fichier partiel)"""
+    path = path or pretrained_model_path()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(pretrained, tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def fit_model(X: np.ndarray, y: np.ndarray, feature_names: Optional[List[str]] = None,
+              progress=None, mode: str = "full") -> TrainedRtModel:
+    """
+    Entraîne un prédicteur emprunté au pool et retourne son instantané
+
+    ``mode`` (``LSTM_MODES``) : ``fine_tune`` et ``fast`` partent des poids du
+    modèle pré-entraîné, ajustés ``fine_tune_epochs()`` époques au plus ou
+    pas du tout. Tâche de l'exécuteur ML : le prédicteur retourne au pool à
+    la fin, seuls ses poids (copiés) quittent la tâche.
+    """
+    if mode not in LSTM_MODES:
+        raise ValueError(f"Mode d'entraînement inconnu: {mode} (attendu: {', '.join(LSTM_MODES)})")
+    initial_weights, epochs = None, None
+    if mode != "full":
+        pretrained = load_pretrained()
+        if pretrained is None:
+            raise ValueError(f"Mode {mode} : aucun modèle Rt pré-entraîné ({pretrained_model_path()})")
+        initial_weights = pretrained.weights
+        epochs = 0 if mode == "fast" else fine_tune_epochs()
+    with rt_predictor_pool.lease() as predictor:
+        predictor.train(X=X, y=y, feature_names=feature_names, progress=progress,
+                        initial_weights=initial_weights, epochs=epochs)
+        predictor.training["mode"] = mode
+        return predictor.export()
+
+
+def refresh_model(previous: TrainedRtModel, X: np.ndarray, y: np.ndarray, feature_names: Optional[List[str]] = None,
+                  progress=None, mode: str = "full") -> TrainedRtModel:
+    """
+    Nouveau modèle pour l'historique étendu ``(X, y)`` : mise à jour
+    incrémentale de ``previous`` si la politique le permet, sinon
+    réentraînement complet (``fit_model`` dans ``mode``). ``previous``
+    (partagé via le registre) n'est pas modifié.
+    """
+    with rt_predictor_pool.lease() as predictor:
+        predictor.restore(previous)
+        reason = predictor.refit_reason(X, y)
+        if reason is None:
+            return predictor.update(X, y, progress=progress).export()
+    logger.info(f"🔁 Réentraînement complet du LSTM Rt : {reason}")
+    trained = fit_model(X, y, feature_names, progress, mode)
+    trained.training["reason"] = reason
+    return trained
+
+
+def forecast_model(trained: TrainedRtModel, X: np.ndarray, horizon: int) -> np.ndarray:
+    """Prévision à ``horizon`` jours d'un modèle entraîné, rechargé dans un prédicteur du pool"""
+    with rt_predictor_pool.lease() as predictor:
+        return predictor.restore(trained).forecast(X, horizon)
+
+
+def _resident_bytes() -> Optional[int]:
+    """Mémoire résidente du processus (Linux), sinon pic de mémoire résidente"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss : kilo-octets sous Linux, octets sous macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def lstm_memory_report() -> Dict[str, Any]:
+    """
+    Mémoire des modèles LSTM de ce processus (worker) : modèles compilés au
+    repos dans le pool, poids qu'ils portent, mémoire résidente totale
+    """
+    idle = rt_predictor_pool.idle()
+    return {
+        "pid": os.getpid(),
+        "rss_bytes": _resident_bytes(),
+        "tensorflow_loaded": _tensorflow is not None,
+        "pool": rt_predictor_pool.get_stats(),
+        "idle_models": sum(predictor.model is not None for predictor in idle),
+        "idle_weights_bytes": sum(predictor.weights_nbytes() for predictor in idle)
+    }
@@ -2,15 +2,20 @@
 Routes pour les prédictions de mortalité
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional, Dict, Any, List
 import pandas as pd
 import numpy as np
 import logging
 from datetime import datetime, timedelta
+from functools import partial
 
-from services.express_client import ExpressAPIClient
+from services.data_source import get_data_source, DataNotFoundError
+from services.resilience import CircuitOpenError
+from services.ml_executor import ExecutorSaturatedError, get_ml_executor
+from services.job_manager import JobLimitError, get_job_manager, report_progress
 from models.mortality_model import MortalityPredictor
+from models.model_registry import ModelRegistry, fingerprint_arrays
 
 # Configuration du logger
 logger = logging.getLogger(__name__)
@@ -18,18 +23,29 @@ logger = logging.getLogger(__name__)
 # Création du router
 router = APIRouter()
 
-# Initialisation du client Express API
-express_client = ExpressAPIClient()
+# Source de données (API Express.js par défaut, voir AI_DATA_BACKEND)
+data_source = get_data_source()
 
-# Initialisation du modèle de prédiction
-mortality_predictor = MortalityPredictor()
+# Entraînement et inférence hors de la boucle d'événements
+ml_executor = get_ml_executor()
+
+# Jobs de prédiction en arrière-plan (POST /jobs)
+job_manager = get_job_manager()
+
+# Registre des modèles entraînés : un modèle par (pays, source, features, données).
+# Les clés incluent l'empreinte des données : une nouvelle version des données
+# produit de nouvelles clés, et le dernier modèle de chaque lignée reste la base
+# de sa mise à jour incrémentale (il n'est donc pas vidé au rechargement ETL).
+mortality_registry = ModelRegistry("mortality")
 
 @router.get("/predict")
 async def predict_mortality(
     pays: str = Query(..., description="Nom du pays ou code ISO"),
     source: str = Query(..., description="Source des données (covid, mpox)"),
     horizon: int = Query(7, description="Horizon de prédiction en jours (défaut: 7)"),
-    reference_date: Optional[str] = Query(None, description="Date de référence pour les prédictions (YYYY-MM-DD). Défaut = aujourd'hui")
+    reference_date: Optional[str] = Query(None, description="Date de référence pour les prédictions (YYYY-MM-DD). Défaut = aujourd'hui"),
+    strategy: Optional[str] = Query(None, description="Stratégie de prévision : recursive (jour après jour) ou direct (multi-sorties). Défaut = ML_MORTALITY_STRATEGY"),
+    backend: Optional[str] = Query(None, description="Modèle : random_forest ou hist_gradient_boosting (plus rapide à entraîner). Défaut = ML_MORTALITY_BACKEND")
 ) -> Dict[str, Any]:
     """
     Prédit le taux de mortalité pour les prochains jours à partir de la date de référence (ou aujourd'hui).
@@ -37,6 +53,15 @@ async def predict_mortality(
     """
     if not source:
         raise HTTPException(status_code=400, detail="Le paramètre 'source' (ex: covid, mpox) est obligatoire.")
+    try:
+        model_template = MortalityPredictor(strategy=strategy, backend=backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if model_template.strategy == "direct" and horizon > model_template.max_horizon:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Horizon maximal du mode direct : {model_template.max_horizon} jours"
+        )
     # Détermination de la date de référence
     if reference_date:
         try:
@@ -52,10 +77,12 @@ async def predict_mortality(
     try:
         logger.info(f"🔮 Prédiction de mortalité pour {pays} (source: {source}, horizon: {horizon}j)")
         
-        # 1. Récupération des données depuis l'API Express.js
-        logger.info("📊 Récupération des données depuis l'API Express.js...")
+        # 1. Récupération des données (API Express.js ou source configurée)
+        report_progress(stage="data")
+        logger.info(f"📊 Récupération des données ({data_source.name})...")
         
-        mortality_data = await express_client.get_mortality_rate(
+        # Décodage incrémental en colonnes (DataFrame partagé via le cache : ne pas le modifier)
+        mortality_frame = await data_source.get_mortality_rate_frame(
             pays=pays,
             source=source,
             date_debut=date_debut,
@@ -63,7 +90,7 @@ async def predict_mortality(
             window=7
         )
         
-        if not mortality_data.get("data") or len(mortality_data["data"]) < 30:
+        if len(mortality_frame) < 30:
             raise HTTPException(
                 status_code=400,
                 detail=f"Données insuffisantes pour {pays}. Minimum 30 jours requis."
@@ -72,10 +99,11 @@ async def predict_mortality(
         # 2. Préparation des données
         logger.info("🔧 Préparation des données...")
         
-        df = pd.DataFrame(mortality_data["data"])
-        df['date'] = pd.to_datetime(df['date'])
-        # S'assurer que toutes les dates sont timezone-naive
-        df['date'] = df['date'].dt.tz_localize(None)
+        df = pd.DataFrame({
+            # S'assurer que toutes les dates sont timezone-naive
+            'date': pd.to_datetime(mortality_frame['date']).dt.tz_localize(None),
+            'mortality_rate': mortality_frame['mortality_rate']
+        })
         df = df.sort_values('date').reset_index(drop=True)
         
         # Suppression des valeurs nulles
@@ -124,15 +152,36 @@ async def predict_mortality(
         X = df[feature_columns].values
         y = df['mortality_rate'].values
         
-        # 5. Entraînement du modèle
-        logger.info("🤖 Entraînement du modèle Random Forest...")
-        
-        predictions = mortality_predictor.train_and_predict(
-            X=X,
-            y=y,
-            horizon=horizon,
-            feature_names=feature_columns
+        # 5. Modèle : rechargé depuis le registre si les mêmes données ont déjà servi,
+        # sinon mise à jour incrémentale du dernier modèle de la lignée (ou entraînement complet)
+        report_progress(stage="training", training_samples=len(X))
+        model_context = dict(
+            pays=pays,
+            source=source,
+            features=feature_columns,
+            backend=model_template.backend,
+            params=model_template.model_params,
+            format=MortalityPredictor.FORMAT_VERSION,
+            strategy=model_template.strategy,
+            interval=[model_template.interval_method, model_template.interval_level],
+            max_horizon=model_template.max_horizon
+        )
+        model_lineage = ModelRegistry.make_key(**model_context)
+        model_key = ModelRegistry.make_key(**model_context, data=fingerprint_arrays(X, y))
+        previous_model = await mortality_registry.get_latest(model_lineage)
+        if previous_model is not None:
+            train = partial(previous_model.refresh, X, y, feature_columns)
+        else:
+            train = partial(model_template.fit, X, y, feature_columns)
+        mortality_predictor, model_cached = await mortality_registry.get_or_train(
+            model_key, train, lineage=model_lineage
         )
+        training_mode = "cached" if model_cached else mortality_predictor.training.get("mode")
+        logger.info(f"🤖 Modèle {MortalityPredictor.MODEL_TYPES[model_template.backend]} : {training_mode}")
+        
+        report_progress(stage="forecast", model_cached=model_cached)
+        # Prévision et intervalle de prédiction (dispersion des arbres, sans réentraînement)
+        forecast = await ml_executor.run(mortality_predictor.forecast, X, horizon)
         
         # 6. Détection de l'extrapolation
         last_data_date = df['date'].iloc[-1]
@@ -165,21 +214,32 @@ async def predict_mortality(
                 "date": date,
                 "predicted_mortality_rate": float(pred),
                 "confidence_interval": {
-                    "lower": float(max(0, pred - 0.001)),  # Pas de taux négatif
-                    "upper": float(pred + 0.001)
+                    "lower": float(max(0, lower)),  # Pas de taux négatif
+                    "upper": float(upper)
                 }
             }
-            for date, pred in zip(prediction_dates, predictions)
+            for date, pred, lower, upper in zip(prediction_dates, forecast.mean, forecast.lower, forecast.upper)
         ]
         
         # 9. Métadonnées du modèle
         model_metadata = {
-            "model_type": "Random Forest",
+            "model_type": MortalityPredictor.MODEL_TYPES[mortality_predictor.backend],
+            "backend": mortality_predictor.backend,
+            "strategy": mortality_predictor.strategy,
+            "prediction_interval": {
+                "method": forecast.method,
+                "level": forecast.level
+            },
             "features_used": feature_columns,
             "training_samples": len(X),
             "last_training_date": last_data_date.strftime('%Y-%m-%d'),
             "prediction_horizon": horizon,
             "model_accuracy": mortality_predictor.get_accuracy(),
+            "model_cache": {
+                "hit": model_cached,
+                "key": model_key[:16]
+            },
+            "training": mortality_predictor.training,
             "reference_date": reference_date_obj.strftime('%Y-%m-%d'),
             "reference_source": "user_specified",
             "data_quality": {
@@ -209,6 +269,10 @@ async def predict_mortality(
         
     except HTTPException:
         raise
+    except (CircuitOpenError, ExecutorSaturatedError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except DataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Erreur lors de la prédiction de mortalité: {e}")
         raise HTTPException(
@@ -216,12 +280,61 @@ async def predict_mortality(
             detail=f"Erreur lors de la prédiction: {str(e)}"
         )
 
+@router.post("/jobs", status_code=202)
+async def create_mortality_job(
+    request: Request,
+    pays: str = Query(..., description="Nom du pays ou code ISO"),
+    source: str = Query(..., description="Source des données (covid, mpox)"),
+    horizon: int = Query(7, description="Horizon de prédiction en jours (défaut: 7)"),
+    reference_date: Optional[str] = Query(None, description="Date de référence pour les prédictions (YYYY-MM-DD). Défaut = aujourd'hui"),
+    strategy: Optional[str] = Query(None, description="Stratégie de prévision : recursive (jour après jour) ou direct (multi-sorties). Défaut = ML_MORTALITY_STRATEGY"),
+    backend: Optional[str] = Query(None, description="Modèle : random_forest ou hist_gradient_boosting (plus rapide à entraîner). Défaut = ML_MORTALITY_BACKEND")
+) -> Dict[str, Any]:
+    """
+    Lance la prédiction de mortalité en arrière-plan et retourne immédiatement l'identifiant du job.
+    Suivre l'état, la progression puis le résultat avec GET /jobs/{job_id}.
+    """
+    if not source:
+        raise HTTPException(status_code=400, detail="Le paramètre 'source' (ex: covid, mpox) est obligatoire.")
+    params = {"pays": pays, "source": source, "horizon": horizon, "reference_date": reference_date,
+              "strategy": strategy, "backend": backend}
+    try:
+        job = job_manager.submit("mortality", params, lambda: predict_mortality(**params))
+    except JobLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": str(request.url_for("get_mortality_job", job_id=job.id))
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_mortality_job(job_id: str) -> Dict[str, Any]:
+    """État, progression et (une fois terminé) résultat d'un job de prédiction de mortalité"""
+    job = job_manager.get(job_id, kind="mortality")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} introuvable ou expiré")
+    return job.to_dict()
+
+@router.delete("/jobs/{job_id}")
+async def cancel_mortality_job(job_id: str) -> Dict[str, Any]:
+    """Annule un job de prédiction de mortalité (sans effet s'il est déjà terminé)"""
+    job = job_manager.cancel(job_id, kind="mortality")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} introuvable ou expiré")
+    return job.to_dict(include_result=False)
+
 @router.get("/model-info")
 async def get_mortality_model_info() -> Dict[str, Any]:
     """Retourne les informations sur le modèle de mortalité"""
     
+    # Modèle configuré (ML_MORTALITY_BACKEND, ML_MORTALITY_STRATEGY, ML_INTERVAL_*)
+    configured = MortalityPredictor().get_model_info()
     return {
-        "model_type": "Random Forest",
+        "model_type": configured["model_type"],
+        "backend": configured["backend"],
+        "strategy": configured["strategy"],
+        "interval": configured["interval"],
         "description": "Modèle de prédiction du taux de mortalité basé sur les données historiques",
         "features": [
             "day_of_week",
@@ -233,10 +346,14 @@ async def get_mortality_model_info() -> Dict[str, Any]:
             "mortality_rate_ma14",
             "mortality_rate_std7"
         ],
-        "parameters": {
-            "n_estimators": 100,
-            "max_depth": 10,
-            "random_state": 42
+        "parameters": configured["parameters"],
+        "backends": {
+            "random_forest": "Random Forest, 100 arbres de profondeur 10 (défaut)",
+            "hist_gradient_boosting": "Gradient boosting sur histogrammes : entraînement plus rapide, modèle plus léger"
+        },
+        "strategies": {
+            "recursive": "Un jour à la fois, la prédiction est réinjectée dans les features (défaut)",
+            "direct": "Modèle multi-sorties : tout l'horizon en un seul appel, sans erreur réinjectée"
         },
         "min_data_required": 30,
         "prediction_horizon_max": 30,
@@ -259,12 +376,12 @@ async def check_data_quality(
     
     try:
         # Récupération des données
-        mortality_data = await express_client.get_mortality_rate(
+        mortality_frame = await data_source.get_mortality_rate_frame(
             pays=pays,
             source=source
         )
         
-        if not mortality_data.get("data"):
+        if mortality_frame.empty:
             return {
                 "pays": pays,
                 "source": source,
@@ -273,8 +390,10 @@ async def check_data_quality(
                 "data_points": 0
             }
         
-        df = pd.DataFrame(mortality_data["data"])
-        df['date'] = pd.to_datetime(df['date'])
+        df = pd.DataFrame({
+            'date': pd.to_datetime(mortality_frame['date']),
+            'mortality_rate': mortality_frame['mortality_rate']
+        })
         df = df.sort_values('date').reset_index(drop=True)
         
         # Analyse de la qualité
@@ -352,7 +471,9 @@ async def test_date_configurations(
                     pays=pays,
                     source=source,
                     horizon=horizon,
-                    reference_date=config["params"]["reference_date"]
+                    reference_date=config["params"]["reference_date"],
+                    strategy=None,
+                    backend=None
                 )
                 results[config["name"]] = {
                     "status": "success",
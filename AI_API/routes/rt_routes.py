@@ -2,21 +2,80 @@
 Routes pour les prédictions Rt (nombre de reproduction)
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Optional, Dict, Any, List
+import asyncio
+import os
+import time
 import pandas as pd
 import numpy as np
 import logging
+import sys
 from datetime import datetime, timedelta
+from functools import partial
 
-from services.express_client import ExpressAPIClient
-from models.rt_model import RtLSTMPredictor
+from services.data_source import get_data_source, DataNotFoundError
+from services.resilience import CircuitOpenError
+from services.ml_executor import ExecutorSaturatedError, MLExecutor, get_ml_executor
+from services.job_manager import JobLimitError, current_progress, get_job_manager, report_progress
+from models.model_registry import ModelRegistry, fingerprint_arrays
+from models.rt_model import (LSTM_MODES, RT_FEATURE_COLUMNS, LSTMDisabledError, RtLSTMPredictor, add_rt_features,
+                             clean_rt_frame, fine_tune_epochs, fit_model, forecast_model, load_pretrained, lstm_enabled,
+                             lstm_memory_report, refresh_model, rt_predictor_pool)
+from models.rt_cori import CoriRtEstimator, clean_incidence
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-express_client = ExpressAPIClient()
-rt_predictor = RtLSTMPredictor()
+data_source = get_data_source()
+ml_executor = get_ml_executor()
+# Jobs de prédiction en arrière-plan (POST /jobs)
+job_manager = get_job_manager()
+# LSTM entraînés (poids + scalers) : LRU en mémoire borné en octets, puis fichiers joblib
+rt_model_registry = ModelRegistry(
+    "rt_lstm", memory_bytes=int(os.getenv("RT_MODEL_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+)
+
+# Moteurs Rt : LSTM entraîné par requête, ou estimateur de Cori (sans entraînement)
+RT_ENGINES = ("lstm", "cori")
+
+
+def _resolve_engine(engine: Optional[str]) -> str:
+    engine = (engine or os.getenv("RT_ENGINE", "lstm")).lower()
+    if engine not in RT_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Moteur Rt inconnu: {engine} (attendu: {', '.join(RT_ENGINES)})")
+    if engine == "lstm" and not lstm_enabled():
+        raise HTTPException(status_code=503, detail="Prédiction Rt LSTM désactivée sur ce worker (RT_LSTM_ENABLED=false)")
+    return engine
+
+
+def _resolve_lstm_mode(mode: Optional[str]) -> str:
+    mode = (mode or os.getenv("RT_LSTM_MODE", "fine_tune")).lower()
+    if mode not in LSTM_MODES:
+        raise HTTPException(status_code=400, detail=f"Mode LSTM inconnu: {mode} (attendu: {', '.join(LSTM_MODES)})")
+    return mode
+
+
+def _daily_incidence(frame: pd.DataFrame) -> pd.Series:
+    """Incidence journalière indexée par date, jours manquants compris (comptés 0)"""
+    dates = pd.to_datetime(frame['date']).dt.tz_localize(None).dt.normalize()
+    daily = pd.Series(frame['value'].to_numpy(), index=dates.to_numpy()).groupby(level=0).sum(min_count=1).asfreq('D')
+    return pd.Series(clean_incidence(daily.to_numpy()), index=daily.index)
+
+
+def _extrapolation_warning(reference_date_obj: datetime, last_data_date: datetime) -> Optional[Dict[str, Any]]:
+    """Avertissement si la date de référence est postérieure à la dernière donnée"""
+    if reference_date_obj <= last_data_date:
+        return None
+    extrapolation_days = (reference_date_obj - last_data_date).days
+    logger.warning(f"⚠️ Extrapolation détectée: {extrapolation_days} jours au-delà des données")
+    return {
+        "warning": True,
+        "message": f"La date de prédiction demandée ({reference_date_obj.strftime('%Y-%m-%d')}) est postérieure à la dernière donnée disponible ({last_data_date.strftime('%Y-%m-%d')}). La prédiction est une extrapolation et peut être peu fiable.",
+        "last_data_date": last_data_date.strftime('%Y-%m-%d'),
+        "extrapolation_days": extrapolation_days,
+        "confidence_level": "low" if extrapolation_days > 30 else "medium"
+    }
 
 @router.get("/predict")
 async def predict_rt(
@@ -24,7 +83,9 @@ async def predict_rt(
     indicator: str = Query(..., description="Indicateur (cases, deaths)"),
     source: str = Query(..., description="Source des données (covid, mpox)"),
     horizon: int = Query(7, description="Horizon de prédiction en jours (défaut: 7)"),
-    reference_date: Optional[str] = Query(None, description="Date de référence pour les prédictions (YYYY-MM-DD). Défaut = aujourd'hui")
+    reference_date: Optional[str] = Query(None, description="Date de référence pour les prédictions (YYYY-MM-DD). Défaut = aujourd'hui"),
+    engine: Optional[str] = Query(None, description="Moteur Rt : lstm (réseau entraîné) ou cori (équation de renouvellement, quelques ms). Défaut = RT_ENGINE"),
+    mode: Optional[str] = Query(None, description="Entraînement LSTM : full (complet), fine_tune (ajustement du modèle pré-entraîné) ou fast (modèle pré-entraîné seul). Défaut = RT_LSTM_MODE")
 ) -> Dict[str, Any]:
     """
     Prédit le taux de transmission (Rt) pour les prochains jours à partir de la date de référence (ou aujourd'hui).
@@ -34,6 +95,9 @@ async def predict_rt(
         raise HTTPException(status_code=400, detail="Le paramètre 'source' (ex: covid, mpox) est obligatoire.")
     if not indicator:
         raise HTTPException(status_code=400, detail="Le paramètre 'indicator' (cases, deaths) est obligatoire.")
+    engine = _resolve_engine(engine)
+    # Le mode ne concerne que le LSTM : ignoré (et non validé) pour Cori
+    mode = _resolve_lstm_mode(mode) if engine == "lstm" else None
     # Détermination de la date de référence
     if reference_date:
         try:
@@ -45,9 +109,13 @@ async def predict_rt(
     date_debut = '2020-01-01'
     date_fin = reference_date_obj.strftime('%Y-%m-%d')
     try:
-        logger.info(f"🔮 Prédiction Rt pour {pays} (source: {source}, indicator: {indicator}, horizon: {horizon}j)")
+        logger.info(f"🔮 Prédiction Rt ({engine}) pour {pays} (source: {source}, indicator: {indicator}, horizon: {horizon}j)")
+        if engine == "cori":
+            return await _predict_rt_cori(pays, indicator, source, horizon, reference_date_obj, date_debut, date_fin)
         # 1. Récupération des données
-        rt_data = await express_client.get_rt_data(
+        report_progress(stage="data")
+        # Décodage incrémental en colonnes (DataFrame partagé via le cache : ne pas le modifier)
+        rt_frame = await data_source.get_rt_frame(
             pays=pays,
             indicator=indicator,
             source=source,
@@ -55,67 +123,74 @@ async def predict_rt(
             date_fin=date_fin,
             window=7
         )
-        if not rt_data.get("data") or len(rt_data["data"]) < 30:
+        if len(rt_frame) < 30:
             raise HTTPException(
                 status_code=400,
                 detail=f"Données Rt insuffisantes pour {pays}. Minimum 30 jours requis."
             )
         # 2. Préparation des données
-        df = pd.DataFrame(rt_data["data"])
-        df['date'] = pd.to_datetime(df['date'])
-        df['date'] = df['date'].dt.tz_localize(None)
-        df = df.sort_values('date').reset_index(drop=True)
-        df = df.dropna(subset=['Rt'])
+        df = clean_rt_frame(rt_frame)
         if len(df) < 30:
             raise HTTPException(
                 status_code=400,
                 detail=f"Données Rt insuffisantes après nettoyage pour {pays}"
             )
-        # 3. Création des features temporelles
-        df['day_of_week'] = df['date'].dt.dayofweek
-        df['month'] = df['date'].dt.month
-        df['day_of_year'] = df['date'].dt.dayofyear
-        # Lags et moyennes mobiles
-        df['rt_lag1'] = df['Rt'].shift(1)
-        df['rt_lag7'] = df['Rt'].shift(7)
-        df['rt_ma7'] = df['Rt'].rolling(window=7).mean()
-        df['rt_ma14'] = df['Rt'].rolling(window=14).mean()
-        df['rt_std7'] = df['Rt'].rolling(window=7).std()
-        df = df.dropna()
+        # 3. Création des features temporelles (lags et moyennes mobiles)
+        df = add_rt_features(df)
         if len(df) < 20:
             raise HTTPException(
                 status_code=400,
                 detail=f"Données Rt insuffisantes après création des features pour {pays}"
             )
-        feature_columns = [
-            'day_of_week', 'month', 'day_of_year',
-            'rt_lag1', 'rt_lag7', 'rt_ma7', 'rt_ma14', 'rt_std7'
-        ]
+        feature_columns = RT_FEATURE_COLUMNS
         X = df[feature_columns].values
         y = df['Rt'].values
-        # 4. Entraînement du modèle LSTM
-        predictions = rt_predictor.train_and_predict(
-            X=X,
-            y=y,
-            horizon=horizon,
-            feature_names=feature_columns
+        # 4. Modèle LSTM : rechargé depuis le registre si les mêmes données ont déjà servi,
+        # sinon mise à jour incrémentale du dernier modèle de la lignée (ou entraînement complet),
+        # dans l'exécuteur ML avec une instance empruntée au pool
+        # Progression époque par époque si la prédiction s'exécute dans un job (exécuteur thread uniquement)
+        report_progress(stage="training", training_samples=len(X))
+        progress = current_progress() if ml_executor.kind == MLExecutor.THREAD else None
+        # Entraînement mis en commun par le registre : l'annulation du job ne doit pas le faire échouer
+        # pour les autres requêtes qui l'attendent (le job s'arrête, l'entraînement va à son terme)
+        progress = progress.report_only() if progress is not None else None
+        template = RtLSTMPredictor()
+        # Ajustement fin / mode rapide : à partir du modèle global pré-entraîné, s'il est compatible
+        # Lecture disque (et désérialisation) hors de la boucle d'événements
+        pretrained = None
+        if mode != "full":
+            pretrained = await asyncio.get_running_loop().run_in_executor(None, load_pretrained)
+        if mode != "full" and (pretrained is None or not pretrained.matches(template, feature_columns)):
+            logger.info(f"ℹ️ Aucun modèle Rt pré-entraîné compatible : entraînement complet au lieu de {mode}")
+            mode, pretrained = "full", None
+        model_context = dict(
+            pays=pays,
+            indicator=indicator,
+            source=source,
+            features=feature_columns,
+            params=[template.window_size, template.n_units, template.dropout, template.patience, template.epochs],
+            format=RtLSTMPredictor.FORMAT_VERSION,
+            mode=mode,
+            pretrained=pretrained.version if pretrained is not None else None,
+            fine_tune_epochs=fine_tune_epochs() if mode == "fine_tune" else None
         )
+        model_lineage = ModelRegistry.make_key(**model_context)
+        model_key = ModelRegistry.make_key(**model_context, data=fingerprint_arrays(X, y))
+        previous_model = await rt_model_registry.get_latest(model_lineage)
+        if previous_model is not None:
+            train = partial(refresh_model, previous_model, X, y, feature_columns, progress, mode)
+        else:
+            train = partial(fit_model, X, y, feature_columns, progress, mode)
+        trained_model, model_cached = await rt_model_registry.get_or_train(model_key, train, lineage=model_lineage)
+        logger.info(f"🤖 LSTM Rt : {'cached' if model_cached else trained_model.training.get('mode')}")
+        accuracy = trained_model.accuracy_metrics
+        report_progress(stage="forecast", model_cached=model_cached)
+        predictions = await ml_executor.run(forecast_model, trained_model, X, horizon)
         # 5. Détection de l'extrapolation
         last_data_date = df['date'].iloc[-1]
         if last_data_date.tzinfo is not None:
             last_data_date = last_data_date.replace(tzinfo=None)
-        is_extrapolation = reference_date_obj > last_data_date
-        extrapolation_warning = None
-        if is_extrapolation:
-            extrapolation_days = (reference_date_obj - last_data_date).days
-            extrapolation_warning = {
-                "warning": True,
-                "message": f"La date de prédiction demandée ({reference_date_obj.strftime('%Y-%m-%d')}) est postérieure à la dernière donnée disponible ({last_data_date.strftime('%Y-%m-%d')}). La prédiction est une extrapolation et peut être peu fiable.",
-                "last_data_date": last_data_date.strftime('%Y-%m-%d'),
-                "extrapolation_days": extrapolation_days,
-                "confidence_level": "low" if extrapolation_days > 30 else "medium"
-            }
-            logger.warning(f"⚠️ Extrapolation détectée: {extrapolation_days} jours au-delà des données")
+        extrapolation_warning = _extrapolation_warning(reference_date_obj, last_data_date)
         # 6. Préparation des dates de prédiction
         prediction_dates = [
             (reference_date_obj + timedelta(days=i+1)).strftime('%Y-%m-%d')
@@ -136,11 +211,15 @@ async def predict_rt(
         # 8. Métadonnées du modèle
         model_metadata = {
             "model_type": "LSTM",
+            "engine": "lstm",
             "features_used": feature_columns,
             "training_samples": len(X),
             "last_training_date": last_data_date.strftime('%Y-%m-%d'),
             "prediction_horizon": horizon,
-            "model_accuracy": rt_predictor.get_accuracy(),
+            "model_accuracy": accuracy,
+            "model_cached": model_cached,
+            "training": trained_model.training,
+            "pretrained_version": pretrained.version if pretrained is not None else None,
             "reference_date": reference_date_obj.strftime('%Y-%m-%d'),
             "reference_source": "user_specified",
             "data_quality": {
@@ -165,6 +244,11 @@ async def predict_rt(
         return response
     except HTTPException:
         raise
+    except (CircuitOpenError, ExecutorSaturatedError, LSTMDisabledError) as e:
+        # LSTMDisabledError : TensorFlow absent de ce worker (paquet optionnel)
+        raise HTTPException(status_code=503, detail=str(e))
+    except DataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"❌ Erreur lors de la prédiction Rt: {e}")
         raise HTTPException(
@@ -172,10 +256,257 @@ async def predict_rt(
             detail=f"Erreur lors de la prédiction Rt: {str(e)}"
         )
 
+async def _predict_rt_cori(pays: str, indicator: str, source: str, horizon: int, reference_date_obj: datetime,
+                           date_debut: str, date_fin: str) -> Dict[str, Any]:
+    """Prédiction Rt par l'estimateur de Cori : même format de réponse que le LSTM, plus l'historique estimé"""
+    estimator = CoriRtEstimator()
+    frame = await data_source.get_daily_series_frame(
+        pays=pays, indicator=indicator, source=source, date_debut=date_debut, date_fin=date_fin
+    )
+    incidence = _daily_incidence(frame)
+    if len(incidence) < estimator.min_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Données d'incidence insuffisantes pour {pays}. Minimum {estimator.min_days} jours requis."
+        )
+    # Calcul vectorisé de quelques millisecondes : exécuté directement, sans passer par l'exécuteur ML
+    report_progress(stage="estimation", training_samples=len(incidence))
+    started = time.perf_counter()
+    estimate, projection = estimator.forecast(incidence.to_numpy(), horizon)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if np.isnan(estimate.mean[-1]):
+        raise HTTPException(status_code=400,
+                            detail=f"Incidence nulle sur les dernières semaines pour {pays} : Rt non estimable")
+
+    last_data_date = incidence.index[-1].to_pydatetime()
+    extrapolation_warning = _extrapolation_warning(reference_date_obj, last_data_date)
+    prediction_dates = [(reference_date_obj + timedelta(days=i + 1)).strftime('%Y-%m-%d') for i in range(horizon)]
+    prediction_data = [
+        {
+            "date": date,
+            "predicted_rt": float(projection.rt_mean[i]),
+            "confidence_interval": {
+                "lower": float(projection.rt_lower[i]),
+                "upper": float(projection.rt_upper[i])
+            },
+            "projected_incidence": {
+                "mean": float(projection.incidence_mean[i]),
+                "lower": float(projection.incidence_lower[i]),
+                "upper": float(projection.incidence_upper[i])
+            }
+        }
+        for i, date in enumerate(prediction_dates)
+    ]
+    history_days = min(30, len(incidence))
+    rt_history = [
+        {"date": date.strftime('%Y-%m-%d'), "rt": float(mean), "lower": float(lower), "upper": float(upper)}
+        for date, mean, lower, upper in zip(incidence.index[-history_days:], estimate.mean[-history_days:],
+                                            estimate.lower[-history_days:], estimate.upper[-history_days:])
+        if not np.isnan(mean)
+    ]
+    response = {
+        "predictions": prediction_data,
+        "rt_history": rt_history,
+        "metadata": {
+            "pays": pays,
+            "source": source,
+            "indicator": indicator,
+            "request_date": datetime.now().replace(tzinfo=None).isoformat(),
+            "model": {
+                **estimator.get_model_info(),
+                "engine": "cori",
+                "training_samples": len(incidence),
+                "last_training_date": last_data_date.strftime('%Y-%m-%d'),
+                "prediction_horizon": horizon,
+                "computation_ms": round(elapsed_ms, 3),
+                "reference_date": reference_date_obj.strftime('%Y-%m-%d'),
+                "reference_source": "user_specified"
+            }
+        }
+    }
+    if extrapolation_warning:
+        response["extrapolation_warning"] = extrapolation_warning
+    logger.info(f"✅ Prédiction Rt (Cori) terminée pour {pays} en {elapsed_ms:.1f} ms")
+    return response
+
+@router.get("/estimate-batch")
+async def estimate_rt_batch(
+    pays: str = Query(..., description="Pays séparés par des virgules (noms ou codes ISO)"),
+    indicator: str = Query(..., description="Indicateur (cases, deaths)"),
+    source: str = Query(..., description="Source des données (covid, mpox)"),
+    horizon: int = Query(7, description="Horizon de projection en jours (défaut: 7)"),
+    date_debut: Optional[str] = Query(None, description="Début de l'historique (YYYY-MM-DD)"),
+    date_fin: Optional[str] = Query(None, description="Fin de l'historique (YYYY-MM-DD)")
+) -> Dict[str, Any]:
+    """
+    Rt courant et projection pour plusieurs pays (estimateur de Cori) : les
+    séries sont récupérées en parallèle puis estimées en un seul passage
+    vectorisé sur la matrice (pays, jours). L'échec d'un pays n'interrompt pas les autres.
+    """
+    countries: List[str] = list(dict.fromkeys(p.strip() for p in pays.split(",") if p.strip()))
+    if not countries:
+        raise HTTPException(status_code=400, detail="Le paramètre 'pays' doit contenir au moins un pays.")
+    if horizon <= 0:
+        raise HTTPException(status_code=400, detail="L'horizon de projection doit être positif")
+    estimator = CoriRtEstimator()
+    semaphore = asyncio.Semaphore(int(os.getenv("RT_BATCH_CONCURRENCY", 8)))
+
+    async def fetch(country: str) -> pd.Series:
+        async with semaphore:
+            frame = await data_source.get_daily_series_frame(
+                pays=country, indicator=indicator, source=source, date_debut=date_debut, date_fin=date_fin
+            )
+        return _daily_incidence(frame)
+
+    fetched = await asyncio.gather(*(fetch(country) for country in countries), return_exceptions=True)
+    errors: Dict[str, str] = {}
+    series: Dict[str, pd.Series] = {}
+    for country, result in zip(countries, fetched):
+        if isinstance(result, BaseException):
+            errors[country] = str(result)
+        elif len(result) < estimator.min_days:
+            errors[country] = f"Minimum {estimator.min_days} jours d'incidence requis"
+        else:
+            series[country] = result
+    if not series:
+        raise HTTPException(status_code=404, detail={"message": "Aucun pays exploitable", "errors": errors})
+
+    # Chaque série alignée à droite sur sa propre dernière date (zéros avant son début)
+    days = max(len(values) for values in series.values())
+    matrix = np.zeros((len(series), days))
+    for row, values in enumerate(series.values()):
+        matrix[row, days - len(values):] = values.to_numpy()
+    started = time.perf_counter()
+    try:
+        estimate, projection = await ml_executor.run(estimator.forecast, matrix, horizon)
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    results: Dict[str, Any] = {}
+    for row, (country, values) in enumerate(series.items()):
+        last_date = values.index[-1]
+        if np.isnan(estimate.mean[row, -1]):
+            errors[country] = "Incidence nulle sur les dernières semaines : Rt non estimable"
+            continue
+        results[country] = {
+            "last_data_date": last_date.strftime('%Y-%m-%d'),
+            "rt": {
+                "mean": float(estimate.mean[row, -1]),
+                "lower": float(estimate.lower[row, -1]),
+                "upper": float(estimate.upper[row, -1])
+            },
+            "projection": [
+                {
+                    "date": (last_date + timedelta(days=i + 1)).strftime('%Y-%m-%d'),
+                    "incidence": float(projection.incidence_mean[row, i]),
+                    "lower": float(projection.incidence_lower[row, i]),
+                    "upper": float(projection.incidence_upper[row, i])
+                }
+                for i in range(horizon)
+            ]
+        }
+    return {
+        "results": results,
+        "errors": errors,
+        "meta": {
+            "indicator": indicator,
+            "source": source,
+            "countries": len(results),
+            "days": days,
+            "computation_ms": round(elapsed_ms, 3),
+            "model": estimator.get_model_info()
+        }
+    }
+
+@router.post("/jobs", status_code=202)
+async def create_rt_job(
+    request: Request,
+    pays: str = Query(..., description="Nom du pays ou code ISO"),
+    indicator: str = Query(..., description="Indicateur (cases, deaths)"),
+    source: str = Query(..., description="Source des données (covid, mpox)"),
+    horizon: int = Query(7, description="Horizon de prédiction en jours (défaut: 7)"),
+    reference_date: Optional[str] = Query(None, description="Date de référence pour les prédictions (YYYY-MM-DD). Défaut = aujourd'hui"),
+    engine: Optional[str] = Query(None, description="Moteur Rt : lstm (réseau entraîné) ou cori (équation de renouvellement, quelques ms). Défaut = RT_ENGINE"),
+    mode: Optional[str] = Query(None, description="Entraînement LSTM : full (complet), fine_tune (ajustement du modèle pré-entraîné) ou fast (modèle pré-entraîné seul). Défaut = RT_LSTM_MODE")
+) -> Dict[str, Any]:
+    """
+    Lance la prédiction Rt en arrière-plan et retourne immédiatement l'identifiant du job.
+    Suivre l'état, la progression puis le résultat avec GET /jobs/{job_id}.
+    """
+    if not source:
+        raise HTTPException(status_code=400, detail="Le paramètre 'source' (ex: covid, mpox) est obligatoire.")
+    if not indicator:
+        raise HTTPException(status_code=400, detail="Le paramètre 'indicator' (cases, deaths) est obligatoire.")
+    engine = _resolve_engine(engine)
+    params = {"pays": pays, "indicator": indicator, "source": source, "horizon": horizon, "reference_date": reference_date,
+              "engine": engine, "mode": _resolve_lstm_mode(mode) if engine == "lstm" else None}
+    try:
+        job = job_manager.submit("rt", params, lambda: predict_rt(**params))
+    except JobLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": str(request.url_for("get_rt_job", job_id=job.id))
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_rt_job(job_id: str) -> Dict[str, Any]:
+    """État, progression et (une fois terminé) résultat d'un job de prédiction Rt"""
+    job = job_manager.get(job_id, kind="rt")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} introuvable ou expiré")
+    return job.to_dict()
+
+@router.delete("/jobs/{job_id}")
+async def cancel_rt_job(job_id: str) -> Dict[str, Any]:
+    """Annule un job de prédiction Rt (sans effet s'il est déjà terminé)"""
+    job = job_manager.cancel(job_id, kind="rt")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} introuvable ou expiré")
+    return job.to_dict(include_result=False)
+
 @router.get("/model-info")
 async def get_rt_model_info() -> Dict[str, Any]:
-    """Retourne les informations sur le modèle Rt (LSTM)"""
-    return rt_predictor.get_model_info()
+    """Retourne les informations sur les moteurs Rt (LSTM et Cori)"""
+    info = RtLSTMPredictor().get_model_info()
+    info["default_engine"] = os.getenv("RT_ENGINE", "lstm")
+    info["cori"] = CoriRtEstimator().get_model_info()
+    info["predictor_pool"] = rt_predictor_pool.get_stats()
+    info["model_registry"] = rt_model_registry.get_stats()
+    info["default_mode"] = os.getenv("RT_LSTM_MODE", "fine_tune")
+    info["modes"] = list(LSTM_MODES)
+    pretrained = await asyncio.get_running_loop().run_in_executor(None, load_pretrained)
+    info["pretrained"] = pretrained.get_info() if pretrained is not None else None
+    # TensorFlow n'est importé qu'au premier entraînement LSTM
+    info["tensorflow_loaded"] = "tensorflow" in sys.modules
+    return info
+
+@router.get("/model-memory")
+async def get_rt_model_memory() -> Dict[str, Any]:
+    """
+    Mémoire des modèles LSTM de ce worker : modèles compilés du pool, LSTM
+    entraînés gardés en cache, mémoire résidente. Avec l'exécuteur ``process``,
+    le pool vit dans les processus de l'exécuteur : le rapport vient de l'un d'eux.
+    """
+    if ml_executor.kind == MLExecutor.PROCESS:
+        try:
+            models = await ml_executor.run(lstm_memory_report)
+        except ExecutorSaturatedError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    else:
+        models = lstm_memory_report()
+    registry = rt_model_registry.get_stats()
+    return {
+        "pid": os.getpid(),
+        "executor": ml_executor.kind,
+        "models": models,
+        "model_cache": {
+            key: registry[key]
+            for key in ("memory_items", "max_memory_items", "memory_bytes", "max_memory_bytes", "disk_bytes", "max_bytes")
+        }
+    }
 
 @router.get("/data-quality")
 async def check_rt_data_quality(
@@ -189,12 +520,12 @@ async def check_rt_data_quality(
     if not indicator:
         raise HTTPException(status_code=400, detail="Le paramètre 'indicator' (cases, deaths) est obligatoire.")
     try:
-        rt_data = await express_client.get_rt_data(
+        rt_frame = await data_source.get_rt_frame(
             pays=pays,
             indicator=indicator,
             source=source
         )
-        if not rt_data.get("data"):
+        if rt_frame.empty:
             return {
                 "pays": pays,
                 "source": source,
@@ -203,8 +534,10 @@ async def check_rt_data_quality(
                 "message": "Aucune donnée disponible",
                 "data_points": 0
             }
-        df = pd.DataFrame(rt_data["data"])
-        df['date'] = pd.to_datetime(df['date'])
+        df = pd.DataFrame({
+            'date': pd.to_datetime(rt_frame['date']),
+            'Rt': rt_frame['Rt']
+        })
         df = df.sort_values('date').reset_index(drop=True)
         total_points = len(df)
         non_null_points = len(df.dropna(subset=['Rt']))
@@ -5,7 +5,9 @@ Routes pour les prédictions de propagation géographique
 from fastapi import APIRouter, HTTPException, Query
 from typing import Optional, Dict, Any
 import logging
-from services.express_client import ExpressAPIClient
+from services.data_source import get_data_source, DataNotFoundError
+from services.resilience import CircuitOpenError
+from services.ml_executor import ExecutorSaturatedError, get_ml_executor
 from models.clustering_model import cluster_countries
 from fastapi.responses import JSONResponse
 from fastapi import status
@@ -14,7 +16,8 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-express_client = ExpressAPIClient()
+data_source = get_data_source()
+ml_executor = get_ml_executor()
 
 @router.get(
     "/predict",
@@ -129,18 +132,15 @@ async def predict_spread(
     if not source:
         raise HTTPException(status_code=400, detail="Le paramètre 'source' (ex: covid, mpox) est obligatoire.")
     try:
-        data = await express_client.get_geographic_spread(indicator=indicator, source=source, k=k)
+        data = await data_source.get_geographic_spread(indicator=indicator, source=source, k=k)
         # Si la réponse contient déjà des clusters, on relaie directement
         if "clusters" in data and isinstance(data["clusters"], list):
-            # Ajoute une mention dans la meta
-            if "meta" in data and isinstance(data["meta"], dict):
-                data["meta"]["clustering_location"] = "express"
-            else:
-                data["meta"] = {"clustering_location": "express"}
-            return data
+            # Ajoute une mention dans la meta, sur une copie : la réponse en cache est partagée
+            meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+            return {**data, "meta": {**meta, "clustering_location": "express"}}
         # Sinon, on attend une clé 'series' pour clusteriser côté IA (fallback)
         series = data.get("series", [])
-        result = cluster_countries(series, k=k)
+        result = await ml_executor.run(cluster_countries, series, k=k)
         result["meta"].update({
             "indicator": indicator,
             "source": source,
@@ -150,6 +150,10 @@ async def predict_spread(
         return result
     except HTTPException as e:
         raise e
+    except (CircuitOpenError, ExecutorSaturatedError) as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except DataNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur clustering propagation: {e}")
         raise HTTPException(status_code=500, detail=f"Erreur clustering propagation: {e}")
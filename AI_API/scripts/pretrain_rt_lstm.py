@@ -0,0 +1,96 @@
+"""
+Pré-entraînement hors ligne du modèle LSTM Rt global
+
+Entraîne un seul ``RtLSTMPredictor`` sur les séries Rt de plusieurs pays
+(mêmes features que ``/api/rt/predict``, chaque pays standardisé séparément)
+et écrit ses poids dans ``RT_PRETRAINED_MODEL``. Les workers le relisent
+dès que le fichier change : ``/api/rt/predict`` part alors de ces poids et
+n'ajuste que quelques époques par pays (``mode=fine_tune``), ou aucune
+(``mode=fast``).
+
+La source de données est celle de l'API (``AI_DATA_BACKEND``).
+
+Usage :
+    cd AI_API
+    python -m scripts.pretrain_rt_lstm --pays France,Italy,Spain,Germany --indicator cases --source covid
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.rt_model import (RT_FEATURE_COLUMNS, RtLSTMPredictor, add_rt_features, clean_rt_frame,  # noqa: E402
+                             pretrained_model_path, save_pretrained)
+from services.data_source import get_data_source  # noqa: E402
+
+logger = logging.getLogger("pretrain_rt_lstm")
+
+
+async def fetch_series(countries, indicator, source, date_debut, date_fin, concurrency):
+    """Séries ``(X, y)`` des pays exploitables, récupérées en parallèle"""
+    data_source = get_data_source()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(country):
+        async with semaphore:
+            frame = await data_source.get_rt_frame(pays=country, indicator=indicator, source=source,
+                                                   date_debut=date_debut, date_fin=date_fin, window=7)
+        df = add_rt_features(clean_rt_frame(frame))
+        return df[RT_FEATURE_COLUMNS].values, df['Rt'].values
+
+    await data_source.start()
+    try:
+        results = await asyncio.gather(*(fetch(country) for country in countries), return_exceptions=True)
+    finally:
+        await data_source.aclose()
+
+    series, labels = [], []
+    for country, result in zip(countries, results):
+        if isinstance(result, BaseException):
+            logger.warning(f"⚠️ {country} ignoré : {result}")
+            continue
+        series.append(result)
+        labels.append(country)
+    return series, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pays", default=os.getenv("RT_PRETRAIN_COUNTRIES", ""),
+                        help="pays séparés par des virgules (défaut : RT_PRETRAIN_COUNTRIES)")
+    parser.add_argument("--indicator", default="cases")
+    parser.add_argument("--source", default="covid")
+    parser.add_argument("--date-debut", default="2020-01-01")
+    parser.add_argument("--date-fin", default=None)
+    parser.add_argument("--epochs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("RT_BATCH_CONCURRENCY", 8)))
+    parser.add_argument("--output", default=pretrained_model_path(), help="fichier écrit (défaut : RT_PRETRAINED_MODEL)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    countries = list(dict.fromkeys(p.strip() for p in args.pays.split(",") if p.strip()))
+    if not countries:
+        parser.error("au moins un pays est requis (--pays ou RT_PRETRAIN_COUNTRIES)")
+
+    series, labels = asyncio.run(fetch_series(countries, args.indicator, args.source, args.date_debut,
+                                              args.date_fin, args.concurrency))
+    if not series:
+        sys.exit("Aucune série Rt récupérée")
+
+    started = time.perf_counter()
+    predictor = RtLSTMPredictor(epochs=args.epochs)
+    pretrained = predictor.train_global(series, feature_names=RT_FEATURE_COLUMNS, labels=labels)
+    path = save_pretrained(pretrained, args.output)
+    print(f"Modèle global {pretrained.version} : {len(pretrained.series)} pays, "
+          f"{pretrained.accuracy_metrics['training_samples']} séquences d'entraînement, "
+          f"perte de validation {pretrained.accuracy_metrics['val_loss']:.4f}, "
+          f"{time.perf_counter() - started:.0f} s -> {path}")
+
+
+if __name__ == "__main__":
+    main()
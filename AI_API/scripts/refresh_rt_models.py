@@ -0,0 +1,82 @@
+"""
+Rafraîchissement quotidien des modèles LSTM Rt de plusieurs pays
+
+Rejoue ``/api/rt/predict`` pour chaque pays dans ce processus : le dernier
+modèle de chaque pays (registre sur disque, ``ML_MODEL_REGISTRY_DIR``) est
+mis à jour sur les nouveaux jours, ou réentraîné si la politique
+incrémentale l'exige (``RT_INCREMENTAL_*``). Les workers de l'API qui
+partagent le registre servent ensuite ces modèles sans entraînement.
+
+Usage :
+    cd AI_API
+    python -m scripts.refresh_rt_models --pays France,Italy,Spain --indicator cases --source covid
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes import rt_routes  # noqa: E402
+
+logger = logging.getLogger("refresh_rt_models")
+
+
+async def refresh(countries, indicator, source, mode, concurrency):
+    """Prédiction (et donc mise à jour du modèle) de chaque pays ; ``{pays: (mode, secondes) ou erreur}``"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(country):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await rt_routes.predict_rt(pays=country, indicator=indicator, source=source, horizon=1,
+                                                  reference_date=None, engine="lstm", mode=mode)
+            model = response["metadata"]["model"]
+            training = "cached" if model["model_cached"] else model["training"].get("mode")
+            return training, time.perf_counter() - started
+
+    await rt_routes.data_source.start()
+    try:
+        results = await asyncio.gather(*(one(country) for country in countries), return_exceptions=True)
+    finally:
+        await rt_routes.data_source.aclose()
+        rt_routes.ml_executor.shutdown()
+    return dict(zip(countries, results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pays", default=os.getenv("RT_PRETRAIN_COUNTRIES", ""),
+                        help="pays séparés par des virgules (défaut : RT_PRETRAIN_COUNTRIES)")
+    parser.add_argument("--indicator", default="cases")
+    parser.add_argument("--source", default="covid")
+    parser.add_argument("--mode", default=None, help="mode d'entraînement LSTM (défaut : RT_LSTM_MODE)")
+    parser.add_argument("--concurrency", type=int, default=rt_routes.ml_executor.workers)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    countries = list(dict.fromkeys(p.strip() for p in args.pays.split(",") if p.strip()))
+    if not countries:
+        parser.error("au moins un pays est requis (--pays ou RT_PRETRAIN_COUNTRIES)")
+
+    started = time.perf_counter()
+    results = asyncio.run(refresh(countries, args.indicator, args.source, args.mode, args.concurrency))
+    modes = Counter()
+    for country, result in results.items():
+        if isinstance(result, BaseException):
+            modes["erreur"] += 1
+            print(f"{country:<24} erreur : {getattr(result, 'detail', result)}")
+        else:
+            modes[result[0]] += 1
+            print(f"{country:<24} {result[0]:<12} {result[1]:>8.2f} s")
+    summary = ", ".join(f"{count} {mode}" for mode, count in modes.most_common())
+    print(f"{len(countries)} pays en {time.perf_counter() - started:.1f} s : {summary}")
+
+
+if __name__ == "__main__":
+    main()
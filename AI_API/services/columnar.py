@@ -0,0 +1,76 @@
+"""
+Formats de transport colonnaires entre l'API Express.js et l'API IA
+
+Les séries sont négociées via l'en-tête ``Accept``, limité aux formats que
+l'API Express.js sait produire (``API/src/middleware/columnarSerializer.js``) :
+- ``application/x-msgpack`` : MessagePack ``{"columns": {...}, "meta": {...}}``
+  (paquet optionnel ``msgpack``, format servi par l'API Express.js)
+- ``application/json`` : repli, tableau de lignes décodé en streaming
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_TYPE = "application/x-msgpack"
+JSON_TYPE = "application/json"
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    msgpack = None
+
+
+def available_formats(preference: str = "auto") -> List[str]:
+    """
+    Types MIME utilisables, par ordre de préférence
+
+    ``preference`` : ``auto`` (MessagePack s'il est installé), ``msgpack``
+    ou ``json`` (JSON uniquement).
+    """
+    formats = []
+    if preference in ("auto", "msgpack") and msgpack is not None:
+        formats.append(MSGPACK_TYPE)
+    if preference not in ("auto", "msgpack", "json"):
+        logger.warning(f"⚠️ Format de transport inconnu '{preference}' - repli sur JSON")
+    return formats + [JSON_TYPE]
+
+
+def build_accept_header(formats: List[str]) -> str:
+    """En-tête Accept avec des qualités décroissantes (JSON toujours en dernier)"""
+    parts = []
+    for index, mime in enumerate(formats):
+        quality = max(0.1, 1.0 - 0.1 * index) if mime != JSON_TYPE else 0.1
+        parts.append(mime if index == 0 else f"{mime};q={quality:.1f}")
+    return ", ".join(parts)
+
+
+def _frame_from_columns(columns: Dict[str, Any], dtypes: Dict[str, Any]) -> pd.DataFrame:
+    """Construit un DataFrame aux colonnes et types demandés (sans passer par des lignes)"""
+    frame = {}
+    for name, dtype in dtypes.items():
+        values = columns.get(name, [])
+        dtype = np.dtype(dtype)
+        if isinstance(values, np.ndarray) and dtype.kind != "f":
+            # Colonne déjà typée : conservée telle quelle
+            frame[name] = values
+        else:
+            frame[name] = np.asarray(values, dtype=dtype)
+    return pd.DataFrame(frame, copy=False)
+
+
+def decode_msgpack_frame(body: bytes, dtypes: Dict[str, Any]) -> pd.DataFrame:
+    """Décode un corps MessagePack colonnaire ; les autres clés vont dans ``attrs``"""
+    payload = msgpack.unpackb(body, raw=False)
+    frame = _frame_from_columns(payload.pop("columns", {}), dtypes)
+    frame.attrs.update(payload)
+    return frame
+
+
+def media_type(content_type: Optional[str]) -> str:
+    """Type MIME sans paramètres (``application/json; charset=utf-8`` -> ``application/json``)"""
+    return (content_type or JSON_TYPE).split(";", 1)[0].strip().lower()
@@ -0,0 +1,151 @@
+"""
+Interface commune des sources de données de l'API IA
+
+Les routes ne dépendent que de ``DataSource`` : l'implémentation (API
+Express.js, PostgreSQL direct, fichiers de l'ETL) est choisie par la
+variable d'environnement ``AI_DATA_BACKEND``.
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Valeur plancher de la valeur passée dans le calcul du Rt (identique à l'API Express.js)
+RT_EPSILON = 0.1
+
+
+class DataNotFoundError(Exception):
+    """Aucune donnée ne correspond à la requête (pays, indicateur, source, période)"""
+
+
+class DataSource(ABC):
+    """
+    Source des séries consommées par les modèles.
+
+    Les séries sont retournées sous forme de ``pd.DataFrame`` colonnaires
+    (colonne ``date`` + valeur) avec les métadonnées dans ``frame.attrs["meta"]``.
+    Ces DataFrames peuvent être partagés via un cache : ne pas les modifier.
+    """
+
+    name = "abstract"
+
+    async def start(self) -> None:
+        """Ouvre les ressources partagées (pool de connexions...)"""
+
+    async def aclose(self) -> None:
+        """Libère les ressources partagées"""
+
+    @abstractmethod
+    async def test_connection(self) -> bool:
+        """Vérifie que la source répond, lève une exception sinon"""
+
+    def get_client_stats(self) -> Dict[str, Any]:
+        """Métriques internes exposées par ``/metrics``"""
+        return {"backend": self.name}
+
+    @abstractmethod
+    async def get_mortality_rate_frame(self, pays: str, source: Optional[str] = None,
+                                       date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                       window: int = 7) -> pd.DataFrame:
+        """Taux de mortalité glissant (colonnes ``date``, ``mortality_rate``)"""
+
+    @abstractmethod
+    async def get_rt_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                           date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                           window: int = 7) -> pd.DataFrame:
+        """Rt estimé (colonnes ``date``, ``Rt``)"""
+
+    @abstractmethod
+    async def get_daily_series_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                                     date_debut: Optional[str] = None,
+                                     date_fin: Optional[str] = None) -> pd.DataFrame:
+        """Série journalière moyenne d'un indicateur (colonnes ``date``, ``value``)"""
+
+    @abstractmethod
+    async def get_geographic_spread(self, indicator: str, source: Optional[str] = None,
+                                    date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                    k: int = 3) -> Dict[str, Any]:
+        """Clusters de pays, ou séries ``{iso_code, country, values}`` à clusteriser côté IA"""
+
+
+# ----------------------------------------------------------------------
+# Calculs vectorisés partagés par les sources hors API Express.js
+# (mêmes définitions que les endpoints /mortality-rate et /rt)
+# ----------------------------------------------------------------------
+
+def rolling_mortality_rate(cases: np.ndarray, deaths: np.ndarray, window: int) -> np.ndarray:
+    """
+    Décès / cas cumulés sur ``window`` jours (NaN avant la première fenêtre
+    complète ou si la somme des cas est nulle)
+    """
+    cases = np.nan_to_num(np.asarray(cases, dtype=np.float64))
+    deaths = np.nan_to_num(np.asarray(deaths, dtype=np.float64))
+    rate = np.full(len(cases), np.nan)
+    if window < 1 or len(cases) < window:
+        return rate
+    kernel = np.ones(window)
+    sum_cases = np.convolve(cases, kernel, mode="valid")
+    sum_deaths = np.convolve(deaths, kernel, mode="valid")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate[window - 1:] = np.where(sum_cases != 0, sum_deaths / sum_cases, np.nan)
+    return rate
+
+
+def growth_rt(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rt = (v[t] / v[t - window]) ** (1 / window), la valeur passée nulle ou
+    manquante étant remplacée par ``RT_EPSILON``
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rt = np.full(len(values), np.nan)
+    if window < 1 or len(values) <= window:
+        return rt
+    past = values[:-window]
+    past = np.where(np.isnan(past) | (past == 0), RT_EPSILON, past)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rt[window:] = np.power(values[window:] / past, 1.0 / window)
+    return rt
+
+
+def make_frame(dates: Any, column: str, values: np.ndarray, meta: Dict[str, Any]) -> pd.DataFrame:
+    """DataFrame colonnaire au format des sources (``date`` + une colonne, ``meta`` dans ``attrs``)"""
+    frame = pd.DataFrame({"date": np.asarray(dates), column: np.asarray(values, dtype=np.float64)}, copy=False)
+    frame.attrs["meta"] = meta
+    return frame
+
+
+# ----------------------------------------------------------------------
+# Sélection du backend
+# ----------------------------------------------------------------------
+
+_shared_source: Optional[DataSource] = None
+
+
+def create_data_source(backend: Optional[str] = None) -> DataSource:
+    """Instancie la source configurée (``express`` par défaut, ``postgres`` ou ``file``)"""
+    backend = (backend or os.getenv("AI_DATA_BACKEND", "express")).lower()
+    if backend == "express":
+        from services.express_client import get_express_client
+        return get_express_client()
+    if backend == "postgres":
+        from services.postgres_source import PostgresDataSource
+        return PostgresDataSource()
+    if backend == "file":
+        from services.file_source import FileDataSource
+        return FileDataSource()
+    raise ValueError(f"Backend de données inconnu: {backend} (attendu: express, postgres, file)")
+
+
+def get_data_source() -> DataSource:
+    """Retourne la source de données partagée par le processus"""
+    global _shared_source
+    if _shared_source is None:
+        _shared_source = create_data_source()
+        logger.info(f"🗄️ Source de données : {_shared_source.name}")
+    return _shared_source
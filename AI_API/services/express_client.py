@@ -4,44 +4,452 @@ Client HTTP pour communiquer avec l'API Express.js
 
 import httpx
 import asyncio
-from typing import Dict, List, Optional, Any
+from datetime import date
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Any, Tuple
+from urllib.parse import urlencode
 import os
+import time
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 import logging
 
+from services.response_cache import ResponseCache, MISSING
+from services.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker
+from services.json_stream import JSONResponseDecoder, FrameResponseDecoder
+from services.columnar import available_formats, build_accept_header
+from services.data_source import DataSource, DataNotFoundError
+
 # Chargement des variables d'environnement
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-class ExpressAPIClient:
-    """Client pour communiquer avec l'API Express.js"""
+# Durée de vie par défaut (secondes) des réponses en cache, par endpoint.
+# Surchargeable via API_EXPRESS_CACHE_TTL_POLICIES="mortality-rate=600,rt=600"
+DEFAULT_CACHE_TTL_POLICIES = {
+    "features": 24 * 3600,
+    "mortality-rate": 3600,
+    "rt": 3600,
+    "aggregation": 3600,
+    "stats": 3600,
+    "ml-ready": 3600,
+    "geographic-spread": 6 * 3600
+}
+
+def _parse_ttl_policies(raw: Optional[str]) -> Dict[str, float]:
+    """Parse une liste 'endpoint=ttl,...' en dictionnaire"""
+    policies = dict(DEFAULT_CACHE_TTL_POLICIES)
+    for item in (raw or "").split(","):
+        if "=" not in item:
+            continue
+        name, ttl = item.split("=", 1)
+        try:
+            policies[name.strip()] = float(ttl)
+        except ValueError:
+            logger.warning(f"⚠️ Politique de TTL ignorée: {item}")
+    return policies
+
+class CountryResult(NamedTuple):
+    """Résultat d'une récupération multi-pays (``error`` est renseigné en cas d'échec)"""
+    pays: str
+    data: Optional[Dict[str, Any]]
+    error: Optional[Exception]
+
+class CachedResponse(NamedTuple):
+    """Réponse en cache et ses validateurs HTTP (revalidation par GET conditionnel)"""
+    payload: Any
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    data_version: Optional[str]
+
+class ExpressAPIClient(DataSource):
+    """Client pour communiquer avec l'API Express.js
+
+    Un seul ``httpx.AsyncClient`` (pool de connexions keep-alive) est partagé
+    par toutes les requêtes du client. Il est créé par ``start()`` (lifespan
+    FastAPI) ou à la première requête, et fermé par ``aclose()``.
+    """
+    
+    name = "express"
     
-    def __init__(self):
-        self.base_url = os.getenv("API_EXPRESS_URL", "http://localhost:3000")
-        self.timeout = 180
+    def __init__(self, base_url: Optional[str] = None, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url or os.getenv("API_EXPRESS_URL", "http://localhost:3000")
+        self.timeout = float(os.getenv("API_EXPRESS_TIMEOUT", 180))
         self.max_retries = 3
         self.retry_delay = 1  # secondes
         
-    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Effectue une requête HTTP avec retry logic"""
+        # Configuration du pool de connexions
+        self.max_connections = int(os.getenv("API_EXPRESS_MAX_CONNECTIONS", 100))
+        self.max_keepalive_connections = int(os.getenv("API_EXPRESS_MAX_KEEPALIVE", 20))
+        self.keepalive_expiry = float(os.getenv("API_EXPRESS_KEEPALIVE_EXPIRY", 30))
+        self.pool_timeout = float(os.getenv("API_EXPRESS_POOL_TIMEOUT", 10))
+        self.http2 = os.getenv("API_EXPRESS_HTTP2", "false").lower() == "true"
+        
+        # Disjoncteur : ouverture après N échecs consécutifs, test après le délai de reprise
+        self.circuit_breaker = CircuitBreaker(
+            name="express",
+            failure_threshold=int(os.getenv("API_EXPRESS_CB_FAILURE_THRESHOLD", 5)),
+            recovery_timeout=float(os.getenv("API_EXPRESS_CB_RECOVERY_TIMEOUT", 30)),
+            half_open_max_calls=int(os.getenv("API_EXPRESS_CB_HALF_OPEN_CALLS", 1))
+        )
+        
+        # Hedging des GET (idempotents) : duplication après le p95 de latence observé
+        self.hedging_enabled = os.getenv("API_EXPRESS_HEDGING", "false").lower() == "true"
+        self.hedge_initial_delay = float(os.getenv("API_EXPRESS_HEDGE_DELAY", 2.0))
+        self.hedge_min_delay = float(os.getenv("API_EXPRESS_HEDGE_MIN_DELAY", 0.05))
+        self.hedge_min_samples = int(os.getenv("API_EXPRESS_HEDGE_MIN_SAMPLES", 20))
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._hedge_stats = {"hedged_requests": 0, "hedge_wins": 0}
+        
+        # Transport des séries : formats colonnaires négociés via Accept (JSON en repli)
+        self.transport_formats = available_formats(os.getenv("API_EXPRESS_TRANSPORT", "auto").lower())
+        self._frame_accept = build_accept_header(self.transport_formats)
+        
+        # Version globale des données (change à chaque chargement ETL) : un
+        # changement invalide en bloc le cache et les modèles abonnés
+        self.data_version: Optional[str] = None
+        self.data_version_interval = float(os.getenv("API_EXPRESS_DATA_VERSION_INTERVAL", 60))
+        # Premier contrôle après un intervalle : d'ici là, l'en-tête X-Data-Version
+        # des réponses et la revalidation des entrées d'une autre version suffisent
+        self._data_version_checked_at = time.monotonic()
+        self._data_version_lock = asyncio.Lock()
+        self._conditional_stats = {"revalidations": 0, "not_modified": 0, "data_version_changes": 0}
+        
+        # Nombre maximum de pays interrogés simultanément par les méthodes get_*_many
+        self.bulk_concurrency = int(os.getenv("API_EXPRESS_BULK_CONCURRENCY", 8))
+        
+        self._transport = transport
+        self._json_decoder = JSONResponseDecoder()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight = 0
+        self._total_requests = 0
+        
+        # Requêtes GET en cours, partagées entre appelants identiques (single-flight)
+        self._pending: Dict[Tuple[str, Tuple, str], asyncio.Future] = {}
+        self._coalesced_requests = 0
+        
+        # Cache des réponses (LRU mémoire + SQLite optionnel sous API_EXPRESS_CACHE_DIR)
+        self.cache_enabled = os.getenv("API_EXPRESS_CACHE_ENABLED", "true").lower() == "true"
+        self.default_cache_ttl = float(os.getenv("API_EXPRESS_CACHE_TTL", 3600))
+        self.cache_ttl_policies = _parse_ttl_policies(os.getenv("API_EXPRESS_CACHE_TTL_POLICIES"))
+        self.cache = ResponseCache(
+            max_bytes=int(os.getenv("API_EXPRESS_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            cache_dir=os.getenv("API_EXPRESS_CACHE_DIR") or None,
+            disk_max_bytes=int(os.getenv("API_EXPRESS_CACHE_DISK_MAX_BYTES", 512 * 1024 * 1024))
+        ) if self.cache_enabled else None
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        """Construit le client HTTP partagé avec ses limites de pool"""
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ HTTP/2 demandé mais le paquet 'h2' est absent - repli sur HTTP/1.1")
+                http2 = False
+        
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+        timeout = httpx.Timeout(self.timeout, pool=self.pool_timeout)
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=limits,
+            http2=http2,
+            transport=self._transport
+        )
+    
+    async def start(self) -> None:
+        """Ouvre le pool de connexions (appelé au démarrage de l'application)"""
+        if self.cache is not None:
+            self.cache.open()
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+            logger.info(f"🔌 Pool HTTP vers {self.base_url} ouvert "
+                        f"(max={self.max_connections}, keep-alive={self.max_keepalive_connections}, http2={self.http2})")
+    
+    async def aclose(self) -> None:
+        """Ferme le pool de connexions (appelé à l'arrêt de l'application)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("🔌 Pool HTTP vers l'API Express.js fermé")
+        self._client = None
+        if self.cache is not None:
+            self.cache.close()
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Retourne le client partagé, en l'ouvrant si nécessaire"""
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        return self._client
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Retourne l'état du pool de connexions (idle, active, waiting)"""
+        idle = active = 0
+        pool = getattr(self._client, "_transport", None) if self._client is not None else None
+        connections = getattr(getattr(pool, "_pool", None), "connections", [])
+        for connection in connections:
+            if connection.is_closed():
+                continue
+            if connection.is_idle():
+                idle += 1
+            else:
+                active += 1
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "idle": idle,
+            "active": active,
+            # En HTTP/1.1 une connexion active sert une seule requête à la fois
+            "waiting": max(0, self._in_flight - active) if not self.http2 else 0,
+            "in_flight": self._in_flight,
+            "total_requests": self._total_requests
+        }
+    
+    def get_client_stats(self) -> Dict[str, Any]:
+        """Retourne les métriques du client (exposées sur /metrics)"""
+        return {
+            "backend": self.name,
+            "pool": self.get_pool_stats(),
+            "transport_formats": self.transport_formats,
+            "single_flight": {
+                "pending": len(self._pending),
+                "coalesced_requests": self._coalesced_requests
+            },
+            "cache": self.cache.get_stats() if self.cache is not None else {"enabled": False},
+            "conditional": {
+                "data_version": self.data_version,
+                **self._conditional_stats
+            },
+            "circuit_breaker": self.circuit_breaker.get_stats(),
+            "hedging": {
+                "enabled": self.hedging_enabled,
+                **self._hedge_stats,
+                "p95_latency": {
+                    endpoint: tracker.percentile(95) for endpoint, tracker in self._latencies.items()
+                }
+            }
+        }
+    
+    @staticmethod
+    def _request_key(endpoint: str, params: Optional[Dict], decoder_name: str = "json") -> Tuple[str, Tuple, str]:
+        """Clé normalisée (endpoint, paramètres, décodage) identifiant une requête GET"""
+        normalized = tuple(sorted(
+            (str(k), str(v)) for k, v in (params or {}).items() if v is not None
+        ))
+        return endpoint, normalized, decoder_name
+    
+    def _cache_key(self, endpoint: str, params: Optional[Dict], decoder_name: str = "json") -> str:
+        """Clé de cache : URL de base + endpoint + paramètres normalisés (+ format décodé)"""
+        _, normalized, _ = self._request_key(endpoint, params)
+        key = f"{self.base_url}{endpoint}?{urlencode(normalized)}"
+        return key if decoder_name == "json" else f"{key}#{decoder_name}"
+    
+    def _cache_ttl(self, endpoint: str, params: Optional[Dict]) -> Optional[float]:
+        """
+        Durée de vie d'une réponse en cache
+        
+        Une période entièrement passée (dateFin < aujourd'hui) ne change plus :
+        la réponse est conservée sans expiration. Sinon on applique la
+        politique de l'endpoint.
+        """
+        date_fin = (params or {}).get("dateFin")
+        if date_fin:
+            try:
+                if date.fromisoformat(str(date_fin)[:10]) < date.today():
+                    return None
+            except ValueError:
+                pass
+        name = endpoint.rstrip("/").rsplit("/", 1)[-1]
+        return self.cache_ttl_policies.get(name, self.default_cache_ttl)
+    
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                            data: Optional[Dict] = None, use_cache: bool = True,
+                            decoder: Optional[Callable] = None) -> Any:
+        """
+        Effectue une requête HTTP vers l'API Express.js
+        
+        Les GET sont d'abord cherchés dans le cache des réponses. Les GET
+        identiques (même endpoint, mêmes paramètres) émis pendant qu'une
+        requête est déjà en vol attendent son résultat au lieu d'interroger
+        à nouveau l'API Express.js.
+        
+        ``decoder`` transforme la réponse HTTP (par défaut : JSON complet) ;
+        voir ``services.json_stream`` pour le décodage incrémental.
+        """
+        decoder = decoder or self._json_decoder
+        if method.upper() != "GET":
+            payload, _, _ = await self._send_request(method, endpoint, params=params, data=data, decoder=decoder)
+            return payload
+        
+        use_cache = use_cache and self.cache is not None
+        stale = None
+        if use_cache:
+            await self._maybe_check_data_version()
+            cached, fresh = await self.cache.lookup(self._cache_key(endpoint, params, decoder.name))
+            if isinstance(cached, CachedResponse):
+                if fresh and cached.data_version in (None, self.data_version):
+                    return cached.payload
+                # Entrée expirée ou d'une autre version : revalidation conditionnelle
+                stale = cached
+        
+        key = self._request_key(endpoint, params, decoder.name)
+        future = self._pending.get(key)
+        if future is not None:
+            self._coalesced_requests += 1
+            logger.debug(f"🔗 Requête {endpoint} regroupée avec une requête en cours")
+        else:
+            future = asyncio.ensure_future(self._fetch(endpoint, params, use_cache, decoder, stale))
+            self._pending[key] = future
+            future.add_done_callback(lambda f: self._release_pending(key, f))
+        # shield : l'annulation d'un appelant n'annule pas la requête partagée
+        return await asyncio.shield(future)
+    
+    async def _fetch(self, endpoint: str, params: Optional[Dict], use_cache: bool, decoder: Callable,
+                     stale: Optional[CachedResponse] = None) -> Any:
+        """
+        Exécute un GET, décode la réponse et l'enregistre dans le cache
+        
+        Si une entrée périmée ``stale`` est fournie, le GET est conditionnel
+        (``If-None-Match`` / ``If-Modified-Since``) : une réponse 304 sans corps
+        prolonge l'entrée existante au lieu de retélécharger la série.
+        """
+        headers = {}
+        if stale is not None:
+            self._conditional_stats["revalidations"] += 1
+            if stale.etag:
+                headers["If-None-Match"] = stale.etag
+            if stale.last_modified:
+                headers["If-Modified-Since"] = stale.last_modified
+        
+        payload, size, response = await self._send_request("GET", endpoint, params=params, decoder=decoder,
+                                                           headers=headers or None)
+        version = response.headers.get("x-data-version")
+        await self._observe_data_version(version)
+        
+        key = self._cache_key(endpoint, params, decoder.name)
+        ttl = self._cache_ttl(endpoint, params)
+        if response.status_code == 304 and stale is not None:
+            self._conditional_stats["not_modified"] += 1
+            if use_cache:
+                if version and version != stale.data_version:
+                    await self.cache.set(key, stale._replace(data_version=version), size=stale.size, ttl=ttl)
+                else:
+                    await self.cache.refresh(key, ttl)
+            return stale.payload
+        
+        if use_cache:
+            entry = CachedResponse(
+                payload=payload,
+                size=size,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+                data_version=version or self.data_version
+            )
+            await self.cache.set(key, entry, size=size, ttl=ttl)
+        return payload
+    
+    # ------------------------------------------------------------------
+    # Version globale des données
+    # ------------------------------------------------------------------
+    
+    async def _observe_data_version(self, version: Optional[str]) -> None:
+        """Prend en compte une version reçue ; un changement invalide tout le cache"""
+        if not version or version == self.data_version:
+            return
+        previous = self.data_version
+        self.data_version = version
+        self._data_version_checked_at = time.monotonic()
+        if previous is None:
+            return
+        self._conditional_stats["data_version_changes"] += 1
+        logger.info(f"🔄 Nouvelle version des données Express.js ({previous} -> {version}) : invalidation des caches")
+        if self.cache is not None:
+            await self.cache.clear()
+    
+    async def check_data_version(self) -> Optional[str]:
+        """Interroge l'endpoint léger ``/data-version`` et applique un éventuel changement"""
+        async with self._data_version_lock:
+            payload, _, _ = await self._send_request("GET", "/api/donnees-historiques/data-version",
+                                                     decoder=self._json_decoder)
+            self._data_version_checked_at = time.monotonic()
+            await self._observe_data_version(payload.get("version"))
+            return self.data_version
+    
+    async def _maybe_check_data_version(self) -> None:
+        """Vérifie la version au plus une fois par ``data_version_interval`` secondes"""
+        if self.data_version_interval <= 0 or self._data_version_lock.locked():
+            return
+        if time.monotonic() - self._data_version_checked_at < self.data_version_interval:
+            return
+        try:
+            await self.check_data_version()
+        except Exception as e:
+            # API Express.js sans /data-version ou indisponible : le cache reste servi
+            self._data_version_checked_at = time.monotonic()
+            logger.debug(f"Version des données indisponible: {e}")
+    
+    def _release_pending(self, key: Tuple[str, Tuple, str], future: asyncio.Future) -> None:
+        """Retire une requête terminée de la table des requêtes en vol"""
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        # Marque l'exception comme consommée si tous les appelants ont été annulés
+        if not future.cancelled():
+            future.exception()
+    
+    async def _send_request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                            data: Optional[Dict] = None, decoder: Optional[Callable] = None,
+                            headers: Optional[Dict[str, str]] = None) -> Tuple[Any, int, httpx.Response]:
+        """
+        Effectue une requête HTTP avec retry logic
+        
+        Le disjoncteur fait échouer immédiatement les appels (``CircuitOpenError``)
+        tant que l'API Express.js est considérée indisponible. Les GET peuvent
+        être couverts par une requête dupliquée (hedging) si activé.
+        
+        Retourne le contenu décodé, sa taille (octets) pour le cache et la
+        réponse (en-têtes). Une réponse 304 n'a pas de contenu décodé.
+        """
         
         url = f"{self.base_url}{endpoint}"
+        method = method.upper()
+        if method not in ("GET", "POST"):
+            raise ValueError(f"Méthode HTTP non supportée: {method}")
+        decoder = decoder or self._json_decoder
+        client = await self._get_client()
         
         for attempt in range(self.max_retries):
+            self.circuit_breaker.before_call()
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    if method.upper() == "GET":
-                        response = await client.get(url, params=params)
-                    elif method.upper() == "POST":
-                        response = await client.post(url, json=data, params=params)
-                    else:
-                        raise ValueError(f"Méthode HTTP non supportée: {method}")
-                    
+                if method == "GET" and self.hedging_enabled:
+                    response, payload, size = await self._hedged_get(client, endpoint, params, decoder, headers)
+                else:
+                    response, payload, size = await self._attempt(client, method, endpoint, params, data,
+                                                                  decoder, headers)
+                
+                # Une erreur 4xx est une réponse valide d'un service en bonne santé
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                if response.status_code != 304:
                     response.raise_for_status()
-                    return response.json()
+                return payload, size, response
+            
+            except asyncio.CancelledError:
+                # Requête abandonnée par l'appelant : l'appel de test ne doit pas bloquer le circuit
+                self.circuit_breaker.release()
+                raise
                     
             except httpx.TimeoutException:
+                self.circuit_breaker.record_failure()
                 logger.warning(f"Timeout sur {url} (tentative {attempt + 1}/{self.max_retries})")
                 if attempt < self.max_retries - 1:
                     await asyncio.sleep(self.retry_delay * (attempt + 1))
@@ -50,9 +458,13 @@ class ExpressAPIClient:
                     
             except httpx.HTTPStatusError as e:
                 logger.error(f"Erreur HTTP {e.response.status_code} sur {url}: {e.response.text}")
-                raise Exception(f"Erreur API Express.js: {e.response.status_code} - {e.response.text}")
+                message = f"Erreur API Express.js: {e.response.status_code} - {e.response.text}"
+                if e.response.status_code == 404:
+                    raise DataNotFoundError(message)
+                raise Exception(message)
                 
             except Exception as e:
+                self.circuit_breaker.record_failure()
                 logger.error(f"Erreur de communication avec l'API Express.js: {e}")
                 if attempt < self.max_retries - 1:
                     await asyncio.sleep(self.retry_delay * (attempt + 1))
@@ -61,10 +473,77 @@ class ExpressAPIClient:
         
         raise Exception("Nombre maximum de tentatives atteint")
     
+    async def _attempt(self, client: httpx.AsyncClient, method: str, endpoint: str,
+                       params: Optional[Dict], data: Optional[Dict], decoder: Callable,
+                       headers: Optional[Dict[str, str]] = None) -> Tuple[httpx.Response, Any, int]:
+        """
+        Un envoi unique, réponse lue en streaming par ``decoder``
+        
+        Sa latence (jusqu'au corps décodé) alimente le calcul du délai de hedging.
+        En cas d'erreur HTTP ou de 304, le corps est lu tel quel et aucun contenu n'est décodé.
+        """
+        self._in_flight += 1
+        self._total_requests += 1
+        started = time.monotonic()
+        try:
+            headers = dict(headers or {})
+            if getattr(decoder, "accept", None):
+                headers["Accept"] = decoder.accept
+            request = client.build_request(method, endpoint, params=params, headers=headers or None,
+                                           json=data if method == "POST" else None)
+            response = await client.send(request, stream=True)
+            try:
+                if response.status_code >= 400 or response.status_code == 304:
+                    await response.aread()
+                    return response, None, 0
+                payload, size = await decoder(response)
+            finally:
+                await response.aclose()
+        finally:
+            self._in_flight -= 1
+        self._latencies.setdefault(endpoint, LatencyTracker()).record(time.monotonic() - started)
+        return response, payload, size
+    
+    def _hedge_delay(self, endpoint: str) -> float:
+        """Délai avant la requête dupliquée : p95 observé sur l'endpoint"""
+        tracker = self._latencies.get(endpoint)
+        if tracker is None or len(tracker) < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, tracker.percentile(95))
+    
+    async def _hedged_get(self, client: httpx.AsyncClient, endpoint: str, params: Optional[Dict],
+                          decoder: Callable, headers: Optional[Dict[str, str]] = None) -> Tuple[httpx.Response, Any, int]:
+        """
+        GET couvert : si la réponse tarde au-delà du p95, une seconde requête
+        identique part et la première réponse valide l'emporte
+        """
+        primary = asyncio.ensure_future(self._attempt(client, "GET", endpoint, params, None, decoder, headers))
+        done, _ = await asyncio.wait({primary}, timeout=self._hedge_delay(endpoint))
+        if done:
+            return primary.result()
+        
+        self._hedge_stats["hedged_requests"] += 1
+        secondary = asyncio.ensure_future(self._attempt(client, "GET", endpoint, params, None, decoder, headers))
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            self._hedge_stats["hedge_wins"] += 1
+                        return task.result()
+            # Les deux requêtes ont échoué : on remonte l'erreur de la première
+            return primary.result()
+        finally:
+            for task in (primary, secondary):
+                task.cancel()
+    
     async def test_connection(self) -> bool:
         """Teste la connexion avec l'API Express.js"""
         try:
-            response = await self._make_request("GET", "/api/donnees-historiques/features")
+            # Pas de cache : le test doit réellement joindre l'API Express.js
+            await self._make_request("GET", "/api/donnees-historiques/features", use_cache=False)
             logger.info("✅ Connexion à l'API Express.js réussie")
             return True
         except Exception as e:
@@ -132,6 +611,91 @@ class ExpressAPIClient:
             
         return await self._make_request("GET", "/api/donnees-historiques/rt", params=params)
     
+    @staticmethod
+    def _expected_rows(date_debut: Optional[str], date_fin: Optional[str]) -> int:
+        """Estimation du nombre de lignes journalières (préallocation des colonnes)"""
+        try:
+            start = date.fromisoformat(date_debut) if date_debut else date(2020, 1, 1)
+            end = date.fromisoformat(date_fin) if date_fin else date.today()
+            return max(1, (end - start).days + 1)
+        except ValueError:
+            return 1024
+    
+    async def get_mortality_rate_frame(self, pays: str, source: Optional[str] = None,
+                                       date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                       window: int = 7) -> pd.DataFrame:
+        """
+        Récupère le taux de mortalité sous forme de DataFrame colonnaire
+        (colonnes ``date``, ``mortality_rate`` ; ``meta`` dans ``frame.attrs``)
+        
+        Le format colonnaire MessagePack est négocié si
+        disponible ; sinon le tableau JSON ``data`` est décodé au fil de l'eau
+        dans des colonnes NumPy préallouées, sans liste de dictionnaires.
+        """
+        params = {
+            "pays": pays,
+            "window": window
+        }
+        
+        if source:
+            params["source"] = source
+        if date_debut:
+            params["dateDebut"] = date_debut
+        if date_fin:
+            params["dateFin"] = date_fin
+        
+        decoder = FrameResponseDecoder({"date": object, "mortality_rate": np.float64},
+                                       capacity=self._expected_rows(date_debut, date_fin),
+                                       accept=self._frame_accept)
+        return await self._make_request("GET", "/api/donnees-historiques/mortality-rate", params=params, decoder=decoder)
+    
+    async def get_rt_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                           date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                           window: int = 7) -> pd.DataFrame:
+        """Récupère les données Rt sous forme de DataFrame colonnaire (colonnes ``date``, ``Rt``)"""
+        params = {
+            "pays": pays,
+            "indicator": indicator,
+            "window": window
+        }
+        
+        if source:
+            params["source"] = source
+        if date_debut:
+            params["dateDebut"] = date_debut
+        if date_fin:
+            params["dateFin"] = date_fin
+        
+        decoder = FrameResponseDecoder({"date": object, "Rt": np.float64},
+                                       capacity=self._expected_rows(date_debut, date_fin),
+                                       accept=self._frame_accept)
+        return await self._make_request("GET", "/api/donnees-historiques/rt", params=params, decoder=decoder)
+    
+    async def get_daily_series_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                                     date_debut: Optional[str] = None,
+                                     date_fin: Optional[str] = None) -> pd.DataFrame:
+        """Série journalière moyenne (``/aggregation?operation=mean``), colonnes ``date``, ``value``"""
+        params = {
+            "pays": pays,
+            "indicator": indicator,
+            "operation": "mean"
+        }
+        
+        if source:
+            params["source"] = source
+        if date_debut:
+            params["dateDebut"] = date_debut
+        if date_fin:
+            params["dateFin"] = date_fin
+        
+        decoder = FrameResponseDecoder({"date": object, "mean": np.float64},
+                                       capacity=self._expected_rows(date_debut, date_fin),
+                                       accept=self._frame_accept)
+        frame = await self._make_request("GET", "/api/donnees-historiques/aggregation", params=params,
+                                         decoder=decoder)
+        # Nouveau DataFrame : celui du cache n'est pas modifié
+        return frame.rename(columns={"mean": "value"})
+    
     async def get_aggregation_data(self, pays: str, indicator: str, operation: str, 
                                   source: Optional[str] = None, date_debut: Optional[str] = None,
                                   date_fin: Optional[str] = None, window: int = 7) -> Dict[str, Any]:
@@ -188,8 +752,71 @@ class ExpressAPIClient:
         if date_fin:
             params["dateFin"] = date_fin
             
+        # Clusters déjà agrégés par Express.js ({clusters, meta}) : réponse courte, décodage JSON simple
         return await self._make_request("GET", "/api/donnees-historiques/geographic-spread", params=params)
     
     async def get_available_features(self) -> Dict[str, Any]:
         """Récupère la liste des features disponibles"""
-        return await self._make_request("GET", "/api/donnees-historiques/features") 
\ No newline at end of file
+        return await self._make_request("GET", "/api/donnees-historiques/features")
+    
+    async def _fetch_many(self, fetch: Callable[..., Awaitable[Dict[str, Any]]], countries: Iterable[str],
+                          concurrency: Optional[int] = None, **kwargs) -> AsyncIterator[CountryResult]:
+        """
+        Interroge ``fetch`` pour chaque pays avec une concurrence bornée
+        
+        Les résultats sont produits dans l'ordre de complétion. L'échec d'un
+        pays est isolé dans son ``CountryResult`` et n'interrompt pas les autres.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.bulk_concurrency)
+        
+        async def fetch_one(pays: str) -> CountryResult:
+            async with semaphore:
+                try:
+                    return CountryResult(pays, await fetch(pays=pays, **kwargs), None)
+                except Exception as e:
+                    logger.warning(f"⚠️ Échec de récupération pour {pays}: {e}")
+                    return CountryResult(pays, None, e)
+        
+        # dict.fromkeys : dédoublonnage en conservant l'ordre
+        tasks = [asyncio.ensure_future(fetch_one(pays)) for pays in dict.fromkeys(countries)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Arrêt anticipé de l'itération : on annule les requêtes restantes
+            for task in tasks:
+                task.cancel()
+    
+    def get_mortality_rate_many(self, countries: Iterable[str], source: Optional[str] = None,
+                                date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                window: int = 7, concurrency: Optional[int] = None) -> AsyncIterator[CountryResult]:
+        """Récupère le taux de mortalité de plusieurs pays (itérateur asynchrone)"""
+        return self._fetch_many(self.get_mortality_rate, countries, concurrency,
+                                source=source, date_debut=date_debut, date_fin=date_fin, window=window)
+    
+    def get_rt_data_many(self, countries: Iterable[str], indicator: str, source: Optional[str] = None,
+                         date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                         window: int = 7, concurrency: Optional[int] = None) -> AsyncIterator[CountryResult]:
+        """Récupère les données Rt de plusieurs pays (itérateur asynchrone)"""
+        return self._fetch_many(self.get_rt_data, countries, concurrency, indicator=indicator,
+                                source=source, date_debut=date_debut, date_fin=date_fin, window=window)
+    
+    def get_aggregation_data_many(self, countries: Iterable[str], indicator: str, operation: str,
+                                  source: Optional[str] = None, date_debut: Optional[str] = None,
+                                  date_fin: Optional[str] = None, window: int = 7,
+                                  concurrency: Optional[int] = None) -> AsyncIterator[CountryResult]:
+        """Récupère les données agrégées de plusieurs pays (itérateur asynchrone)"""
+        return self._fetch_many(self.get_aggregation_data, countries, concurrency, indicator=indicator,
+                                operation=operation, source=source, date_debut=date_debut,
+                                date_fin=date_fin, window=window)
+
+
+# Instance partagée par tout le processus (routes et application)
+_shared_client: Optional[ExpressAPIClient] = None
+
+def get_express_client() -> ExpressAPIClient:
+    """Retourne le client Express.js partagé par le processus"""
+    global _shared_client
+    if _shared_client is None:
+        _shared_client = ExpressAPIClient()
+    return _shared_client
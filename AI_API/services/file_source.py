@@ -0,0 +1,204 @@
+"""
+Source de données hors ligne : fichiers de faits produits par l'ETL
+
+Lit ``fact_*_history.csv`` (``ETL/processed``) sans API Express.js ni base
+de données, pour les traitements par lots et les benchmarks. Au chargement,
+les lignes sont agrégées par (pays, indicateur, source, date) et triées :
+chaque série est alors une tranche contiguë des colonnes NumPy, retrouvée en
+O(1) dans un index, puis bornée à la période demandée par recherche
+dichotomique.
+"""
+
+import asyncio
+import glob
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from services.data_source import DataSource, DataNotFoundError, growth_rt, make_frame, rolling_mortality_rate
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                "ETL", "processed")
+
+_COLUMNS = ["country", "date", "indicator", "value", "iso_code", "source"]
+
+SeriesKey = Tuple[str, str, str]
+
+
+class FileDataSource(DataSource):
+    """
+    Séries calculées localement à partir des fichiers de faits de l'ETL
+
+    Configuration : ``AI_DATA_DIR`` (répertoire des ``fact_*_history.csv``,
+    ``ETL/processed`` par défaut).
+    """
+
+    name = "file"
+
+    def __init__(self, data_dir: Optional[str] = None):
+        self.data_dir = data_dir or os.getenv("AI_DATA_DIR", DEFAULT_DATA_DIR)
+        self.files: List[str] = []
+
+        # Colonnes triées par (pays, indicateur, source, date), une ligne par date
+        self._dates: Optional[np.ndarray] = None
+        self._values: Optional[np.ndarray] = None
+        # (pays, indicateur, source) -> (début, fin) dans les colonnes
+        self._index: Dict[SeriesKey, Tuple[int, int]] = {}
+        self._iso_codes: Dict[str, str] = {}
+        self._load_lock = asyncio.Lock()
+        self._load_time: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Chargement et index
+    # ------------------------------------------------------------------
+
+    def _load(self) -> None:
+        started = time.monotonic()
+        files = sorted(glob.glob(os.path.join(self.data_dir, "fact_*_history.csv")))
+        if not files:
+            raise RuntimeError(f"Aucun fichier fact_*_history.csv dans {self.data_dir}")
+
+        frames = [
+            pd.read_csv(path, usecols=lambda c: c in _COLUMNS, parse_dates=["date"],
+                        dtype={"country": "category", "indicator": "category", "source": "category",
+                               "iso_code": "category", "value": "float64"})
+            for path in files
+        ]
+        facts = pd.concat(frames, ignore_index=True)
+        if "source" not in facts:
+            raise RuntimeError("Colonne 'source' absente des fichiers de faits")
+
+        # Moyenne par date, valeurs manquantes comptées à 0 (comme l'API Express.js)
+        facts["value"] = facts["value"].fillna(0.0)
+        keys = ["country", "indicator", "source"]
+        daily = (facts.groupby(keys + ["date"], sort=True, observed=True)["value"]
+                 .mean().reset_index())
+
+        # Bornes de chaque série : changements de clé entre lignes consécutives
+        key_columns = daily[keys].astype(str)
+        changes = (key_columns != key_columns.shift()).any(axis=1).to_numpy()
+        starts = np.flatnonzero(changes)
+        stops = np.append(starts[1:], len(daily))
+        self._index = {
+            tuple(key): (int(start), int(stop))
+            for key, start, stop in zip(key_columns.iloc[starts].itertuples(index=False, name=None), starts, stops)
+        }
+        self._dates = daily["date"].to_numpy(dtype="datetime64[ns]")
+        self._values = daily["value"].to_numpy(dtype=np.float64)
+
+        if "iso_code" in facts:
+            iso = facts.dropna(subset=["iso_code"]).groupby("country", observed=True)["iso_code"].first()
+            self._iso_codes = {str(country): str(code) for country, code in iso.items()}
+
+        self.files = files
+        self._load_time = time.monotonic() - started
+        logger.info(f"📁 {len(daily)} points / {len(self._index)} séries chargés depuis {self.data_dir} "
+                    f"en {self._load_time:.1f}s")
+
+    async def start(self) -> None:
+        """Charge les fichiers et construit l'index (hors de la boucle d'événements)"""
+        async with self._load_lock:
+            if self._values is None:
+                await asyncio.get_running_loop().run_in_executor(None, self._load)
+
+    async def test_connection(self) -> bool:
+        await self.start()
+        return True
+
+    def get_client_stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "data_dir": self.data_dir,
+            "files": [os.path.basename(path) for path in self.files],
+            "points": 0 if self._values is None else len(self._values),
+            "series": len(self._index),
+            "load_seconds": None if self._load_time is None else round(self._load_time, 3)
+        }
+
+    def _slice(self, key: SeriesKey, date_debut: Optional[str], date_fin: Optional[str]) -> Optional[slice]:
+        """Tranche de la série ``key`` restreinte à la période (None si absente)"""
+        bounds = self._index.get(key)
+        if bounds is None:
+            return None
+        start, stop = bounds
+        dates = self._dates[start:stop]
+        if date_debut:
+            start += int(np.searchsorted(dates, np.datetime64(date_debut, "ns"), side="left"))
+        if date_fin:
+            stop = bounds[0] + int(np.searchsorted(dates, np.datetime64(date_fin, "ns"), side="right"))
+        return slice(start, max(start, stop))
+
+    async def _series(self, pays: str, indicator: str, source: Optional[str],
+                      date_debut: Optional[str], date_fin: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        await self.start()
+        if source:
+            window = self._slice((pays, indicator, source), date_debut, date_fin)
+        else:
+            # Sans source : première source disponible pour ce pays et cet indicateur
+            window = next((self._slice(key, date_debut, date_fin) for key in self._index
+                           if key[0] == pays and key[1] == indicator), None)
+        if window is None or window.stop == window.start:
+            raise DataNotFoundError(f"Aucune donnée trouvée pour {pays} ({indicator}, {source})")
+        return self._dates[window], self._values[window]
+
+    # ------------------------------------------------------------------
+    # Séries
+    # ------------------------------------------------------------------
+
+    async def get_daily_series_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                                     date_debut: Optional[str] = None,
+                                     date_fin: Optional[str] = None) -> pd.DataFrame:
+        dates, values = await self._series(pays, indicator, source, date_debut, date_fin)
+        meta = {"pays": pays, "indicator": indicator, "source": source, "operation": "mean", "count": len(dates)}
+        return make_frame(dates, "value", values, meta)
+
+    async def get_mortality_rate_frame(self, pays: str, source: Optional[str] = None,
+                                       date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                       window: int = 7) -> pd.DataFrame:
+        case_dates, cases = await self._series(pays, "cases", source, date_debut, date_fin)
+        death_dates, deaths = await self._series(pays, "deaths", source, date_debut, date_fin)
+
+        # Alignement par date : une date absente d'une série compte pour 0
+        dates = np.union1d(case_dates, death_dates)
+        aligned_cases = np.zeros(len(dates))
+        aligned_deaths = np.zeros(len(dates))
+        aligned_cases[np.searchsorted(dates, case_dates)] = cases
+        aligned_deaths[np.searchsorted(dates, death_dates)] = deaths
+
+        meta = {"pays": pays, "source": source, "window": window, "count": len(dates)}
+        return make_frame(dates, "mortality_rate", rolling_mortality_rate(aligned_cases, aligned_deaths, window), meta)
+
+    async def get_rt_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                           date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                           window: int = 7) -> pd.DataFrame:
+        dates, values = await self._series(pays, indicator, source, date_debut, date_fin)
+        meta = {"pays": pays, "indicator": indicator, "source": source, "window": window,
+                "count": len(dates), "force_epsilon": True}
+        return make_frame(dates, "Rt", growth_rt(values, window), meta)
+
+    async def get_geographic_spread(self, indicator: str, source: Optional[str] = None,
+                                    date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                    k: int = 3) -> Dict[str, Any]:
+        """Séries par pays ; le clustering est fait côté IA (``cluster_countries``)"""
+        await self.start()
+        series = []
+        for key in self._index:
+            country, key_indicator, key_source = key
+            if key_indicator != indicator or (source and key_source != source) or country not in self._iso_codes:
+                continue
+            window = self._slice(key, date_debut, date_fin)
+            if window.stop > window.start:
+                series.append({"iso_code": self._iso_codes[country], "country": country,
+                               "values": self._values[window]})
+        if not series:
+            raise DataNotFoundError(f"Aucune donnée trouvée ({indicator}, {source})")
+        return {"series": series, "meta": {"indicator": indicator, "source": source, "k": k, "count": len(series)}}
@@ -0,0 +1,273 @@
+"""
+Tâches d'entraînement asynchrones (jobs)
+
+Un entraînement long (LSTM jusqu'à 100 époques) dépasse le délai des clients
+HTTP. ``POST /api/{mortality,rt}/jobs`` crée un job et répond immédiatement
+avec son identifiant ; ``GET .../jobs/{id}`` donne son état, sa progression
+(étape, époque, perte) puis son résultat ; ``DELETE .../jobs/{id}`` l'annule.
+
+Configuration :
+- ``ML_JOBS_WORKERS`` : jobs exécutés simultanément (les suivants attendent)
+- ``ML_JOBS_RESULT_TTL`` : durée de conservation d'un job terminé (secondes)
+- ``ML_JOBS_MAX`` : nombre maximal de jobs conservés (refus au-delà)
+
+La progression d'un job est publiée par le code qu'il exécute via
+``report_progress`` (no-op hors d'un job) et ``current_progress`` (objet
+passé aux boucles d'entraînement, qui y vérifient aussi l'annulation). Elle
+n'est disponible qu'avec l'exécuteur ML ``thread`` : en mode ``process``,
+seuls l'état et le résultat du job sont suivis.
+
+Un calcul partagé entre plusieurs requêtes (entraînement mis en commun par
+le registre de modèles) ne reçoit que ``JobProgress.report_only()`` : il
+publie la progression du job, mais l'annulation du job ne l'interrompt pas
+(les autres requêtes attendent son résultat, gardé en cache).
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class JobCancelledError(Exception):
+    """Levée dans la boucle d'entraînement quand son job a été annulé"""
+
+
+class JobLimitError(Exception):
+    """Trop de jobs conservés : la création est refusée"""
+
+
+class JobProgress:
+    """
+    Progression d'un job, partagée entre la boucle d'événements et le thread
+    d'entraînement (``update`` et ``check_cancelled`` sont thread-safe)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._values: Dict[str, Any] = {}
+
+    def update(self, **values: Any) -> None:
+        with self._lock:
+            self._values.update(values)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._values)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check_cancelled(self) -> None:
+        if self._cancelled.is_set():
+            raise JobCancelledError("Job annulé")
+
+    def report_only(self) -> "ProgressReport":
+        """Vue de publication seule, pour un calcul que l'annulation du job ne doit pas interrompre"""
+        return ProgressReport(self)
+
+
+class ProgressReport:
+    """Publie dans la progression d'un job sans jamais lever ``JobCancelledError``"""
+
+    def __init__(self, progress: JobProgress):
+        self._progress = progress
+
+    def update(self, **values: Any) -> None:
+        self._progress.update(**values)
+
+    def check_cancelled(self) -> None:
+        """Jamais annulé : d'autres requêtes peuvent attendre ce calcul"""
+
+
+_current_progress: contextvars.ContextVar[Optional[JobProgress]] = contextvars.ContextVar(
+    "current_job_progress", default=None
+)
+
+
+def current_progress() -> Optional[JobProgress]:
+    """Progression du job en cours d'exécution dans cette tâche asyncio (None hors job)"""
+    return _current_progress.get()
+
+
+def report_progress(**values: Any) -> None:
+    """Publie une étape de progression si l'appelant s'exécute dans un job"""
+    progress = _current_progress.get()
+    if progress is not None:
+        progress.update(**values)
+
+
+class Job:
+    """Un job : paramètres, état, progression, résultat ou erreur"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+    def __init__(self, kind: str, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.params = params
+        self.status = self.QUEUED
+        self.progress = JobProgress()
+        self.result: Any = None
+        self.error: Optional[Dict[str, Any]] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        def iso(timestamp: Optional[float]) -> Optional[str]:
+            return None if timestamp is None else time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+        data = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": self.progress.snapshot(),
+            "cancel_requested": self.progress.cancelled,
+            "created_at": iso(self.created_at),
+            "started_at": iso(self.started_at),
+            "finished_at": iso(self.finished_at),
+            "duration_seconds": None if self.started_at is None else
+            round((self.finished_at or time.time()) - self.started_at, 3)
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        if include_result and self.status == self.SUCCEEDED:
+            data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """Exécute les jobs en arrière-plan (au plus ``workers`` à la fois) et garde leurs résultats ``ttl`` secondes"""
+
+    def __init__(self, workers: Optional[int] = None, ttl: Optional[float] = None, max_jobs: Optional[int] = None):
+        self.workers = workers or int(os.getenv("ML_JOBS_WORKERS", 2))
+        self.ttl = ttl if ttl is not None else float(os.getenv("ML_JOBS_RESULT_TTL", 3600))
+        self.max_jobs = max_jobs or int(os.getenv("ML_JOBS_MAX", 1000))
+        self._jobs: Dict[str, Job] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.stats = {"submitted": 0, "succeeded": 0, "failed": 0, "cancelled": 0, "expired": 0, "rejected": 0}
+
+    def _purge(self) -> None:
+        """Oublie les jobs terminés depuis plus de ``ttl`` secondes"""
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self.stats["expired"] += len(expired)
+
+    def submit(self, kind: str, params: Dict[str, Any], run: Callable[[], Awaitable[Any]]) -> Job:
+        """Crée un job exécutant ``run()`` en arrière-plan (à appeler depuis la boucle d'événements)"""
+        self._purge()
+        if len(self._jobs) >= self.max_jobs:
+            self.stats["rejected"] += 1
+            raise JobLimitError(f"Trop de jobs en cours ou conservés ({len(self._jobs)}) : réessayer plus tard")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        job = Job(kind, params)
+        self._jobs[job.id] = job
+        self.stats["submitted"] += 1
+        job._task = asyncio.create_task(self._execute(job, run), name=f"job-{job.id}")
+        logger.info(f"📥 Job {kind} {job.id} créé")
+        return job
+
+    async def _execute(self, job: Job, run: Callable[[], Awaitable[Any]]) -> None:
+        _current_progress.set(job.progress)
+        try:
+            async with self._slots:
+                job.progress.check_cancelled()
+                job.status = Job.RUNNING
+                job.started_at = time.time()
+                job.result = await run()
+            job.status = Job.SUCCEEDED
+        except (asyncio.CancelledError, JobCancelledError):
+            job.status = Job.CANCELLED
+        except HTTPException as e:
+            job.status = Job.FAILED
+            job.error = {"status_code": e.status_code, "detail": e.detail}
+        except Exception as e:
+            logger.error(f"❌ Job {job.kind} {job.id} en échec: {e}")
+            job.status = Job.FAILED
+            job.error = {"status_code": 500, "detail": str(e)}
+        finally:
+            job.finished_at = time.time()
+            if job.status in Job.FINISHED:
+                self.stats[job.status] += 1
+            logger.info(f"📤 Job {job.kind} {job.id} terminé: {job.status}")
+
+    def get(self, job_id: str, kind: Optional[str] = None) -> Optional[Job]:
+        self._purge()
+        job = self._jobs.get(job_id)
+        if job is None or (kind is not None and job.kind != kind):
+            return None
+        return job
+
+    def cancel(self, job_id: str, kind: Optional[str] = None) -> Optional[Job]:
+        """
+        Annule un job : un job en attente ne démarre pas ; un entraînement en
+        cours qui reçoit sa progression (``current_progress``) s'arrête à la fin
+        de l'époque ou du lot courant, un calcul partagé (``report_only``) va à
+        son terme sans le job
+        """
+        job = self.get(job_id, kind)
+        if job is None or job.finished:
+            return job
+        job.progress.cancel()
+        if job._task is not None:
+            job._task.cancel()
+        return job
+
+    async def aclose(self) -> None:
+        """Annule les jobs en cours (arrêt de l'API)"""
+        tasks = [job._task for job in self._jobs.values() if job._task is not None and not job.finished]
+        for job in self._jobs.values():
+            job.progress.cancel()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        by_status: Dict[str, int] = {}
+        for job in self._jobs.values():
+            by_status[job.status] = by_status.get(job.status, 0) + 1
+        return {**self.stats, "workers": self.workers, "ttl": self.ttl, "jobs": by_status}
+
+
+_shared_manager: Optional[JobManager] = None
+
+
+def get_job_manager() -> JobManager:
+    """Retourne le gestionnaire de jobs partagé par le processus"""
+    global _shared_manager
+    if _shared_manager is None:
+        _shared_manager = JobManager()
+    return _shared_manager
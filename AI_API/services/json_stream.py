@@ -0,0 +1,241 @@
+"""
+Décodage JSON incrémental des réponses volumineuses de l'API Express.js
+
+Les réponses ont la forme ``{"data": [ {...}, {...} ], "meta": {...}}``.
+Plutôt que de bufferiser tout le corps puis de construire une liste de
+dictionnaires, on décode le tableau élément par élément au fil des octets
+reçus et on écrit chaque ligne directement dans des colonnes NumPy.
+"""
+
+import codecs
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from services import columnar
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStream:
+    """
+    Décodeur incrémental d'un objet JSON dont une clé contient un grand tableau.
+
+    ``feed`` reçoit les octets au fil de l'eau et retourne les éléments du
+    tableau ``array_key`` complètement reçus. Les autres clés de premier
+    niveau (ex. ``meta``) sont décodées entières dans ``extras``.
+    """
+
+    def __init__(self, array_key: str = "data"):
+        self.array_key = array_key
+        self.extras: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Ajoute des octets et retourne les éléments du tableau désormais complets"""
+        self._buf = self._buf[self._pos:] + self._text_decoder.decode(chunk, final)
+        self._pos = 0
+        items: List[Any] = []
+        self._parse(items, final)
+        if final and not self.done:
+            raise ValueError("Réponse JSON incomplète ou invalide")
+        return items
+
+    def _skip_whitespace(self) -> bool:
+        """Avance jusqu'au prochain caractère significatif ; False si le buffer est épuisé"""
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _decode_value(self, final: bool):
+        """Décode une valeur complète à la position courante, ou retourne None si incomplète"""
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Réponse JSON invalide")
+            return None
+        # Un nombre en fin de buffer peut être tronqué : on attend la suite
+        if end == len(self._buf) and not final and self._buf[self._pos] in "-0123456789":
+            return None
+        self._pos = end
+        return (value,)
+
+    def _parse(self, items: List[Any], final: bool) -> None:
+        while self._state != "done" and self._skip_whitespace():
+            char = self._buf[self._pos]
+            state = self._state
+
+            if state == "start":
+                if char != "{":
+                    raise ValueError("Objet JSON attendu")
+                self._pos += 1
+                self._state = "key_or_end"
+
+            elif state == "key_or_end":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                    continue
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    return
+                self._key = decoded[0]
+                self._state = "colon"
+
+            elif state == "colon":
+                if char != ":":
+                    raise ValueError("':' attendu dans l'objet JSON")
+                self._pos += 1
+                self._state = "value"
+
+            elif state == "value":
+                if self._key == self.array_key and char == "[":
+                    self._pos += 1
+                    self._state = "item_or_end"
+                    continue
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    return
+                self.extras[self._key] = decoded[0]
+                self._state = "comma_or_end"
+
+            elif state == "item_or_end":
+                if char == "]":
+                    self._pos += 1
+                    self._state = "comma_or_end"
+                    continue
+                decoded = self._decode_value(final)
+                if decoded is None:
+                    return
+                items.append(decoded[0])
+                self._state = "item_separator"
+
+            elif state == "item_separator":
+                self._pos += 1
+                if char == ",":
+                    self._state = "item_or_end"
+                elif char == "]":
+                    self._state = "comma_or_end"
+                else:
+                    raise ValueError("',' ou ']' attendu dans le tableau JSON")
+
+            elif state == "comma_or_end":
+                self._pos += 1
+                if char == ",":
+                    self._state = "key_or_end"
+                elif char == "}":
+                    self._state = "done"
+                else:
+                    raise ValueError("',' ou '}' attendu dans l'objet JSON")
+
+
+class ColumnBuffer:
+    """
+    Colonnes NumPy préallouées remplies ligne à ligne.
+
+    La capacité initiale est une estimation (ex. nombre de jours de la
+    période demandée) ; elle double si elle est dépassée.
+    """
+
+    def __init__(self, columns: Dict[str, Any], capacity: int = 1024):
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self._capacity = max(1, capacity)
+        self._size = 0
+        self._arrays = {name: self._empty(dtype, self._capacity) for name, dtype in self.dtypes.items()}
+
+    @staticmethod
+    def _empty(dtype: np.dtype, capacity: int) -> np.ndarray:
+        if dtype.kind == "f":
+            return np.full(capacity, np.nan, dtype=dtype)
+        return np.empty(capacity, dtype=dtype)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for name, array in self._arrays.items():
+            grown = self._empty(array.dtype, self._capacity)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+
+    def append(self, row: Dict[str, Any]) -> None:
+        if self._size == self._capacity:
+            self._grow()
+        index = self._size
+        for name, array in self._arrays.items():
+            value = row.get(name)
+            if value is None:
+                if array.dtype.kind != "f":
+                    array[index] = None
+            else:
+                array[index] = value
+        self._size += 1
+
+    def finalize(self) -> Dict[str, np.ndarray]:
+        """Retourne les colonnes remplies (vues sans copie, sauf capacité très surestimée)"""
+        if self._size < self._capacity // 2:
+            return {name: array[:self._size].copy() for name, array in self._arrays.items()}
+        return {name: array[:self._size] for name, array in self._arrays.items()}
+
+
+# ----------------------------------------------------------------------
+# Décodeurs de réponses HTTP (utilisés par ExpressAPIClient)
+# ----------------------------------------------------------------------
+
+class JSONResponseDecoder:
+    """Décodage classique : corps complet puis ``json.loads``"""
+
+    name = "json"
+
+    async def __call__(self, response) -> Tuple[Any, int]:
+        body = await response.aread()
+        return json.loads(body), len(body)
+
+
+class FrameResponseDecoder:
+    """
+    Décode le tableau ``data`` au fil de l'eau vers un ``pd.DataFrame`` colonnaire.
+
+    Les autres clés (``meta``...) sont placées dans ``frame.attrs``.
+    """
+
+    def __init__(self, columns: Dict[str, Any], capacity: int = 1024, array_key: str = "data",
+                 accept: Optional[str] = None):
+        self.columns = columns
+        self.capacity = capacity
+        self.array_key = array_key
+        # En-tête Accept proposant les formats colonnaires binaires (voir services.columnar)
+        self.accept = accept
+        self.name = "frame:" + ",".join(columns)
+
+    async def __call__(self, response) -> Tuple[pd.DataFrame, int]:
+        mime = columnar.media_type(response.headers.get("content-type"))
+        if mime == columnar.MSGPACK_TYPE:
+            frame = columnar.decode_msgpack_frame(await response.aread(), self.columns)
+            return frame, int(frame.memory_usage(deep=True).sum())
+
+        stream = JSONArrayStream(self.array_key)
+        buffer = ColumnBuffer(self.columns, self.capacity)
+        async for chunk in response.aiter_bytes():
+            for row in stream.feed(chunk):
+                buffer.append(row)
+        for row in stream.feed(b"", final=True):
+            buffer.append(row)
+        frame = pd.DataFrame(buffer.finalize(), copy=False)
+        frame.attrs.update(stream.extras)
+        return frame, int(frame.memory_usage(deep=True).sum())
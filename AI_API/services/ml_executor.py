@@ -0,0 +1,170 @@
+"""
+Exécuteur des calculs ML (entraînement et inférence)
+
+Les routes sont ``async`` : un ``fit`` Random Forest ou LSTM exécuté
+directement bloquerait la boucle d'événements, donc ``/health``, les autres
+requêtes et les appels Express.js en cours. Tous les calculs de modèles
+passent par cet exécuteur et les routes attendent leur résultat.
+
+Configuration :
+- ``ML_EXECUTOR`` : ``thread`` (défaut ; scikit-learn et TensorFlow relâchent
+  le GIL pendant les calculs) ou ``process``
+- ``ML_EXECUTOR_WORKERS`` : nombre de workers (défaut : min(4, CPU))
+- ``ML_EXECUTOR_MAX_QUEUE`` : tâches en attente au-delà des workers ; au-delà,
+  la tâche est refusée (``ExecutorSaturatedError``, 503 côté routes)
+
+En mode ``process``, la fonction, ses arguments et son résultat sont copiés
+(pickle) : une tâche doit retourner tout ce dont l'appelant a besoin (par
+exemple le prédicteur entraîné), les modifications faites sur ses arguments
+dans le worker étant perdues.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+from services.resilience import LatencyTracker
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """File d'attente de l'exécuteur ML pleine : la tâche est refusée immédiatement"""
+
+
+def _timed_call(func: Callable[..., Any], args: tuple, kwargs: dict) -> tuple:
+    """Exécute ``func`` dans le worker et retourne ``(résultat, début, fin)`` (horloge murale)"""
+    started = time.time()
+    result = func(*args, **kwargs)
+    return result, started, time.time()
+
+
+class MLExecutor:
+    """Pool de workers borné pour les calculs ML, avec temps d'attente et d'exécution"""
+
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __init__(self, kind: Optional[str] = None, workers: Optional[int] = None, max_queue: Optional[int] = None):
+        self.kind = (kind or os.getenv("ML_EXECUTOR", self.THREAD)).lower()
+        if self.kind not in (self.THREAD, self.PROCESS):
+            raise ValueError(f"Exécuteur ML inconnu: {self.kind} (attendu: thread, process)")
+        self.workers = workers or int(os.getenv("ML_EXECUTOR_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue if max_queue is not None else int(os.getenv("ML_EXECUTOR_MAX_QUEUE", 16))
+
+        self._pool: Optional[Executor] = None
+        # Tâches acceptées et pas encore terminées (en attente + en cours)
+        self._in_flight = 0
+        self._wait_times = LatencyTracker()
+        self._run_times = LatencyTracker()
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "max_in_flight": 0
+        }
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == self.PROCESS:
+                # spawn : pas de fork d'un processus multi-thread (TensorFlow, httpx)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ml-worker")
+            logger.info(f"🧵 Exécuteur ML {self.kind} démarré ({self.workers} workers, file de {self.max_queue})")
+        return self._pool
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+    def _on_done(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Appelé depuis le worker : le compteur n'est modifié que dans la boucle
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # Boucle déjà fermée (arrêt du processus)
+            self._in_flight = max(0, self._in_flight - 1)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Exécute ``func(*args, **kwargs)`` dans un worker sans bloquer la boucle
+
+        Lève ``ExecutorSaturatedError`` si la file est pleine. Une tâche dont
+        l'appelant est annulé va tout de même à son terme et occupe sa place
+        dans la file jusque-là.
+        """
+        if self._in_flight >= self.capacity:
+            self.stats["rejected"] += 1
+            raise ExecutorSaturatedError(
+                f"Exécuteur ML saturé ({self._in_flight} tâches, capacité {self.capacity}) : réessayer plus tard"
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted = time.time()
+        future = self._get_pool().submit(_timed_call, func, args, kwargs)
+        self._in_flight += 1
+        self.stats["submitted"] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        # La place est libérée à la fin réelle de la tâche, même si l'appelant a abandonné
+        future.add_done_callback(lambda _: self._on_done(loop))
+
+        try:
+            result, started, finished = await asyncio.wrap_future(future)
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+
+        self.stats["completed"] += 1
+        self._wait_times.record(max(0.0, started - submitted))
+        self._run_times.record(finished - started)
+        return result
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+    @staticmethod
+    def _timings_ms(tracker: LatencyTracker) -> Dict[str, Optional[float]]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(1000 * value, 2)
+        return {"p50": ms(tracker.percentile(50)), "p95": ms(tracker.percentile(95)),
+                "max": ms(tracker.percentile(100))}
+
+    def get_stats(self) -> Dict[str, Any]:
+        running = min(self._in_flight, self.workers)
+        return {
+            **self.stats,
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": self._in_flight - running,
+            "queue_wait_ms": self._timings_ms(self._wait_times),
+            "execution_ms": self._timings_ms(self._run_times)
+        }
+
+
+_shared_executor: Optional[MLExecutor] = None
+
+
+def get_ml_executor() -> MLExecutor:
+    """Retourne l'exécuteur ML partagé par le processus"""
+    global _shared_executor
+    if _shared_executor is None:
+        _shared_executor = MLExecutor()
+    return _shared_executor
@@ -0,0 +1,221 @@
+"""
+Source de données PostgreSQL directe (sans passer par l'API Express.js)
+
+Interroge la table ``donnee_historique`` (schéma Prisma de l'API Express.js)
+avec un pool de connexions ``asyncpg``. Les agrégations journalières et le
+taux de mortalité glissant sont calculés par le serveur SQL ; seul le Rt est
+dérivé en NumPy de la série journalière.
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from services.data_source import DataSource, DataNotFoundError, growth_rt, make_frame
+
+try:
+    import asyncpg
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    asyncpg = None
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+# Filtres communs : paramètres optionnels à NULL = pas de filtre
+_PERIOD_FILTER = "($%d::timestamp IS NULL OR date >= $%d::timestamp) AND ($%d::timestamp IS NULL OR date <= $%d::timestamp)"
+
+
+def _period(first: int) -> str:
+    return _PERIOD_FILTER % (first, first, first + 1, first + 1)
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+class PostgresDataSource(DataSource):
+    """
+    Lecture directe de la base PostgreSQL de l'API Express.js
+
+    Configuration :
+    - ``AI_DATABASE_URL`` (ou ``DATABASE_URL``, partagé avec Prisma)
+    - ``AI_PG_POOL_MIN`` / ``AI_PG_POOL_MAX`` : taille du pool
+    - ``AI_PG_COMMAND_TIMEOUT`` : délai maximal d'une requête (secondes)
+    - ``AI_PG_TABLE`` : table des données historiques
+    """
+
+    name = "postgres"
+
+    def __init__(self, dsn: Optional[str] = None, table: Optional[str] = None):
+        self.dsn = dsn or os.getenv("AI_DATABASE_URL") or os.getenv("DATABASE_URL")
+        self.table = table or os.getenv("AI_PG_TABLE", "donnee_historique")
+        if not _IDENTIFIER.match(self.table):
+            raise ValueError(f"Nom de table invalide: {self.table}")
+        self.min_size = int(os.getenv("AI_PG_POOL_MIN", 1))
+        self.max_size = int(os.getenv("AI_PG_POOL_MAX", 10))
+        self.command_timeout = float(os.getenv("AI_PG_COMMAND_TIMEOUT", 60))
+
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+        self._queries = 0
+        self._query_time = 0.0
+
+    # ------------------------------------------------------------------
+    # Cycle de vie du pool
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Crée le pool de connexions (appelé par le lifespan FastAPI)"""
+        if asyncpg is None:
+            raise RuntimeError("Le backend postgres nécessite le paquet 'asyncpg'")
+        if not self.dsn:
+            raise RuntimeError("AI_DATABASE_URL (ou DATABASE_URL) doit être défini pour le backend postgres")
+        async with self._pool_lock:
+            if self._pool is None:
+                self._pool = await asyncpg.create_pool(
+                    self.dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    command_timeout=self.command_timeout
+                )
+                logger.info(f"🐘 Pool PostgreSQL ouvert ({self.min_size}-{self.max_size} connexions)")
+
+    async def aclose(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def _fetch(self, query: str, *args) -> List[Any]:
+        if self._pool is None:
+            await self.start()
+        started = time.monotonic()
+        try:
+            return await self._pool.fetch(query, *args)
+        finally:
+            self._queries += 1
+            self._query_time += time.monotonic() - started
+
+    async def test_connection(self) -> bool:
+        await self._fetch("SELECT 1")
+        logger.info("✅ Connexion à PostgreSQL réussie")
+        return True
+
+    def get_client_stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        return {
+            "backend": self.name,
+            "pool": {
+                "size": pool.get_size() if pool else 0,
+                "idle": pool.get_idle_size() if pool else 0,
+                "min_size": self.min_size,
+                "max_size": self.max_size
+            },
+            "queries": self._queries,
+            "avg_query_ms": round(1000 * self._query_time / self._queries, 2) if self._queries else None
+        }
+
+    # ------------------------------------------------------------------
+    # Séries
+    # ------------------------------------------------------------------
+
+    async def _daily_series(self, pays: str, indicator: str, source: Optional[str],
+                            date_debut: Optional[str], date_fin: Optional[str]) -> List[Any]:
+        # Moyenne par date, valeurs manquantes comptées à 0 (comme groupByDateAndAggregate)
+        query = f"""
+            SELECT date, AVG(COALESCE(value, 0)) AS value
+            FROM {self.table}
+            WHERE country = $1 AND indicator = $2
+              AND ($3::text IS NULL OR source = $3)
+              AND {_period(4)}
+            GROUP BY date
+            ORDER BY date
+        """
+        rows = await self._fetch(query, pays, indicator, source, _parse_date(date_debut), _parse_date(date_fin))
+        if not rows:
+            raise DataNotFoundError(f"Aucune donnée trouvée pour {pays} ({indicator}, {source})")
+        return rows
+
+    async def get_daily_series_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                                     date_debut: Optional[str] = None,
+                                     date_fin: Optional[str] = None) -> pd.DataFrame:
+        rows = await self._daily_series(pays, indicator, source, date_debut, date_fin)
+        meta = {"pays": pays, "indicator": indicator, "source": source, "operation": "mean", "count": len(rows)}
+        return make_frame([r["date"] for r in rows], "value", [r["value"] for r in rows], meta)
+
+    async def get_mortality_rate_frame(self, pays: str, source: Optional[str] = None,
+                                       date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                       window: int = 7) -> pd.DataFrame:
+        # Somme glissante des moyennes journalières de décès / cas, calculée par le serveur
+        query = f"""
+            WITH daily AS (
+                SELECT date,
+                       AVG(COALESCE(value, 0)) FILTER (WHERE indicator = 'cases') AS cases,
+                       AVG(COALESCE(value, 0)) FILTER (WHERE indicator = 'deaths') AS deaths
+                FROM {self.table}
+                WHERE country = $1 AND indicator IN ('cases', 'deaths')
+                  AND ($2::text IS NULL OR source = $2)
+                  AND {_period(3)}
+                GROUP BY date
+            ), rolling AS (
+                SELECT date,
+                       SUM(COALESCE(cases, 0)) OVER w AS sum_cases,
+                       SUM(COALESCE(deaths, 0)) OVER w AS sum_deaths,
+                       ROW_NUMBER() OVER (ORDER BY date) AS n
+                FROM daily
+                WINDOW w AS (ORDER BY date ROWS BETWEEN $5::int PRECEDING AND CURRENT ROW)
+            )
+            SELECT date,
+                   CASE WHEN n >= $6::int AND sum_cases <> 0 THEN sum_deaths / sum_cases END AS mortality_rate
+            FROM rolling
+            ORDER BY date
+        """
+        rows = await self._fetch(query, pays, source, _parse_date(date_debut), _parse_date(date_fin),
+                                 window - 1, window)
+        if not rows:
+            raise DataNotFoundError(f"Aucune donnée trouvée pour {pays} ({source})")
+        meta = {"pays": pays, "source": source, "window": window, "count": len(rows)}
+        return make_frame([r["date"] for r in rows], "mortality_rate",
+                          [np.nan if r["mortality_rate"] is None else r["mortality_rate"] for r in rows], meta)
+
+    async def get_rt_frame(self, pays: str, indicator: str, source: Optional[str] = None,
+                           date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                           window: int = 7) -> pd.DataFrame:
+        rows = await self._daily_series(pays, indicator, source, date_debut, date_fin)
+        values = np.fromiter((r["value"] for r in rows), dtype=np.float64, count=len(rows))
+        meta = {"pays": pays, "indicator": indicator, "source": source, "window": window,
+                "count": len(rows), "force_epsilon": True}
+        return make_frame([r["date"] for r in rows], "Rt", growth_rt(values, window), meta)
+
+    async def get_geographic_spread(self, indicator: str, source: Optional[str] = None,
+                                    date_debut: Optional[str] = None, date_fin: Optional[str] = None,
+                                    k: int = 3) -> Dict[str, Any]:
+        """Séries par pays ; le clustering est fait côté IA (``cluster_countries``)"""
+        query = f"""
+            SELECT iso_code, MAX(country) AS country,
+                   array_agg(COALESCE(value, 0) ORDER BY date) AS values
+            FROM {self.table}
+            WHERE indicator = $1 AND iso_code IS NOT NULL
+              AND ($2::text IS NULL OR source = $2)
+              AND {_period(3)}
+            GROUP BY iso_code
+            ORDER BY iso_code
+        """
+        rows = await self._fetch(query, indicator, source, _parse_date(date_debut), _parse_date(date_fin))
+        if not rows:
+            raise DataNotFoundError(f"Aucune donnée trouvée ({indicator}, {source})")
+        series = [
+            {"iso_code": r["iso_code"], "country": r["country"], "values": np.asarray(r["values"], dtype=np.float64)}
+            for r in rows
+        ]
+        return {"series": series, "meta": {"indicator": indicator, "source": source, "k": k, "count": len(series)}}
@@ -0,0 +1,119 @@
+"""
+Mécanismes de résilience pour l'appel de l'API Express.js
+(disjoncteur et suivi de latence pour les requêtes couvertes)
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Levée quand le disjoncteur est ouvert : l'appel échoue immédiatement"""
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états.
+
+    - ``closed`` : les appels passent ; ``failure_threshold`` échecs
+      consécutifs ouvrent le circuit.
+    - ``open`` : les appels échouent immédiatement pendant ``recovery_timeout``
+      secondes.
+    - ``half_open`` : au plus ``half_open_max_calls`` appels de test passent ;
+      un succès referme le circuit, un échec le rouvre ; un appel annulé
+      (``release``) libère sa place sans verdict.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._half_open_calls = 0
+
+        self.transitions: Dict[str, int] = {}
+        self.rejected_calls = 0
+
+    def _transition(self, new_state: str) -> None:
+        transition = f"{self.state}->{new_state}"
+        self.transitions[transition] = self.transitions.get(transition, 0) + 1
+        logger.warning(f"⚡ Disjoncteur {self.name}: {transition}")
+        self.state = new_state
+        if new_state == self.OPEN:
+            self.opened_at = time.monotonic()
+        if new_state == self.HALF_OPEN:
+            self._half_open_calls = 0
+
+    def before_call(self) -> None:
+        """Vérifie qu'un appel peut partir, sinon lève ``CircuitOpenError``"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self._transition(self.HALF_OPEN)
+            else:
+                self.rejected_calls += 1
+                raise CircuitOpenError(f"Circuit {self.name} ouvert : API Express.js indisponible")
+        if self.state == self.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.rejected_calls += 1
+                raise CircuitOpenError(f"Circuit {self.name} en test : appel refusé")
+            self._half_open_calls += 1
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN:
+            self._transition(self.OPEN)
+        elif self.state == self.CLOSED and self.consecutive_failures >= self.failure_threshold:
+            self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """Appel interrompu sans réponse (annulation) : libère son créneau de test"""
+        if self.state == self.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "rejected_calls": self.rejected_calls,
+            "transitions": dict(self.transitions)
+        }
+
+
+class LatencyTracker:
+    """Fenêtre glissante des latences observées (en secondes)"""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+
+    def record(self, duration: float) -> None:
+        self._samples.append(duration)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        return float(np.percentile(np.fromiter(self._samples, dtype=float), q))
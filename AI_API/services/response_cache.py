@@ -0,0 +1,243 @@
+"""
+Cache à deux niveaux des réponses de l'API Express.js
+(LRU en mémoire borné en octets + stockage SQLite persistant optionnel)
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Marqueur d'absence (une réponse peut légitimement valoir None)
+MISSING = object()
+
+
+class ResponseCache:
+    """
+    Cache des réponses indexé par une clé (endpoint + paramètres normalisés).
+
+    - Niveau 1 : LRU en mémoire, borné par un budget en octets.
+    - Niveau 2 : base SQLite sous ``cache_dir`` (optionnelle), qui survit
+      aux redémarrages. Les entrées y sont également bornées en octets.
+
+    Un ``ttl`` à ``None`` signifie que l'entrée n'expire jamais
+    (données historiques d'une période entièrement passée). Une entrée
+    expirée n'est pas supprimée : ``lookup`` la retourne comme périmée pour
+    permettre sa revalidation (GET conditionnel), jusqu'à son éviction LRU.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, cache_dir: Optional[str] = None,
+                 disk_max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.cache_dir = cache_dir
+
+        # clé -> (valeur, taille, expiration)
+        self._memory: "OrderedDict[str, Tuple[Any, int, Optional[float]]]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.open()
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "disk_evictions": 0
+        }
+
+    def open(self) -> None:
+        """Ouvre (ou crée) la base SQLite du cache persistant, si configurée"""
+        if not self.cache_dir or self._db is not None:
+            return
+        cache_dir = self.cache_dir
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._db = sqlite3.connect(os.path.join(cache_dir, "responses.sqlite3"), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+            self._db.commit()
+            logger.info(f"💾 Cache persistant des réponses Express.js : {cache_dir}")
+        except Exception as e:
+            logger.warning(f"⚠️ Cache persistant indisponible ({cache_dir}): {e}")
+            self._db = None
+
+    # ------------------------------------------------------------------
+    # Niveau mémoire
+    # ------------------------------------------------------------------
+
+    def _memory_get(self, key: str) -> Tuple[Any, bool]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return MISSING, False
+        value, size, expires_at = entry
+        self._memory.move_to_end(key)
+        return value, expires_at is None or expires_at > time.time()
+
+    def _memory_set(self, key: str, value: Any, size: int, expires_at: Optional[float]) -> None:
+        if size > self.max_bytes:
+            return
+        self._memory_remove(key)
+        self._memory[key] = (value, size, expires_at)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_bytes and self._memory:
+            evicted_key, _ = next(iter(self._memory.items()))
+            self._memory_remove(evicted_key)
+            self.stats["evictions"] += 1
+
+    def _memory_remove(self, key: str) -> None:
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+    # ------------------------------------------------------------------
+    # Niveau disque (appelé dans un thread pour ne pas bloquer la boucle)
+    # ------------------------------------------------------------------
+
+    def _disk_get(self, key: str) -> Tuple[Any, int, Optional[float]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, size, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return MISSING, 0, None
+            blob, size, expires_at = row
+            self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return pickle.loads(blob), size, expires_at
+
+    def _disk_set(self, key: str, value: Any, size: int, expires_at: Optional[float]) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), expires_at, time.time())
+            )
+            # Éviction LRU sous le budget disque
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            while total > self.disk_max_bytes:
+                oldest = self._db.execute(
+                    "SELECT key, size FROM responses ORDER BY last_access ASC LIMIT 1"
+                ).fetchone()
+                if oldest is None:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (oldest[0],))
+                total -= oldest[1]
+                self.stats["disk_evictions"] += 1
+            self._db.commit()
+
+    def _disk_refresh(self, key: str, expires_at: Optional[float]) -> None:
+        with self._db_lock:
+            self._db.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                             (expires_at, time.time(), key))
+            self._db.commit()
+
+    def _disk_clear(self) -> None:
+        with self._db_lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+
+    async def lookup(self, key: str) -> Tuple[Any, bool]:
+        """
+        Retourne ``(valeur, fraîche)`` ; ``(MISSING, False)`` si la clé est absente
+
+        Une valeur expirée est retournée avec ``fraîche=False`` (à revalider).
+        """
+        value, fresh = self._memory_get(key)
+        if value is MISSING and self._db is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                value, size, expires_at = await loop.run_in_executor(None, self._disk_get, key)
+            except Exception as e:
+                logger.warning(f"⚠️ Lecture du cache persistant impossible: {e}")
+                value = MISSING
+            if value is not MISSING:
+                fresh = expires_at is None or expires_at > time.time()
+                if fresh:
+                    self.stats["disk_hits"] += 1
+                # Promotion dans le niveau mémoire
+                self._memory_set(key, value, size, expires_at)
+        elif value is not MISSING and fresh:
+            self.stats["memory_hits"] += 1
+
+        if value is MISSING:
+            self.stats["misses"] += 1
+        elif not fresh:
+            self.stats["expired"] += 1
+        return value, fresh
+
+    async def get(self, key: str) -> Any:
+        """Retourne la valeur en cache si elle est fraîche, sinon ``MISSING``"""
+        value, fresh = await self.lookup(key)
+        return value if fresh else MISSING
+
+    async def refresh(self, key: str, ttl: Optional[float]) -> None:
+        """Prolonge une entrée revalidée (réponse 304) sans réécrire sa valeur"""
+        expires_at = None if ttl is None else time.time() + ttl
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory[key] = (entry[0], entry[1], expires_at)
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._disk_refresh, key, expires_at)
+            except Exception as e:
+                logger.warning(f"⚠️ Écriture du cache persistant impossible: {e}")
+
+    async def set(self, key: str, value: Any, size: int, ttl: Optional[float]) -> None:
+        """Stocke une valeur (``ttl=None`` : pas d'expiration)"""
+        expires_at = None if ttl is None else time.time() + ttl
+        self._memory_set(key, value, size, expires_at)
+
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._disk_set, key, value, size, expires_at)
+            except Exception as e:
+                logger.warning(f"⚠️ Écriture du cache persistant impossible: {e}")
+
+    async def clear(self) -> None:
+        """Vide les deux niveaux du cache"""
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self._db is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._disk_clear)
+
+    def close(self) -> None:
+        """Ferme la base SQLite du cache persistant"""
+        if self._db is not None:
+            with self._db_lock:
+                self._db.close()
+            self._db = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs hit/miss/éviction et occupation du cache"""
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"] + self.stats["expired"]
+        return {
+            **self.stats,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_bytes": self.max_bytes,
+            "disk_enabled": self._db is not None
+        }
@@ -0,0 +1,9 @@
+"""
+Configuration commune des tests de l'API IA
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter la racine de l'API IA au path pour importer services/, models/, routes/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,75 @@
+"""
+Tests du transport colonnaire (MessagePack) avec repli JSON
+"""
+
+import asyncio
+
+import httpx
+import msgpack
+import numpy as np
+
+from services import columnar
+from services.express_client import ExpressAPIClient
+
+
+DATES = ["2021-01-0%dT00:00:00.000Z" % (i + 1) for i in range(4)]
+RATES = [0.01, None, 0.03, 0.04]
+META = {"pays": "France", "count": 4}
+
+
+def msgpack_body() -> bytes:
+    return msgpack.packb({"columns": {"date": DATES, "mortality_rate": RATES}, "meta": META})
+
+
+def fetch_frame(handler, monkeypatch, transport="auto"):
+    monkeypatch.setenv("API_EXPRESS_TRANSPORT", transport)
+
+    async def scenario():
+        client = ExpressAPIClient(base_url="http://express.test", transport=httpx.MockTransport(handler))
+        frame = await client.get_mortality_rate_frame(pays="France", source="covid",
+                                                      date_debut="2021-01-01", date_fin="2021-01-04")
+        await client.aclose()
+        return frame
+
+    return asyncio.run(scenario())
+
+
+def assert_expected_frame(frame):
+    assert list(frame.columns) == ["date", "mortality_rate"]
+    assert frame["mortality_rate"].dtype == np.float64
+    assert np.isnan(frame["mortality_rate"].iloc[1])
+    assert frame["mortality_rate"].iloc[3] == 0.04
+    assert list(frame["date"]) == DATES
+    assert frame.attrs["meta"] == META
+
+
+def test_accept_header_offers_only_formats_served_by_express():
+    header = columnar.build_accept_header(columnar.available_formats("auto"))
+    assert header == f"{columnar.MSGPACK_TYPE}, application/json;q=0.1"
+    assert header.endswith("application/json;q=0.1")
+    assert columnar.available_formats("json") == [columnar.JSON_TYPE]
+
+
+def test_msgpack_frame(monkeypatch):
+    """Réponse MessagePack colonnaire (format servi par l'API Express.js)"""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["accept"])
+        return httpx.Response(200, content=msgpack_body(), headers={"content-type": columnar.MSGPACK_TYPE})
+
+    assert_expected_frame(fetch_frame(handler, monkeypatch, transport="msgpack"))
+    assert seen[0].startswith(columnar.MSGPACK_TYPE)
+
+
+def test_json_fallback(monkeypatch):
+    """Un serveur ne connaissant que JSON reste servi par le décodage en streaming"""
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["accept"])
+        rows = [{"date": d, "mortality_rate": r} for d, r in zip(DATES, RATES)]
+        return httpx.Response(200, json={"data": rows, "meta": META})
+
+    assert_expected_frame(fetch_frame(handler, monkeypatch))
+    assert columnar.MSGPACK_TYPE in seen[0]
@@ -0,0 +1,45 @@
+"""
+Tests de l'interface DataSource et des calculs partagés par les backends
+"""
+
+import numpy as np
+import pytest
+
+from services.data_source import DataSource, create_data_source, growth_rt, rolling_mortality_rate
+from services.express_client import ExpressAPIClient
+
+
+def test_express_is_default_backend(monkeypatch):
+    monkeypatch.delenv("AI_DATA_BACKEND", raising=False)
+    source = create_data_source()
+    assert isinstance(source, ExpressAPIClient)
+    assert isinstance(source, DataSource)
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        create_data_source("sqlite")
+
+
+def test_rolling_mortality_rate_matches_loop():
+    """Même définition que /mortality-rate : sommes glissantes décès / cas"""
+    cases = np.array([10, 0, 20, np.nan, 30, 0, 0, 0], dtype=float)
+    deaths = np.array([1, 0, 2, 1, 3, 0, 0, 0], dtype=float)
+    window = 3
+    rate = rolling_mortality_rate(cases, deaths, window)
+    for i in range(len(cases)):
+        if i < window - 1:
+            assert np.isnan(rate[i])
+            continue
+        sum_cases = np.nansum(cases[i - window + 1:i + 1])
+        sum_deaths = np.nansum(deaths[i - window + 1:i + 1])
+        expected = sum_deaths / sum_cases if sum_cases else np.nan
+        np.testing.assert_equal(rate[i], expected)
+
+
+def test_growth_rt_uses_epsilon_for_zero_past():
+    values = np.array([0.0, 2.0, 4.0, 8.0])
+    rt = growth_rt(values, window=1)
+    assert np.isnan(rt[0])
+    assert rt[1] == pytest.approx(2.0 / 0.1)
+    assert rt[3] == pytest.approx(2.0)
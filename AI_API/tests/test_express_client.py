@@ -0,0 +1,339 @@
+"""
+Tests du client HTTP vers l'API Express.js
+"""
+
+import asyncio
+
+import httpx
+
+from services.express_client import ExpressAPIClient
+
+
+def make_client(handler) -> ExpressAPIClient:
+    """Crée un client dont le transport est simulé par ``handler``"""
+    return ExpressAPIClient(base_url="http://express.test", transport=httpx.MockTransport(handler))
+
+
+def test_shared_client_is_reused():
+    """Toutes les requêtes passent par le même httpx.AsyncClient"""
+    def handler(request):
+        return httpx.Response(200, json={"data": [], "meta": {}})
+
+    async def scenario():
+        client = make_client(handler)
+        await client.start()
+        first = client._client
+        await client.get_mortality_rate(pays="France", source="covid")
+        await client.get_rt_data(pays="France", indicator="cases", source="covid")
+        assert client._client is first
+        stats = client.get_pool_stats()
+        assert stats["open"] is True
+        assert stats["total_requests"] == 2
+        assert stats["in_flight"] == 0
+        await client.aclose()
+        assert client.get_pool_stats()["open"] is False
+
+    asyncio.run(scenario())
+
+
+def test_client_opens_lazily():
+    """Sans lifespan, le pool est ouvert à la première requête"""
+    def handler(request):
+        assert request.url.path == "/api/donnees-historiques/features"
+        return httpx.Response(200, json={"features": []})
+
+    async def scenario():
+        client = make_client(handler)
+        assert client._client is None
+        assert await client.get_available_features() == {"features": []}
+        assert client._client is not None
+        await client.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_identical_requests_are_coalesced():
+    """Des GET identiques concurrents ne déclenchent qu'un seul appel à Express"""
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"data": [{"date": "2024-01-01", "mortality_rate": 0.01}]})
+
+    async def scenario():
+        client = make_client(handler)
+        results = await asyncio.gather(*[
+            client.get_mortality_rate(pays="France", source="covid", date_debut="2020-01-01")
+            for _ in range(10)
+        ])
+        other = await client.get_mortality_rate(pays="Italy", source="covid", date_debut="2020-01-01")
+        await client.aclose()
+        return results, other
+
+    results, other = asyncio.run(scenario())
+    assert len(calls) == 2
+    assert all(r == results[0] for r in results)
+    assert other["data"][0]["mortality_rate"] == 0.01
+
+
+def test_past_range_is_served_from_cache(tmp_path, monkeypatch):
+    """Une période entièrement passée n'est téléchargée qu'une fois, même après redémarrage"""
+    monkeypatch.setenv("API_EXPRESS_CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, json={"data": [{"date": "2021-01-01", "Rt": 1.1}]})
+
+    async def scenario():
+        params = dict(pays="France", indicator="cases", source="covid",
+                      date_debut="2020-01-01", date_fin="2021-12-31")
+        client = make_client(handler)
+        first = await client.get_rt_data(**params)
+        assert await client.get_rt_data(**params) == first
+        stats = client.get_client_stats()["cache"]
+        await client.aclose()
+
+        # Nouveau processus simulé : le niveau mémoire est vide, le disque répond
+        restarted = make_client(handler)
+        assert await restarted.get_rt_data(**params) == first
+        restarted_stats = restarted.get_client_stats()["cache"]
+        await restarted.aclose()
+        return stats, restarted_stats
+
+    stats, restarted_stats = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert stats["memory_hits"] == 1 and stats["misses"] == 1
+    assert restarted_stats["disk_hits"] == 1
+
+
+def test_cache_evicts_least_recently_used():
+    """Le niveau mémoire respecte son budget en octets"""
+    from services.response_cache import ResponseCache, MISSING
+
+    async def scenario():
+        cache = ResponseCache(max_bytes=100)
+        await cache.set("a", 1, size=40, ttl=None)
+        await cache.set("b", 2, size=40, ttl=None)
+        await cache.get("a")
+        await cache.set("c", 3, size=40, ttl=None)
+        return cache, await cache.get("a"), await cache.get("b")
+
+    cache, a, b = asyncio.run(scenario())
+    assert a == 1
+    assert b is MISSING
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_many_countries_bounded_and_isolated():
+    """Les récupérations multi-pays respectent la limite et isolent les échecs"""
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if request.url.params["pays"] == "Atlantis":
+            return httpx.Response(404, json={"error": "Aucune donnée trouvée"})
+        return httpx.Response(200, json={"data": [], "meta": {"pays": request.url.params["pays"]}})
+
+    async def scenario():
+        client = make_client(handler)
+        client.max_retries = 1
+        countries = ["France", "Italy", "Spain", "Atlantis", "Germany", "Chad"]
+        results = [r async for r in client.get_mortality_rate_many(countries, source="covid", concurrency=2)]
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert peak <= 2
+    assert len(results) == 6
+    failed = [r for r in results if r.error is not None]
+    assert [r.pays for r in failed] == ["Atlantis"]
+    assert all(r.data["meta"]["pays"] == r.pays for r in results if r.error is None)
+
+
+def test_circuit_opens_and_fails_fast():
+    """Après N échecs consécutifs, les appels échouent sans toucher le réseau"""
+    from services.resilience import CircuitOpenError
+    calls = []
+
+    def handler(request):
+        calls.append(1)
+        raise httpx.ConnectError("connexion refusée")
+
+    async def scenario():
+        client = make_client(handler)
+        client.retry_delay = 0
+        client.circuit_breaker.failure_threshold = 3
+        client.circuit_breaker.recovery_timeout = 60
+        try:
+            await client.get_available_features()
+        except Exception:
+            pass
+        try:
+            await client.get_mortality_rate(pays="France", source="covid")
+        except CircuitOpenError:
+            fast_failed = True
+        else:
+            fast_failed = False
+        await client.aclose()
+        return client, fast_failed
+
+    client, fast_failed = asyncio.run(scenario())
+    assert fast_failed
+    assert len(calls) == 3
+    stats = client.get_client_stats()["circuit_breaker"]
+    assert stats["state"] == "open"
+    assert stats["transitions"] == {"closed->open": 1}
+
+
+def test_circuit_half_open_probe_closes_circuit():
+    """Un appel de test réussi referme le circuit"""
+    from services.resilience import CircuitBreaker
+
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_half_open_probe_releases_its_slot():
+    """Un appel de test annulé ne laisse pas le circuit refuser tous les appels suivants"""
+    gate = asyncio.Event()
+
+    async def handler(request):
+        if not gate.is_set():
+            await asyncio.sleep(60)
+        return httpx.Response(200, json={"features": []})
+
+    async def scenario():
+        client = make_client(handler)
+        breaker = client.circuit_breaker
+        breaker.failure_threshold, breaker.recovery_timeout = 1, 0
+        breaker.record_failure()
+        # Appel direct : un appelant des méthodes publiques ne fait que quitter la requête partagée
+        probe = asyncio.create_task(client._send_request("GET", "/api/features"))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+        gate.set()
+        await client.get_available_features()
+        await client.aclose()
+        return breaker.state
+
+    assert asyncio.run(scenario()) == "closed"
+
+
+def test_hedged_request_first_answer_wins():
+    """Une requête lente est doublée et la réponse la plus rapide est retenue"""
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={"features": ["slow"]})
+        return httpx.Response(200, json={"features": ["fast"]})
+
+    async def scenario():
+        client = make_client(handler)
+        client.hedging_enabled = True
+        client.hedge_initial_delay = 0.05
+        result = await client.get_available_features()
+        await client.aclose()
+        return client, result
+
+    client, result = asyncio.run(scenario())
+    assert result == {"features": ["fast"]}
+    hedging = client.get_client_stats()["hedging"]
+    assert hedging["hedged_requests"] == 1 and hedging["hedge_wins"] == 1
+
+
+def test_expired_entry_is_revalidated_with_304(monkeypatch):
+    """Une entrée expirée est revalidée par un GET conditionnel, sans retélécharger le corps"""
+    monkeypatch.setenv("API_EXPRESS_CACHE_TTL_POLICIES", "rt=0")
+    requests = []
+
+    def handler(request):
+        requests.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == 'W/"v1-rt"':
+            return httpx.Response(304, headers={"etag": 'W/"v1-rt"', "x-data-version": "v1"})
+        return httpx.Response(200, json={"data": [{"date": "2024-01-01", "Rt": 1.2}]},
+                              headers={"etag": 'W/"v1-rt"', "x-data-version": "v1"})
+
+    async def scenario():
+        client = make_client(handler)
+        first = await client.get_rt_data(pays="France", indicator="cases", source="covid")
+        second = await client.get_rt_data(pays="France", indicator="cases", source="covid")
+        stats = client.get_client_stats()["conditional"]
+        await client.aclose()
+        return first, second, stats
+
+    first, second, stats = asyncio.run(scenario())
+    assert requests == [None, 'W/"v1-rt"']
+    assert second == first
+    assert stats["not_modified"] == 1
+    assert stats["data_version"] == "v1"
+
+
+def test_data_version_change_invalidates_cache():
+    """Un nouveau jeton de version vide le cache des réponses"""
+    state = {"version": "v1"}
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/data-version"):
+            return httpx.Response(200, json={"version": state["version"]})
+        return httpx.Response(200, json={"data": [{"date": "2024-01-01", "mortality_rate": 0.01}]},
+                              headers={"x-data-version": state["version"]})
+
+    async def scenario():
+        client = make_client(handler)
+
+        await client.get_mortality_rate(pays="France", source="covid")
+        await client.get_mortality_rate(pays="France", source="covid")
+        state["version"] = "v2"
+        await client.check_data_version()
+        await client.get_mortality_rate(pays="France", source="covid")
+        stats = client.get_client_stats()["conditional"]
+        await client.aclose()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats["data_version_changes"] == 1 and stats["data_version"] == "v2"
+    assert calls.count("/api/donnees-historiques/mortality-rate") == 2
+
+
+def test_spread_route_leaves_cached_clusters_untouched(monkeypatch):
+    """La route relaie les clusters d'Express.js sans modifier la réponse partagée du cache"""
+    from routes import spread_routes
+
+    def handler(request):
+        return httpx.Response(200, json={"clusters": [{"cluster": 0, "countries": ["FRA"]}],
+                                         "meta": {"k": 2}})
+
+    async def scenario():
+        client = make_client(handler)
+        monkeypatch.setattr(spread_routes, "data_source", client)
+        first = await spread_routes.predict_spread(indicator="cases", source="covid", k=2)
+        second = await spread_routes.predict_spread(indicator="cases", source="covid", k=2)
+        cached = await client.get_geographic_spread("cases", source="covid", k=2)
+        await client.aclose()
+        return first, second, cached
+
+    first, second, cached = asyncio.run(scenario())
+    assert first["meta"] == second["meta"] == {"k": 2, "clustering_location": "express"}
+    assert cached["meta"] == {"k": 2}
@@ -0,0 +1,83 @@
+"""
+Tests du backend fichiers (faits de l'ETL)
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.data_source import DataNotFoundError, create_data_source, growth_rt, rolling_mortality_rate
+from services.file_source import FileDataSource
+
+DATES = pd.date_range("2021-01-01", periods=10, freq="D")
+CASES = [100.0, 120.0, np.nan, 150.0, 160.0, 0.0, 180.0, 200.0, 210.0, 220.0]
+DEATHS = [1.0, 2.0, 2.0, 3.0, np.nan, 4.0, 4.0, 5.0, 6.0, 6.0]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Fichiers au format de 03_transform.py (lignes non triées, doublon de date)"""
+    rows = []
+    for day, cases, deaths in zip(DATES, CASES, DEATHS):
+        rows.append(("France", day, "cases", cases, "FRA", "covid"))
+        rows.append(("France", day, "deaths", deaths, "FRA", "covid"))
+        rows.append(("Italy", day, "cases", 2 * np.nan_to_num(cases), "ITA", "covid"))
+    covid = pd.DataFrame(rows, columns=["country", "date", "indicator", "value", "iso_code", "source"])
+    covid = pd.concat([covid.iloc[::-1], covid.iloc[:1].assign(value=300.0)])
+    covid.to_csv(tmp_path / "fact_covid_history.csv", index=False)
+    mpox = pd.DataFrame({"country": "France", "date": DATES[:3], "indicator": "cases",
+                         "value": [1.0, 2.0, 3.0], "iso_code": "FRA", "source": "mpox"})
+    mpox.to_csv(tmp_path / "fact_mpox_history.csv", index=False)
+    return tmp_path
+
+
+def test_series_slices_by_key_and_period(data_dir):
+    source = FileDataSource(str(data_dir))
+
+    async def scenario():
+        daily = await source.get_daily_series_frame("France", "cases", source="covid",
+                                                    date_debut="2021-01-02", date_fin="2021-01-05")
+        mpox = await source.get_daily_series_frame("France", "cases", source="mpox")
+        first = await source.get_daily_series_frame("France", "cases", source="covid", date_fin="2021-01-01")
+        return daily, mpox, first
+
+    daily, mpox, first = asyncio.run(scenario())
+    assert list(daily["value"]) == [120.0, 0.0, 150.0, 160.0]
+    assert list(mpox["value"]) == [1.0, 2.0, 3.0]
+    # Doublon (pays, date, indicateur) : moyenne des valeurs
+    assert list(first["value"]) == [200.0]
+    assert source.get_client_stats()["series"] == 4
+
+
+def test_mortality_and_rt_match_reference(data_dir):
+    source = FileDataSource(str(data_dir))
+
+    async def scenario():
+        mortality = await source.get_mortality_rate_frame("France", source="covid", window=3)
+        rt = await source.get_rt_frame("France", "cases", source="covid", date_debut="2021-01-02", window=2)
+        return mortality, rt
+
+    mortality, rt = asyncio.run(scenario())
+    cases = np.array(CASES)
+    cases[0] = 200.0
+    np.testing.assert_allclose(mortality["mortality_rate"], rolling_mortality_rate(cases, np.array(DEATHS), 3))
+    np.testing.assert_allclose(rt["Rt"], growth_rt(np.nan_to_num(cases[1:]), 2))
+    assert pd.api.types.is_datetime64_any_dtype(rt["date"])
+
+
+def test_not_found_and_spread(data_dir, monkeypatch):
+    monkeypatch.setenv("AI_DATA_DIR", str(data_dir))
+    source = create_data_source("file")
+
+    async def scenario():
+        with pytest.raises(DataNotFoundError):
+            await source.get_rt_frame("Atlantis", "cases", source="covid")
+        with pytest.raises(DataNotFoundError):
+            await source.get_rt_frame("France", "cases", source="covid", date_debut="2022-01-01")
+        return await source.get_geographic_spread("cases", source="covid")
+
+    spread = asyncio.run(scenario())
+    assert isinstance(source, FileDataSource)
+    assert sorted(s["iso_code"] for s in spread["series"]) == ["FRA", "ITA"]
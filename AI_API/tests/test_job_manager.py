@@ -0,0 +1,138 @@
+"""
+Tests des jobs de prédiction asynchrones
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+
+from services.job_manager import Job, JobManager, current_progress, report_progress
+from services.ml_executor import MLExecutor
+
+
+def fake_training(progress, epochs=50):
+    """Boucle d'entraînement factice publiant sa progression comme le callback Keras"""
+    for epoch in range(epochs):
+        time.sleep(0.01)
+        progress.update(epoch=epoch + 1, epochs=epochs, loss=1.0 / (epoch + 1))
+        progress.check_cancelled()
+    return {"epochs": epochs}
+
+
+def test_job_reports_progress_and_result():
+    manager = JobManager(workers=1, ttl=60)
+    executor = MLExecutor(kind="thread", workers=1, max_queue=0)
+
+    async def predict():
+        report_progress(stage="training")
+        return await executor.run(fake_training, current_progress(), 5)
+
+    async def scenario():
+        job = manager.submit("rt", {"pays": "France"}, predict)
+        assert job.status == Job.QUEUED
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        return job.to_dict()
+
+    data = asyncio.run(scenario())
+    executor.shutdown()
+    assert data["status"] == "succeeded"
+    assert data["result"] == {"epochs": 5}
+    assert data["progress"]["stage"] == "training"
+    assert data["progress"]["epoch"] == 5 and data["progress"]["loss"] == 0.2
+
+
+def test_cancel_stops_running_training():
+    manager = JobManager(workers=1, ttl=60)
+    executor = MLExecutor(kind="thread", workers=1, max_queue=1)
+
+    async def predict():
+        return await executor.run(fake_training, current_progress(), 500)
+
+    async def scenario():
+        running = manager.submit("rt", {}, predict)
+        queued = manager.submit("rt", {}, predict)
+        while running.progress.snapshot().get("epoch", 0) < 2:
+            await asyncio.sleep(0.01)
+        manager.cancel(queued.id)
+        manager.cancel(running.id)
+        await asyncio.sleep(0.05)
+        # La boucle d'entraînement s'est arrêtée : la place de l'exécuteur est libérée
+        while executor.get_stats()["running"]:
+            await asyncio.sleep(0.01)
+        return running, queued
+
+    running, queued = asyncio.run(scenario())
+    executor.shutdown()
+    assert running.status == queued.status == Job.CANCELLED
+    assert queued.started_at is None
+    assert running.progress.snapshot()["epoch"] < 500
+    assert manager.get_stats()["cancelled"] == 2
+
+
+def test_failed_job_keeps_http_error_and_expires_after_ttl():
+    manager = JobManager(workers=2, ttl=0.05)
+
+    async def predict():
+        raise HTTPException(status_code=400, detail="Données insuffisantes")
+
+    async def scenario():
+        job = manager.submit("mortality", {}, predict)
+        await asyncio.sleep(0.01)
+        snapshot = job.to_dict()
+        await asyncio.sleep(0.1)
+        return job, snapshot
+
+    job, snapshot = asyncio.run(scenario())
+    assert snapshot["status"] == "failed"
+    assert snapshot["error"] == {"status_code": 400, "detail": "Données insuffisantes"}
+    assert manager.get(job.id) is None
+    assert manager.get_stats()["expired"] == 1
+
+
+def test_cancelled_job_does_not_fail_a_request_sharing_its_training(monkeypatch):
+    from models.model_registry import ModelRegistry
+    from routes import rt_routes
+
+    executor = MLExecutor(kind="thread", workers=2, max_queue=2)
+    trainings = []
+
+    async def rt_frame(**kwargs):
+        return pd.DataFrame({"date": pd.date_range("2021-01-01", periods=120).astype(str),
+                             "Rt": 1 + 0.1 * np.sin(np.arange(120) / 9)})
+
+    def fit_model(X, y, feature_names, progress, mode):
+        trainings.append(progress)
+        return type("Trained", (), {"accuracy_metrics": {}, "training": fake_training(progress, 30)})()
+
+    monkeypatch.setattr(rt_routes.data_source, "get_rt_frame", rt_frame)
+    monkeypatch.setattr(rt_routes, "fit_model", fit_model)
+    monkeypatch.setattr(rt_routes, "forecast_model", lambda trained, X, horizon: np.ones(horizon))
+    registry = ModelRegistry("rt_test", registry_dir="", executor=executor)
+    monkeypatch.setattr(rt_routes, "rt_model_registry", registry)
+    params = {"pays": "France", "indicator": "cases", "source": "covid", "horizon": 3,
+              "reference_date": "2021-05-01", "engine": "lstm", "mode": "full"}
+    manager = JobManager(workers=1, ttl=60)
+
+    async def scenario():
+        job = manager.submit("rt", params, lambda: rt_routes.predict_rt(**params))
+        while job.progress.snapshot().get("epoch", 0) < 2:
+            await asyncio.sleep(0.01)
+        # Requête directe sur le même modèle : elle attend l'entraînement lancé par le job
+        direct = asyncio.create_task(rt_routes.predict_rt(**params))
+        await asyncio.sleep(0.02)
+        manager.cancel(job.id)
+        response = await direct
+        while not job.finished:
+            await asyncio.sleep(0.01)
+        return job, response, await rt_routes.predict_rt(**params)
+
+    job, response, cached = asyncio.run(scenario())
+    executor.shutdown()
+    assert job.status == Job.CANCELLED
+    assert len(trainings) == 1 and job.progress.snapshot()["epoch"] == 30
+    assert len(response["predictions"]) == 3
+    assert cached["metadata"]["model"]["model_cached"] and len(trainings) == 1
@@ -0,0 +1,65 @@
+"""
+Tests du décodage JSON incrémental
+"""
+
+import asyncio
+import json
+
+import httpx
+import numpy as np
+
+from services.json_stream import ColumnBuffer, JSONArrayStream
+from services.express_client import ExpressAPIClient
+
+
+PAYLOAD = {
+    "data": [
+        {"date": "2021-01-0%dT00:00:00.000Z" % (i + 1), "mortality_rate": None if i == 2 else 0.0125 * i}
+        for i in range(6)
+    ],
+    "meta": {"pays": "Côte d'Ivoire", "window": 7, "count": 6}
+}
+
+
+def test_stream_matches_json_loads_for_any_chunking():
+    """Le résultat ne dépend pas du découpage des octets reçus"""
+    body = json.dumps(PAYLOAD, ensure_ascii=False).encode("utf-8")
+    for chunk_size in (1, 2, 3, 7, 64, len(body)):
+        stream = JSONArrayStream("data")
+        items = []
+        for start in range(0, len(body), chunk_size):
+            items.extend(stream.feed(body[start:start + chunk_size]))
+        items.extend(stream.feed(b"", final=True))
+        assert items == PAYLOAD["data"]
+        assert stream.extras == {"meta": PAYLOAD["meta"]}
+
+
+def test_column_buffer_grows_beyond_capacity():
+    """Les colonnes doublent de capacité et les valeurs nulles deviennent NaN"""
+    buffer = ColumnBuffer({"date": object, "Rt": np.float64}, capacity=2)
+    for i in range(5):
+        buffer.append({"date": f"d{i}", "Rt": None if i == 1 else float(i)})
+    columns = buffer.finalize()
+    assert list(columns["date"]) == ["d0", "d1", "d2", "d3", "d4"]
+    assert np.isnan(columns["Rt"][1])
+    assert columns["Rt"][4] == 4.0
+
+
+def test_client_returns_columnar_frame():
+    """Le client décode /mortality-rate en DataFrame colonnaire"""
+    def handler(request):
+        return httpx.Response(200, json=PAYLOAD)
+
+    async def scenario():
+        client = ExpressAPIClient(base_url="http://express.test", transport=httpx.MockTransport(handler))
+        frame = await client.get_mortality_rate_frame(pays="France", source="covid",
+                                                      date_debut="2021-01-01", date_fin="2021-01-06")
+        await client.aclose()
+        return frame
+
+    frame = asyncio.run(scenario())
+    assert list(frame.columns) == ["date", "mortality_rate"]
+    assert len(frame) == 6
+    assert frame["mortality_rate"].dtype == np.float64
+    assert frame["mortality_rate"].isna().sum() == 1
+    assert frame.attrs["meta"]["count"] == 6
@@ -0,0 +1,73 @@
+"""
+Tests de l'exécuteur des calculs ML
+"""
+
+import asyncio
+import operator
+import time
+
+import pytest
+
+from services.ml_executor import ExecutorSaturatedError, MLExecutor
+
+
+def test_cpu_task_does_not_block_event_loop():
+    executor = MLExecutor(kind="thread", workers=1, max_queue=0)
+
+    async def scenario():
+        ticks = []
+
+        async def heartbeat():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        beat = asyncio.create_task(heartbeat())
+        result = await executor.run(lambda: time.sleep(0.2) or 42)
+        beat.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(scenario())
+    executor.shutdown()
+    assert result == 42
+    # La boucle a continué à tourner pendant les 200 ms de calcul
+    assert len(ticks) >= 10
+    stats = executor.get_stats()
+    assert stats["completed"] == 1
+    assert stats["execution_ms"]["max"] >= 190
+
+
+def test_bounded_queue_rejects_and_reports_wait_time():
+    executor = MLExecutor(kind="thread", workers=1, max_queue=1)
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(time.sleep, 0.1))
+        second = asyncio.ensure_future(executor.run(time.sleep, 0.1))
+        await asyncio.sleep(0)
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(time.sleep, 0.1)
+        await asyncio.gather(first, second)
+        # Les places sont libérées : une nouvelle tâche est acceptée
+        return await executor.run(operator.add, 1, 2)
+
+    assert asyncio.run(scenario()) == 3
+    executor.shutdown()
+    stats = executor.get_stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 3
+    assert stats["queued"] == 0 and stats["running"] == 0
+    # La deuxième tâche a attendu la fin de la première
+    assert stats["queue_wait_ms"]["max"] >= 80
+
+
+def test_process_executor_runs_picklable_tasks():
+    executor = MLExecutor(kind="process", workers=1, max_queue=2)
+
+    async def scenario():
+        return await asyncio.gather(executor.run(operator.mul, 6, 7), executor.run(pow, 2, 10))
+
+    try:
+        assert asyncio.run(scenario()) == [42, 1024]
+    finally:
+        executor.shutdown()
+    assert executor.get_stats()["failed"] == 0
@@ -0,0 +1,122 @@
+"""
+Tests du registre persistant de modèles
+"""
+
+import asyncio
+import os
+import time
+
+import numpy as np
+
+from models.model_registry import ModelRegistry, fingerprint_arrays
+from models.mortality_model import MortalityPredictor
+
+
+def test_concurrent_requests_train_once(tmp_path):
+    registry = ModelRegistry("test", registry_dir=str(tmp_path))
+    trainings = []
+
+    def train():
+        trainings.append(1)
+        time.sleep(0.05)
+        return {"weights": [1, 2, 3]}
+
+    async def scenario():
+        return await asyncio.gather(*[registry.get_or_train("k", train) for _ in range(8)])
+
+    results = asyncio.run(scenario())
+    assert len(trainings) == 1
+    assert all(artifact == {"weights": [1, 2, 3]} for artifact, _ in results)
+    assert registry.get_stats()["coalesced"] == 7
+
+
+def test_models_survive_restart_and_respect_disk_budget(tmp_path):
+    X = np.random.default_rng(0).random((60, 8))
+    y = X[:, 3] * 0.5
+    key = ModelRegistry.make_key(pays="France", source="covid", data=fingerprint_arrays(X, y))
+
+    async def first_process():
+        registry = ModelRegistry("mortality", registry_dir=str(tmp_path))
+        predictor, hit = await registry.get_or_train(key, lambda: MortalityPredictor().fit(X, y))
+        return predictor.predict_future(X, 3), hit
+
+    async def second_process():
+        registry = ModelRegistry("mortality", registry_dir=str(tmp_path))
+        predictor, hit = await registry.get_or_train(key, lambda: (_ for _ in ()).throw(AssertionError("réentraîné")))
+        return predictor.predict_future(X, 3), hit, registry
+
+    expected, first_hit = asyncio.run(first_process())
+    predictions, second_hit, registry = asyncio.run(second_process())
+    assert not first_hit and second_hit
+    np.testing.assert_array_equal(predictions, expected)
+    assert registry.get_stats()["disk_hits"] == 1
+
+    # Budget disque plus petit qu'un modèle : le plus ancien est évincé
+    small = ModelRegistry("mortality", registry_dir=str(tmp_path), max_bytes=1)
+    asyncio.run(small.get_or_train("other", lambda: {"x": 1}))
+    assert not os.path.exists(os.path.join(small.registry_dir, key + ".joblib"))
+
+
+def test_key_depends_on_training_data():
+    X = np.ones((5, 2))
+    y = np.zeros(5)
+    base = ModelRegistry.make_key(pays="France", data=fingerprint_arrays(X, y))
+    assert base == ModelRegistry.make_key(pays="France", data=fingerprint_arrays(X.copy(), y.copy()))
+    y[-1] = 1.0
+    assert base != ModelRegistry.make_key(pays="France", data=fingerprint_arrays(X, y))
+
+
+def test_latest_model_of_a_lineage_survives_restart(tmp_path):
+    async def first_process():
+        registry = ModelRegistry("lineage", registry_dir=str(tmp_path))
+        assert await registry.get_latest("france") is None
+        await registry.get_or_train("v1", lambda: {"version": 1}, lineage="france")
+        await registry.get_or_train("v2", lambda: {"version": 2}, lineage="france")
+        return await registry.get_latest("france")
+
+    async def second_process():
+        registry = ModelRegistry("lineage", registry_dir=str(tmp_path))
+        return await registry.get_latest("france"), await registry.get_latest("italie")
+
+    assert asyncio.run(first_process()) == {"version": 2}
+    assert asyncio.run(second_process()) == ({"version": 2}, None)
+
+
+def test_memory_tier_is_bounded_in_bytes():
+    class Artifact:
+        def __init__(self, nbytes):
+            self.nbytes = nbytes
+
+    registry = ModelRegistry("sized", registry_dir="", memory_items=10, memory_bytes=100)
+
+    async def scenario():
+        for key, size in (("a", 40), ("b", 40), ("c", 40)):
+            await registry.get_or_train(key, lambda size=size: Artifact(size))
+        # Le plus ancien est évincé pour rester sous 100 octets
+        assert list(registry._memory) == ["b", "c"]
+        # Un modèle plus gros que le budget reste seul en mémoire
+        await registry.get_or_train("d", lambda: Artifact(150))
+        assert list(registry._memory) == ["d"]
+
+    asyncio.run(scenario())
+    stats = registry.get_stats()
+    assert stats["memory_bytes"] == 150 and stats["max_memory_bytes"] == 100
+    assert stats["evictions"] == 3
+
+
+def test_disk_eviction_drops_lineage_pointers_and_tracks_bytes(tmp_path):
+    registry = ModelRegistry("pointers", registry_dir=str(tmp_path))
+
+    async def scenario():
+        await registry.get_or_train("v1", lambda: {"version": 1}, lineage="france")
+        registry.max_bytes = registry.get_stats()["disk_bytes"]
+        registry._memory.clear()
+        # Le budget ne garde que le dernier modèle : v1 et son pointeur disparaissent
+        await registry.get_or_train("w1", lambda: {"version": 1}, lineage="italie")
+        return await registry.get_latest("france"), await registry.get_latest("italie")
+
+    assert asyncio.run(scenario()) == (None, {"version": 1})
+    assert sorted(os.listdir(registry.registry_dir)) == ["italie.latest", "w1.joblib"]
+    stats = registry.get_stats()
+    assert stats["disk_bytes"] == registry.disk_usage() > 0
+    assert stats["disk_evictions"] == 1 and stats["lineages"] == 1
@@ -0,0 +1,152 @@
+"""
+Tests du modèle de mortalité (stratégies de prévision)
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from models.mortality_model import MortalityPredictor
+
+
+def make_series(n: int = 120):
+    """Huit colonnes dans l'ordre des features de la route (lags en 3 et 4)"""
+    rng = np.random.default_rng(1)
+    y = 0.02 + 0.005 * np.sin(np.arange(n) / 10) + rng.normal(0, 0.0005, n)
+    days = np.arange(n)
+    X = np.column_stack([days % 7, days // 30 % 12, days % 365, np.roll(y, 1), np.roll(y, 7),
+                         np.convolve(y, np.ones(7) / 7, "same"), np.convolve(y, np.ones(14) / 14, "same"),
+                         rng.random(n) * 0.001])
+    return X, y
+
+
+def test_direct_mode_forecasts_whole_horizon_in_one_pass_over_the_trees():
+    X, y = make_series()
+    predictor = MortalityPredictor(strategy="direct", max_horizon=10).fit(X, y)
+    assert predictor.model.n_outputs_ == 10
+
+    calls = []
+    original_apply = predictor.model.apply
+    predictor.model.apply = lambda data: calls.append(len(data)) or original_apply(data)
+
+    forecast = predictor.predict_future(X, 10)
+    assert forecast.shape == (10,)
+    assert calls == [1]
+    # Horizon plus court : début de la même trajectoire, servi par le mémo
+    np.testing.assert_array_equal(predictor.predict_future(X, 4), forecast[:4])
+    assert calls == [1]
+
+    with pytest.raises(ValueError):
+        predictor.predict_future(X, 11)
+
+
+def test_direct_targets_are_the_following_days():
+    X, y = make_series(40)
+    predictor = MortalityPredictor(strategy="direct", max_horizon=5)
+    X_fit, Y_fit = predictor._direct_targets(X, y)
+    assert X_fit.shape == (35, X.shape[1]) and Y_fit.shape == (35, 5)
+    np.testing.assert_array_equal(Y_fit[3], y[4:9])
+    with pytest.raises(ValueError):
+        MortalityPredictor(strategy="direct", max_horizon=30)._direct_targets(X, y)
+    with pytest.raises(ValueError):
+        MortalityPredictor(strategy="unknown")
+
+
+@pytest.mark.parametrize("strategy", MortalityPredictor.STRATEGIES)
+@pytest.mark.parametrize("method", MortalityPredictor.INTERVAL_METHODS)
+def test_intervals_come_from_the_fitted_trees(strategy, method):
+    X, y = make_series()
+    predictor = MortalityPredictor(strategy=strategy, max_horizon=7, interval_method=method,
+                                   interval_level=0.8).fit(X, y)
+    forecast = predictor.forecast(X, 7)
+
+    # La moyenne des arbres est la prédiction de la forêt
+    if strategy == "direct":
+        expected = predictor.model.predict(predictor.scaler.transform(X[-1:]))[0]
+        np.testing.assert_allclose(forecast.mean, expected)
+    else:
+        first_day = predictor.model.predict(predictor.scaler.transform(X[-1:]))[0]
+        assert forecast.mean[0] == pytest.approx(first_day)
+    assert np.all(forecast.lower <= forecast.upper)
+    assert np.all(forecast.upper - forecast.lower > 0)
+    assert (forecast.method, forecast.level) == (method, 0.8)
+
+    wider = MortalityPredictor(strategy=strategy, max_horizon=7, interval_method=method,
+                               interval_level=0.98).fit(X, y).forecast(X, 7)
+    assert np.all(wider.upper - wider.lower >= forecast.upper - forecast.lower - 1e-12)
+
+
+@pytest.mark.parametrize("strategy", MortalityPredictor.STRATEGIES)
+def test_refresh_replaces_oldest_trees_with_trees_on_recent_days(strategy):
+    X, y = make_series(150)
+    predictor = MortalityPredictor(strategy=strategy, max_horizon=7).fit(X[:140], y[:140])
+    predictor.incremental_trees, predictor.incremental_window = 5, 60
+    predictor.max_error_ratio = float("inf")
+    kept = predictor.model.estimators_[5:]
+
+    updated = predictor.refresh(X, y)
+    assert updated is not predictor and predictor.n_samples == 140
+    assert updated.training["mode"] == "incremental" and updated.training["new_days"] == 10
+    assert len(updated.model.estimators_) == updated.model.n_estimators == 100
+    # Les 95 arbres conservés sont ceux de l'ancien modèle, suivis de 5 nouveaux
+    for old, new in zip(kept, updated.model.estimators_[:95]):
+        np.testing.assert_array_equal(old.tree_.value, new.tree_.value)
+    forecast = updated.forecast(X, 7)
+    assert forecast.mean.shape == (7,) and np.all(forecast.lower <= forecast.upper)
+    assert updated.refit_reason(X, y) == "historique plus court que celui appris"
+
+
+def test_revised_history_or_too_many_updates_force_a_full_refit():
+    X, y = make_series(150)
+    predictor = MortalityPredictor().fit(X[:140], y[:140])
+    predictor.max_error_ratio = float("inf")
+    assert predictor.refit_reason(X, y) is None
+
+    revised = y.copy()
+    revised[10] += 0.001
+    assert predictor.refit_reason(X, revised) == "historique révisé"
+    refit = predictor.refresh(X, revised)
+    assert refit.training == {"mode": "full", "samples": 150, "reason": "historique révisé"}
+
+    predictor.updates_since_refit = predictor.max_updates
+    assert "mises à jour" in predictor.refit_reason(X, y)
+    predictor.updates_since_refit = 0
+    predictor.max_new_days = 5
+    assert "nouveaux jours" in predictor.refit_reason(X, y)
+    predictor.max_new_days, predictor.max_error_ratio = 14, 0.0
+    assert predictor.refit_reason(X, y).startswith("dérive")
+
+
+@pytest.mark.parametrize("strategy", MortalityPredictor.STRATEGIES)
+def test_hist_gradient_boosting_backend(strategy):
+    X, y = make_series(150)
+    predictor = MortalityPredictor(strategy=strategy, max_horizon=7, backend="hist_gradient_boosting",
+                                   interval_method="qrf").fit(X[:140], y[:140])
+    # Pas de forêt : intervalle tiré des résidus de validation
+    assert predictor.interval_method == "residuals"
+    forecast = predictor.forecast(X[:140], 7)
+    assert forecast.mean.shape == (7,) and np.all(forecast.lower < forecast.upper)
+    assert forecast.mean[0] == pytest.approx(predictor.predict_single(X[139]))
+
+    info = predictor.get_model_info()
+    assert info["backend"] == "hist_gradient_boosting"
+    assert info["model_type"] == "Histogram Gradient Boosting"
+    assert predictor.get_feature_importance() == {}
+
+    refreshed = predictor.refresh(X, y)
+    assert refreshed.training["mode"] == "full" and refreshed.backend == "hist_gradient_boosting"
+    with pytest.raises(ValueError):
+        MortalityPredictor(backend="xgboost")
+
+
+def test_model_info_route_reports_the_configured_backend(monkeypatch):
+    from routes.mortality_routes import get_mortality_model_info
+
+    monkeypatch.setenv("ML_MORTALITY_BACKEND", "hist_gradient_boosting")
+    monkeypatch.setenv("ML_MORTALITY_STRATEGY", "direct")
+    info = asyncio.run(get_mortality_model_info())
+    assert info["model_type"] == "Histogram Gradient Boosting"
+    assert info["backend"] == "hist_gradient_boosting" and info["strategy"] == "direct"
+    assert info["parameters"] == MortalityPredictor.BACKEND_PARAMS["hist_gradient_boosting"]
+    assert set(info["backends"]) == set(MortalityPredictor.BACKENDS)
@@ -0,0 +1,94 @@
+"""
+Tests du backend PostgreSQL contre une base locale jetable
+
+Exécutés uniquement si ``AI_TEST_DATABASE_URL`` pointe vers un serveur
+PostgreSQL de test (ex. ``postgresql://postgres@localhost:5432/test``) ;
+une table temporaire au schéma de ``donnee_historique`` y est créée.
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+
+from services.data_source import DataNotFoundError, growth_rt, rolling_mortality_rate
+from services.postgres_source import PostgresDataSource
+
+DSN = os.getenv("AI_TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not DSN, reason="AI_TEST_DATABASE_URL non défini")
+
+START = datetime(2021, 1, 1)
+CASES = [100.0, 120.0, None, 150.0, 160.0, 0.0, 180.0, 200.0, 210.0, 220.0]
+DEATHS = [1.0, 2.0, 2.0, 3.0, None, 4.0, 4.0, 5.0, 6.0, 6.0]
+
+
+def run_with_table(scenario):
+    """Crée une table au schéma Prisma, la remplit, exécute ``scenario(source)`` puis la supprime"""
+    table = f"donnee_historique_test_{uuid.uuid4().hex[:8]}"
+
+    async def main():
+        conn = await asyncpg.connect(DSN)
+        try:
+            await conn.execute(f"""
+                CREATE TABLE {table} (
+                    id_donnee SERIAL PRIMARY KEY, date TIMESTAMP(3) NOT NULL,
+                    country VARCHAR(200) NOT NULL, value DOUBLE PRECISION,
+                    indicator VARCHAR(200) NOT NULL, source VARCHAR(200), iso_code CHAR(3)
+                )""")
+            rows = []
+            for i, (cases, deaths) in enumerate(zip(CASES, DEATHS)):
+                day = START + timedelta(days=i)
+                rows.append((day, "France", cases, "cases", "covid", "FRA"))
+                rows.append((day, "France", deaths, "deaths", "covid", "FRA"))
+                rows.append((day, "Italy", 2 * (cases or 0), "cases", "covid", "ITA"))
+            await conn.executemany(
+                f"INSERT INTO {table} (date, country, value, indicator, source, iso_code) "
+                f"VALUES ($1, $2, $3, $4, $5, $6)", rows)
+
+            source = PostgresDataSource(dsn=DSN, table=table)
+            try:
+                return await scenario(source)
+            finally:
+                await source.aclose()
+        finally:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}")
+            await conn.close()
+
+    return asyncio.run(main())
+
+
+def test_mortality_rate_aggregated_by_server():
+    frame = run_with_table(lambda source: source.get_mortality_rate_frame("France", source="covid", window=3))
+    cases = np.array([np.nan if v is None else v for v in CASES])
+    deaths = np.array([np.nan if v is None else v for v in DEATHS])
+    np.testing.assert_allclose(frame["mortality_rate"], rolling_mortality_rate(cases, deaths, 3))
+    assert frame.attrs["meta"]["count"] == len(CASES)
+
+
+def test_rt_and_daily_series():
+    async def scenario(source):
+        daily = await source.get_daily_series_frame("France", "cases", source="covid",
+                                                    date_debut="2021-01-02", date_fin="2021-01-05")
+        rt = await source.get_rt_frame("France", "cases", source="covid", window=2)
+        return daily, rt
+
+    daily, rt = run_with_table(scenario)
+    assert list(daily["value"]) == [120.0, 0.0, 150.0, 160.0]
+    values = np.array([v or 0.0 for v in CASES])
+    np.testing.assert_allclose(rt["Rt"], growth_rt(values, 2))
+
+
+def test_missing_country_and_spread_series():
+    async def scenario(source):
+        with pytest.raises(DataNotFoundError):
+            await source.get_rt_frame("Atlantis", "cases", source="covid")
+        return await source.get_geographic_spread("cases", source="covid")
+
+    spread = run_with_table(scenario)
+    assert [s["iso_code"] for s in spread["series"]] == ["FRA", "ITA"]
+    assert len(spread["series"][1]["values"]) == len(CASES)
@@ -0,0 +1,105 @@
+"""
+Tests du pool de prédicteurs
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from models.predictor_pool import PredictorPool
+
+
+class FakePredictor:
+    instances = 0
+
+    def __init__(self):
+        FakePredictor.instances += 1
+        self.compiled_graph = object()
+        self.accuracy_metrics = {}
+        self.resets = 0
+
+    def fit(self, tag):
+        self.accuracy_metrics = {"tag": tag}
+        time.sleep(0.01)
+        # Aucune autre requête n'a pu modifier l'état pendant l'entraînement
+        return self.accuracy_metrics["tag"]
+
+    def reset(self):
+        self.accuracy_metrics = {}
+        self.resets += 1
+
+
+def test_concurrent_leases_have_isolated_state_and_recycle_instances():
+    FakePredictor.instances = 0
+    pool = PredictorPool("fake", FakePredictor, max_idle=4)
+
+    def task(tag):
+        with pool.lease() as predictor:
+            return predictor.fit(tag)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(task, range(40)))
+
+    assert results == list(range(40))
+    stats = pool.get_stats()
+    assert FakePredictor.instances == stats["created"] <= 4
+    assert stats["reused"] == 40 - stats["created"]
+    assert stats["in_use"] == 0
+
+
+def test_released_predictor_is_reset_and_failed_one_discarded():
+    pool = PredictorPool("fake", FakePredictor, max_idle=1)
+    with pool.lease() as predictor:
+        predictor.fit("a")
+        graph = predictor.compiled_graph
+    with pool.lease() as reused:
+        assert reused is predictor
+        assert reused.accuracy_metrics == {} and reused.compiled_graph is graph
+
+    with pytest.raises(RuntimeError):
+        with pool.lease() as failing:
+            raise RuntimeError("échec de l'entraînement")
+    assert pool.get_stats()["idle"] == 0
+    assert pool.get_stats()["discarded"] == 1
+    with pool.lease() as fresh:
+        assert fresh is not failing
+
+
+def test_discarded_predictors_are_released_and_empty_pool_is_cleaned():
+    released, emptied = [], []
+
+    class ReleasablePredictor(FakePredictor):
+        def release(self):
+            released.append(self)
+            self.compiled_graph = None
+
+    pool = PredictorPool("fake", ReleasablePredictor, max_idle=1, on_empty=lambda: emptied.append(1))
+    with pool.lease() as first:
+        with pool.lease() as second:
+            pass
+        # Une instance encore prêtée : pas de nettoyage
+        assert released == [] and emptied == []
+    # Pool plein : la seconde restituée est libérée, la première reste au repos
+    assert released == [first] and first.compiled_graph is None and second.compiled_graph is not None
+    assert emptied == []
+
+    pool.clear()
+    assert released == [first, second] and emptied == [1]
+    assert pool.get_stats()["emptied"] == 1
+
+
+def test_failed_factory_does_not_leak_a_lease():
+    emptied = []
+
+    def factory():
+        raise MemoryError("graphe trop gros")
+
+    pool = PredictorPool("failing", factory, max_idle=2, on_empty=lambda: emptied.append(1))
+    with pytest.raises(MemoryError):
+        with pool.lease():
+            pass
+    stats = pool.get_stats()
+    assert stats["in_use"] == 0 and stats["created"] == 0
+    # Plus aucune instance : le nettoyage a bien eu lieu
+    assert emptied == [1]
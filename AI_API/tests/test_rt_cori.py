@@ -0,0 +1,85 @@
+"""
+Tests de l'estimateur de Rt de Cori (équation de renouvellement)
+"""
+
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.rt_cori import CoriRtEstimator, discretized_serial_interval
+
+
+def simulate_renewal(rt: np.ndarray, weights: np.ndarray, seed: int = 0, seed_cases: float = 50) -> np.ndarray:
+    """Incidence de Poisson générée par l'équation de renouvellement (boucle de référence)"""
+    rng = np.random.default_rng(seed)
+    incidence = np.zeros(len(rt))
+    incidence[0] = seed_cases
+    for t in range(1, len(rt)):
+        infectiousness = sum(weights[s - 1] * incidence[t - s] for s in range(1, min(t, len(weights)) + 1))
+        incidence[t] = rng.poisson(rt[t] * infectiousness)
+    return incidence
+
+
+def test_serial_interval_is_a_discretized_distribution_with_the_requested_mean():
+    weights = discretized_serial_interval(4.7, 2.9)
+    assert weights.sum() == pytest.approx(1.0)
+    assert np.all(weights >= 0)
+    assert (np.arange(1, len(weights) + 1) * weights).sum() == pytest.approx(4.7, abs=0.1)
+    with pytest.raises(ValueError):
+        discretized_serial_interval(0, 1)
+
+
+def test_estimates_recover_the_simulated_reproduction_number():
+    estimator = CoriRtEstimator(si_mean=4.7, si_sd=2.9, window=7, level=0.95)
+    true_rt = np.where(np.arange(200) < 100, 1.3, 0.8)
+    incidence = simulate_renewal(true_rt, estimator.serial_interval)
+
+    expected = [sum(estimator.serial_interval[s - 1] * incidence[t - s]
+                    for s in range(1, min(t, len(estimator.serial_interval)) + 1)) for t in range(200)]
+    np.testing.assert_allclose(estimator.infectiousness(incidence), expected)
+
+    estimate = estimator.estimate(incidence)
+    assert np.all(np.isnan(estimate.mean[:7])) and not np.isnan(estimate.mean[7])
+    assert np.nanmean(estimate.mean[20:95]) == pytest.approx(1.3, abs=0.05)
+    assert np.nanmean(estimate.mean[115:195]) == pytest.approx(0.8, abs=0.05)
+    covered = (estimate.lower[115:195] <= 0.8) & (0.8 <= estimate.upper[115:195])
+    assert covered.mean() > 0.8
+    with pytest.raises(ValueError):
+        estimator.estimate(incidence[:7])
+
+
+def test_batch_pass_matches_per_country_estimates_and_projects_by_renewal():
+    estimator = CoriRtEstimator(si_mean=4.7, si_sd=2.9, window=7, level=0.9)
+    countries = np.stack([simulate_renewal(np.full(120, rt), estimator.serial_interval, seed=i)
+                          for i, rt in enumerate((0.9, 1.0, 1.2))])
+
+    estimate, projection = estimator.forecast(countries, horizon=5)
+    for row, incidence in enumerate(countries):
+        single = estimator.estimate(incidence)
+        np.testing.assert_allclose(estimate.mean[row], single.mean, equal_nan=True)
+        np.testing.assert_allclose(estimate.upper[row], single.upper, equal_nan=True)
+
+    # Rt maintenu à sa dernière estimation ; premier jour projeté = Rt × infectiosité
+    assert projection.rt_mean.shape == (3, 5)
+    np.testing.assert_allclose(projection.rt_mean, np.repeat(estimate.mean[:, -1:], 5, axis=1))
+    next_infectiousness = countries[:, ::-1][:, :len(estimator.serial_interval)] @ estimator.serial_interval
+    np.testing.assert_allclose(projection.incidence_mean[:, 0], estimate.mean[:, -1] * next_infectiousness)
+    assert np.all(projection.incidence_lower <= projection.incidence_mean)
+    assert np.all(projection.incidence_mean <= projection.incidence_upper)
+
+
+def test_cori_route_ignores_the_lstm_mode(monkeypatch):
+    from routes import rt_routes
+
+    incidence = simulate_renewal(np.full(120, 1.1), CoriRtEstimator().serial_interval)
+
+    async def daily_frame(**kwargs):
+        return pd.DataFrame({"date": pd.date_range("2021-01-01", periods=120).astype(str), "value": incidence})
+
+    monkeypatch.setattr(rt_routes.data_source, "get_daily_series_frame", daily_frame)
+    # Un mode LSTM invalide ne fait pas échouer une prédiction Cori
+    response = asyncio.run(rt_routes.predict_rt(pays="France", indicator="cases", source="covid", horizon=5,
+                                                reference_date="2021-04-30", engine="cori", mode="inconnu"))
+    assert len(response["predictions"]) == 5
@@ -0,0 +1,224 @@
+"""
+Tests du prédicteur Rt LSTM (préparation des séquences, cycle de vie, pré-entraînement)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models import rt_model
+from models.rt_model import RT_FEATURE_COLUMNS, PretrainedRtModel, RtLSTMPredictor
+
+
+def reference_sequences(X, y, window_size):
+    """Ancienne construction par boucle (une copie par fenêtre)"""
+    X_seq = np.array([X[i:i + window_size] for i in range(len(X) - window_size)])
+    y_seq = np.array([y[i + window_size] for i in range(len(X) - window_size)])
+    return X_seq, y_seq
+
+
+def test_sequences_are_zero_copy_views_matching_the_loop():
+    X = np.random.default_rng(0).random((120, 8))
+    y = X[:, 3] * 2
+    predictor = RtLSTMPredictor(window_size=14)
+
+    X_seq, y_seq = predictor._prepare_sequences(X, y)
+    expected_X, expected_y = reference_sequences(X, y, 14)
+    assert X_seq.shape == (106, 14, 8)
+    np.testing.assert_array_equal(X_seq, expected_X)
+    np.testing.assert_array_equal(y_seq, expected_y)
+    assert np.shares_memory(X_seq, X) and np.shares_memory(y_seq, y)
+    assert X_seq.base is not None and not X_seq.flags.writeable
+
+
+def test_window_datasets_yield_the_same_batches():
+    pytest.importorskip("tensorflow")
+    X = np.random.default_rng(1).random((60, 3))
+    y = X[:, 0]
+    predictor = RtLSTMPredictor(window_size=5)
+    X_seq, y_seq = predictor._prepare_sequences(X, y)
+
+    starts = np.arange(len(X_seq))
+    train, test = predictor._window_datasets(X, y, starts[:40], starts[40:], batch_size=16)
+    test_X = np.concatenate([batch_X.numpy() for batch_X, _ in test])
+    test_y = np.concatenate([batch_y.numpy() for _, batch_y in test])
+    np.testing.assert_allclose(test_X, X_seq[40:], rtol=1e-6)
+    np.testing.assert_allclose(test_y, y_seq[40:], rtol=1e-6)
+    # Entraînement : mêmes séquences, dans un ordre mélangé
+    train_y = np.concatenate([batch_y.numpy() for _, batch_y in train])
+    np.testing.assert_allclose(np.sort(train_y), np.sort(y_seq[:40]).astype(np.float32), rtol=1e-6)
+
+
+def test_compiled_rolling_forecast_matches_the_predict_loop():
+    pytest.importorskip("tensorflow")
+    predictor = RtLSTMPredictor(window_size=5, n_units=4)
+    predictor._get_model(input_shape=(5, 3))
+    window = np.random.default_rng(2).random((5, 3)).astype(np.float32)
+
+    expected = []
+    last_seq = window.copy()
+    for _ in range(6):
+        prediction = predictor.model.predict(last_seq[None], verbose=0)[0, 0]
+        expected.append(prediction)
+        new_row = last_seq[-1].copy()
+        new_row[0] = prediction
+        last_seq = np.vstack([last_seq[1:], new_row])
+
+    np.testing.assert_allclose(predictor._rolling_forecast(window, np.int32(6)).numpy(), expected, rtol=1e-5)
+    # Autre horizon, même graphe
+    np.testing.assert_allclose(predictor._rolling_forecast(window, np.int32(2)).numpy(), expected[:2], rtol=1e-5)
+
+
+def test_trained_model_snapshot_is_restored_without_retraining():
+    pytest.importorskip("tensorflow")
+    from models.rt_model import TrainedRtModel
+
+    rng = np.random.default_rng(3)
+    X = rng.random((60, 3))
+    y = X[:, 0] + 0.1 * rng.random(60)
+    predictor = RtLSTMPredictor(window_size=5, n_units=4, patience=1)
+    expected = predictor.train_and_predict(X, y, horizon=4)
+
+    trained = predictor.export()
+    assert isinstance(trained, TrainedRtModel) and trained.input_shape == (5, 3)
+    assert trained.nbytes >= sum(weight.nbytes for weight in trained.weights) > 0
+    predictor.release()
+    assert predictor.model is None and predictor.weights_nbytes() == 0
+
+    restored = RtLSTMPredictor(window_size=5, n_units=4).restore(trained)
+    np.testing.assert_allclose(restored.forecast(X, 4), expected, rtol=1e-5)
+    assert restored.get_accuracy() == trained.accuracy_metrics
+    with pytest.raises(ValueError):
+        RtLSTMPredictor(window_size=7).restore(trained)
+
+
+def test_memory_report_does_not_load_tensorflow():
+    import sys
+
+    from models.rt_model import lstm_memory_report
+
+    loaded = "tensorflow" in sys.modules
+    report = lstm_memory_report()
+    assert report["rss_bytes"] > 0 and report["idle_weights_bytes"] >= 0
+    assert ("tensorflow" in sys.modules) is loaded
+
+
+def pretrained_model(version="v1", feature_names=RT_FEATURE_COLUMNS):
+    return PretrainedRtModel(window_size=14, n_units=64, input_shape=(14, 8), weights=[np.ones((8, 4))],
+                             feature_names=list(feature_names), series=["France", "Italy"],
+                             accuracy_metrics={"val_loss": 0.1}, version=version, created_at="2026-01-01T00:00:00Z")
+
+
+def test_rt_features_are_computed_per_frame():
+    rt_frame = pd.DataFrame({"date": pd.date_range("2021-01-01", periods=40, tz="UTC").astype(str)[::-1],
+                             "Rt": np.r_[np.linspace(0.8, 1.2, 39), np.nan][::-1]})
+    df = rt_model.add_rt_features(rt_model.clean_rt_frame(rt_frame))
+    assert list(df.columns) == ["date", "Rt"] + RT_FEATURE_COLUMNS
+    # Tri chronologique, Rt manquant retiré, 13 premiers jours sans moyenne sur 14 jours
+    assert df["date"].is_monotonic_increasing and df["date"].dt.tz is None
+    assert len(df) == 39 - 13
+    assert df["rt_lag1"].iloc[-1] == pytest.approx(df["Rt"].iloc[-2])
+
+
+def test_pretrained_model_is_saved_atomically_and_reloaded_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "global.joblib"
+    monkeypatch.setenv("RT_PRETRAINED_MODEL", str(path))
+    assert rt_model.load_pretrained() is None
+
+    rt_model.save_pretrained(pretrained_model("v1"))
+    assert os.listdir(tmp_path) == ["global.joblib"]
+    first = rt_model.load_pretrained()
+    assert first.version == "v1" and rt_model.load_pretrained() is first
+    assert first.matches(RtLSTMPredictor(), RT_FEATURE_COLUMNS)
+    assert not first.matches(RtLSTMPredictor(window_size=7), RT_FEATURE_COLUMNS)
+    assert not first.matches(RtLSTMPredictor(), RT_FEATURE_COLUMNS[:-1])
+
+    rt_model.save_pretrained(pretrained_model("v2"))
+    os.utime(path, (0, os.stat(path).st_mtime + 10))
+    assert rt_model.load_pretrained().version == "v2"
+
+
+def test_pretrained_modes_require_a_pretrained_model(tmp_path, monkeypatch):
+    monkeypatch.setenv("RT_PRETRAINED_MODEL", str(tmp_path / "absent.joblib"))
+    X, y = np.zeros((40, 8)), np.zeros(40)
+    with pytest.raises(ValueError, match="pré-entraîné"):
+        rt_model.fit_model(X, y, mode="fast")
+    with pytest.raises(ValueError, match="inconnu"):
+        rt_model.fit_model(X, y, mode="transfer")
+    with pytest.raises(ValueError, match="poids de départ"):
+        RtLSTMPredictor().train(np.zeros((40, 8)), np.zeros(40), epochs=0)
+
+
+def test_global_training_then_fast_and_fine_tuned_countries():
+    pytest.importorskip("tensorflow")
+    rng = np.random.default_rng(4)
+    series = []
+    for _ in range(3):
+        X = rng.random((60, 3))
+        series.append((X, X[:, 0] + 0.05 * rng.random(60)))
+    predictor = RtLSTMPredictor(window_size=5, n_units=4, patience=1, epochs=3)
+    pretrained = predictor.train_global(series + [(X[:10], X[:10, 0])], labels=["a", "b", "c", "court"])
+    assert pretrained.series == ["a", "b", "c"] and pretrained.input_shape == (5, 3)
+    # Validation : 20 % les plus récents de chaque série, aucune fenêtre à cheval sur deux pays
+    assert pretrained.accuracy_metrics["test_samples"] == 3 * (55 - int(0.8 * 55))
+
+    X, y = series[0]
+    fast = RtLSTMPredictor(window_size=5, n_units=4).train(X, y, initial_weights=pretrained.weights, epochs=0)
+    assert fast.training == {"epochs": 0, "pretrained": True}
+    for expected, weight in zip(pretrained.weights, fast.model.get_weights()):
+        np.testing.assert_array_equal(weight, expected)
+    tuned = RtLSTMPredictor(window_size=5, n_units=4, patience=1).train(X, y, initial_weights=pretrained.weights,
+                                                                          epochs=2)
+    assert 1 <= tuned.training["epochs"] <= 2 and tuned.forecast(X, 3).shape == (3,)
+
+
+def test_refit_reason_checks_history_before_the_model():
+    from models.model_registry import fingerprint_arrays
+
+    rng = np.random.default_rng(5)
+    X, y = rng.random((80, 3)), rng.random(80)
+    predictor = RtLSTMPredictor(window_size=5)
+    assert predictor.refit_reason(X, y) == "modèle non entraîné"
+
+    predictor.is_trained, predictor.n_samples = True, 70
+    predictor.data_fingerprint = fingerprint_arrays(X[:70], y[:70])
+    assert predictor.refit_reason(X[:70], y[:70]) == "historique plus court que celui appris"
+    predictor.max_new_days = 5
+    assert "nouveaux jours" in predictor.refit_reason(X, y)
+    predictor.max_new_days, predictor.updates_since_refit = 14, predictor.max_updates
+    assert "mises à jour" in predictor.refit_reason(X, y)
+    predictor.updates_since_refit = 0
+    revised = y.copy()
+    revised[3] += 1
+    assert predictor.refit_reason(X, revised) == "historique révisé"
+
+
+def test_incremental_update_then_drift_forces_a_full_retrain(tmp_path, monkeypatch):
+    pytest.importorskip("tensorflow")
+    monkeypatch.setenv("RT_PRETRAINED_MODEL", str(tmp_path / "absent.joblib"))
+    monkeypatch.setenv("RT_INCREMENTAL_EPOCHS", "1")
+    rng = np.random.default_rng(6)
+    X = rng.random((90, 3))
+    y = X[:, 0] + 0.05 * rng.random(90)
+    # Aucune instance gardée : chacune lit les seuils RT_INCREMENTAL_* à sa création
+    monkeypatch.setattr(rt_model, "rt_predictor_pool",
+                        rt_model.PredictorPool("test", lambda: RtLSTMPredictor(window_size=5, n_units=4, patience=1,
+                                                                                epochs=3), max_idle=0))
+    previous = rt_model.fit_model(X[:85], y[:85])
+    assert previous.n_samples == 85 and previous.updates_since_refit == 0
+
+    monkeypatch.setenv("RT_INCREMENTAL_MAX_ERROR_RATIO", "inf")
+    updated = rt_model.refresh_model(previous, X, y)
+    assert updated.training["mode"] == "incremental" and updated.training["base_mode"] == "full"
+    assert updated.training["new_days"] == 5 and updated.training["gradient_steps"] >= 1
+    assert updated.n_samples == 90 and updated.updates_since_refit == 1
+    # Les scalers de l'entraînement complet sont conservés
+    np.testing.assert_array_equal(updated.scaler_X.mean_, previous.scaler_X.mean_)
+
+    drifted = y.copy()
+    drifted[85:] += 10
+    monkeypatch.setenv("RT_INCREMENTAL_MAX_ERROR_RATIO", "2.0")
+    retrained = rt_model.refresh_model(previous, X, drifted)
+    assert retrained.training["reason"].startswith("dérive") and retrained.n_samples == 90
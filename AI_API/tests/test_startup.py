@@ -0,0 +1,118 @@
+"""
+Tests du coût de démarrage : TensorFlow n'est importé qu'au premier entraînement LSTM
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+API_ROOT = Path(__file__).resolve().parent.parent
+# Budget généreux (machines de CI lentes) ; l'import de TensorFlow seul prend plusieurs secondes
+IMPORT_BUDGET_SECONDS = float(os.getenv("AI_IMPORT_BUDGET_SECONDS", 15))
+
+
+def run_fresh(code: str, **env: str) -> dict:
+    """Exécute ``code`` dans un interpréteur neuf ; sa dernière ligne affichée est un objet JSON"""
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=API_ROOT, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "RT_LSTM_ENABLED": "true", **env}
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_importing_the_routes_does_not_import_tensorflow():
+    report = run_fresh(
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "from routes import mortality_routes, rt_routes, spread_routes\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started, 'tensorflow': 'tensorflow' in sys.modules}))"
+    )
+    assert report["tensorflow"] is False
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+@pytest.mark.skipif(importlib.util.find_spec("uvicorn") is None, reason="uvicorn non installé")
+def test_api_startup_does_not_import_tensorflow(tmp_path):
+    report = run_fresh(
+        "import json, sys, time\n"
+        "from fastapi.testclient import TestClient\n"
+        "started = time.perf_counter()\n"
+        "import main\n"
+        "with TestClient(main.app) as client:\n"
+        "    info = client.get('/api/rt/model-info').json()\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started, 'tensorflow': 'tensorflow' in sys.modules,\n"
+        "                  'reported': info['tensorflow_loaded']}))",
+        AI_DATA_BACKEND="file", AI_DATA_DIR=str(tmp_path)
+    )
+    assert report["tensorflow"] is False and report["reported"] is False
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS
+
+
+def test_disabled_lstm_is_refused_without_loading_tensorflow(monkeypatch):
+    from models.rt_model import LSTMDisabledError, load_keras
+    from routes import rt_routes
+
+    # D'autres tests du même processus peuvent avoir importé TensorFlow : seul l'effet de l'appel compte
+    loaded = "tensorflow" in sys.modules
+    monkeypatch.setenv("RT_LSTM_ENABLED", "false")
+    with pytest.raises(LSTMDisabledError):
+        load_keras()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(rt_routes.predict_rt(pays="France", indicator="cases", source="covid", horizon=7,
+                                         reference_date=None, engine="lstm", mode=None))
+    assert error.value.status_code == 503
+    assert ("tensorflow" in sys.modules) is loaded
+
+
+def test_disabled_lstm_never_imports_tensorflow_in_a_fresh_worker():
+    report = run_fresh(
+        "import asyncio, json, sys\n"
+        "from fastapi import HTTPException\n"
+        "from models.rt_model import LSTMDisabledError, load_keras\n"
+        "from routes import rt_routes\n"
+        "try:\n"
+        "    load_keras()\n"
+        "except LSTMDisabledError:\n"
+        "    pass\n"
+        "try:\n"
+        "    asyncio.run(rt_routes.predict_rt(pays='France', indicator='cases', source='covid', horizon=7,\n"
+        "                                     reference_date=None, engine='lstm', mode=None))\n"
+        "except HTTPException as e:\n"
+        "    status = e.status_code\n"
+        "print(json.dumps({'status': status, 'tensorflow': 'tensorflow' in sys.modules}))",
+        RT_LSTM_ENABLED="false"
+    )
+    assert report == {"status": 503, "tensorflow": False}
+
+
+def test_missing_tensorflow_refuses_lstm_with_503(monkeypatch):
+    import numpy as np
+    import pandas as pd
+
+    from models import rt_model
+    from models.model_registry import ModelRegistry
+    from routes import rt_routes
+
+    async def rt_frame(**kwargs):
+        return pd.DataFrame({"date": pd.date_range("2021-01-01", periods=120).astype(str),
+                             "Rt": 1 + 0.1 * np.sin(np.arange(120) / 9)})
+
+    # Paquet absent : l'import échoue comme sur une installation sans TensorFlow
+    monkeypatch.setitem(sys.modules, "tensorflow", None)
+    monkeypatch.setattr(rt_model, "_tensorflow", None)
+    monkeypatch.setattr(rt_routes.data_source, "get_rt_frame", rt_frame)
+    monkeypatch.setattr(rt_routes, "rt_model_registry", ModelRegistry("rt_test", registry_dir=""))
+    with pytest.raises(rt_model.LSTMDisabledError):
+        rt_model.load_keras()
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(rt_routes.predict_rt(pays="France", indicator="cases", source="covid", horizon=7,
+                                         reference_date="2021-05-01", engine="lstm", mode="full"))
+    assert error.value.status_code == 503 and "TensorFlow non installé" in error.value.detail
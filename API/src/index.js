@@ -6,6 +6,10 @@ const { swaggerUi, specs } = require('./swagger');
 
 // Import du middleware de sérialisation BigInt
 const bigIntSerializer = require('./middleware/bigIntSerializer');
+// Import du middleware de sérialisation colonnaire (MessagePack) pour l'API IA
+const columnarSerializer = require('./middleware/columnarSerializer');
+// Import du middleware de GET conditionnels (ETag / Last-Modified liés à la version des données)
+const dataVersion = require('./middleware/dataVersion');
 
 const app = express();
 const prisma = new PrismaClient();
@@ -18,13 +22,16 @@ app.use(express.json());
 // Middleware pour gérer la sérialisation des BigInt
 app.use(bigIntSerializer);
 
+// Réponses colonnaires MessagePack si le client les demande (Accept: application/x-msgpack)
+app.use(columnarSerializer);
+
 // Documentation Swagger
 app.use('/api-docs', swaggerUi.serve, swaggerUi.setup(specs));
 
 // Routes
 app.use('/api/pays', require('./routes/paysRoutes'));
 app.use('/api/indicateurs', require('./routes/indicateursRoutes'));
-app.use('/api/donnees-historiques', require('./routes/donneesHistoriquesRoutes'));
+app.use('/api/donnees-historiques', dataVersion, require('./routes/donneesHistoriquesRoutes'));
 
 // Route de base
 app.get('/', (req, res) => {
@@ -0,0 +1,118 @@
+/**
+ * Middleware de sérialisation colonnaire (MessagePack) pour les clients ML
+ *
+ * Si le client annonce `Accept: application/x-msgpack`, les réponses de la
+ * forme { data: [ {...}, ... ], meta } sont renvoyées en colonnes
+ * { columns: { date: [...], value: [...] }, meta } encodées en MessagePack.
+ * Les autres clients (navigateur, Swagger) reçoivent toujours du JSON.
+ */
+
+const MSGPACK_TYPE = 'application/x-msgpack';
+
+// Encodeur MessagePack minimal (nil, booléens, nombres, chaînes, tableaux, objets)
+function encodeMsgpack(value) {
+  const chunks = [];
+
+  const header = (bytes) => chunks.push(Buffer.from(bytes));
+
+  const encodeLength = (length, fixMask, fixMax, codes) => {
+    if (length <= fixMax && fixMask !== null) {
+      header([fixMask | length]);
+    } else if (length < 0x100 && codes[0] !== null) {
+      header([codes[0], length]);
+    } else if (length < 0x10000) {
+      const buf = Buffer.alloc(3);
+      buf[0] = codes[1];
+      buf.writeUInt16BE(length, 1);
+      chunks.push(buf);
+    } else {
+      const buf = Buffer.alloc(5);
+      buf[0] = codes[2];
+      buf.writeUInt32BE(length, 1);
+      chunks.push(buf);
+    }
+  };
+
+  const encodeNumber = (num) => {
+    if (Number.isInteger(num) && num >= -0x80000000 && num <= 0xffffffff) {
+      if (num >= 0 && num < 0x80) return header([num]);
+      if (num < 0 && num >= -32) return header([0xe0 | (num + 32)]);
+      if (num >= 0) {
+        const buf = Buffer.alloc(5);
+        buf[0] = 0xce;
+        buf.writeUInt32BE(num, 1);
+        return chunks.push(buf);
+      }
+      const buf = Buffer.alloc(5);
+      buf[0] = 0xd2;
+      buf.writeInt32BE(num, 1);
+      return chunks.push(buf);
+    }
+    const buf = Buffer.alloc(9);
+    buf[0] = 0xcb;
+    buf.writeDoubleBE(num, 1);
+    chunks.push(buf);
+  };
+
+  const encode = (data) => {
+    if (data === null || data === undefined) return header([0xc0]);
+    if (data === false) return header([0xc2]);
+    if (data === true) return header([0xc3]);
+    if (typeof data === 'number') return encodeNumber(data);
+    if (typeof data === 'bigint') return encode(data.toString());
+    if (data instanceof Date) return encode(data.toISOString());
+    if (typeof data === 'string') {
+      const str = Buffer.from(data, 'utf8');
+      encodeLength(str.length, 0xa0, 31, [0xd9, 0xda, 0xdb]);
+      return chunks.push(str);
+    }
+    if (Array.isArray(data)) {
+      encodeLength(data.length, 0x90, 15, [null, 0xdc, 0xdd]);
+      return data.forEach(encode);
+    }
+    if (typeof data === 'object') {
+      const keys = Object.keys(data);
+      encodeLength(keys.length, 0x80, 15, [null, 0xde, 0xdf]);
+      return keys.forEach(key => {
+        encode(key);
+        encode(data[key]);
+      });
+    }
+    return header([0xc0]);
+  };
+
+  encode(value);
+  return Buffer.concat(chunks);
+}
+
+// { data: [ {a, b}, ... ] } -> { columns: { a: [...], b: [...] } }
+function toColumns(body) {
+  const rows = body.data;
+  const names = rows.length ? Object.keys(rows[0]) : [];
+  const columns = {};
+  for (const name of names) {
+    columns[name] = rows.map(row => row[name] ?? null);
+  }
+  const { data, ...rest } = body;
+  return { ...rest, columns };
+}
+
+const columnarSerializer = (req, res, next) => {
+  const originalJson = res.json;
+
+  res.json = function(body) {
+    res.vary('Accept');
+    const isTabular = body && Array.isArray(body.data) &&
+      body.data.every(row => row !== null && typeof row === 'object' && !Array.isArray(row));
+    if (isTabular && res.statusCode < 400 && req.accepts(['application/json', MSGPACK_TYPE]) === MSGPACK_TYPE) {
+      res.type(MSGPACK_TYPE);
+      return res.send(encodeMsgpack(toColumns(body)));
+    }
+    return originalJson.call(this, body);
+  };
+
+  next();
+};
+
+module.exports = columnarSerializer;
+module.exports.encodeMsgpack = encodeMsgpack;
@@ -0,0 +1,77 @@
+/**
+ * Version globale des données historiques et GET conditionnels
+ *
+ * La version change à chaque chargement ETL (identifiant et date maximum de
+ * donnee_historique, deux colonnes indexées : requête très légère). Elle est
+ * mise en cache DATA_VERSION_TTL_MS millisecondes.
+ *
+ * Le middleware pose sur chaque GET un ETag dépendant de la version et de
+ * l'URL, l'en-tête X-Data-Version et un Last-Modified (première observation
+ * de la version). Une requête If-None-Match / If-Modified-Since encore valide
+ * reçoit 304 sans corps, avant toute requête sur les données.
+ */
+
+const crypto = require('crypto');
+const { PrismaClient } = require('@prisma/client');
+const prisma = new PrismaClient();
+
+const VERSION_TTL_MS = parseInt(process.env.DATA_VERSION_TTL_MS || '30000');
+
+let current = null;
+let fetchedAt = 0;
+let pending = null;
+
+async function loadDataVersion() {
+  const agg = await prisma.donneeHistorique.aggregate({
+    _max: { id_donnee: true, date: true }
+  });
+  const maxId = agg._max.id_donnee ?? 0;
+  const maxDate = agg._max.date ? agg._max.date.toISOString() : null;
+  const version = crypto.createHash('sha1').update(`${maxId}|${maxDate}`).digest('hex').slice(0, 16);
+  if (!current || current.version !== version) {
+    // Les dates HTTP sont à la seconde près
+    const observedAt = new Date(Math.floor(Date.now() / 1000) * 1000);
+    current = { version, max_id: maxId, max_date: maxDate, observed_at: observedAt.toISOString() };
+  }
+  fetchedAt = Date.now();
+  return current;
+}
+
+// Version courante (une seule requête en vol, résultat gardé VERSION_TTL_MS)
+async function getDataVersion() {
+  if (current && Date.now() - fetchedAt < VERSION_TTL_MS) {
+    return current;
+  }
+  if (!pending) {
+    pending = loadDataVersion().finally(() => { pending = null; });
+  }
+  return pending;
+}
+
+const conditionalGet = async (req, res, next) => {
+  if (req.method !== 'GET' && req.method !== 'HEAD') {
+    return next();
+  }
+  let info;
+  try {
+    info = await getDataVersion();
+  } catch (error) {
+    // Base indisponible : la requête suit son cours sans validateurs
+    return next();
+  }
+  const variant = crypto.createHash('sha1')
+    .update(`${req.originalUrl}|${req.get('Accept') || ''}`)
+    .digest('hex')
+    .slice(0, 16);
+  res.set('ETag', `W/"${info.version}-${variant}"`);
+  res.set('Last-Modified', new Date(info.observed_at).toUTCString());
+  res.set('X-Data-Version', info.version);
+  res.vary('Accept');
+  if (req.fresh) {
+    return res.status(304).end();
+  }
+  next();
+};
+
+module.exports = conditionalGet;
+module.exports.getDataVersion = getDataVersion;
@@ -2,6 +2,7 @@ const express = require('express');
 const router = express.Router();
 const { PrismaClient } = require('@prisma/client');
 const prisma = new PrismaClient();
+const { getDataVersion } = require('../middleware/dataVersion');
 
 /**
  * @swagger
@@ -1169,6 +1170,38 @@ router.get('/pays/:isoCode', async (req, res) => {
   }
 });
 
+/**
+ * @swagger
+ * /api/donnees-historiques/data-version:
+ *   get:
+ *     summary: "Version globale des données (change à chaque chargement ETL)"
+ *     tags: [DonneesHistoriques]
+ *     responses:
+ *       200:
+ *         description: "Jeton de version, utilisé par les clients pour invalider leurs caches"
+ *         content:
+ *           application/json:
+ *             schema:
+ *               type: object
+ *               properties:
+ *                 version:
+ *                   type: string
+ *                 max_id:
+ *                   type: integer
+ *                 max_date:
+ *                   type: string
+ *                 observed_at:
+ *                   type: string
+ */
+// GET version des données (déclarée avant /:id)
+router.get('/data-version', async (req, res) => {
+  try {
+    res.json(await getDataVersion());
+  } catch (error) {
+    res.status(500).json({ error: error.message });
+  }
+});
+
 /**
  * @swagger
  * /api/donnees-historiques/{id}: